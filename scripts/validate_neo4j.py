@@ -13,11 +13,11 @@ Usage:
 import argparse
 import json
 import sys
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Optional
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Record, Result, RoutingControl
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -33,7 +33,7 @@ LABEL_MAPPING = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationCheck:
     """Result of a single validation check."""
 
@@ -46,7 +46,7 @@ class ValidationCheck:
     details: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """Complete validation report."""
 
@@ -83,18 +83,7 @@ class ValidationReport:
                 "total": self.total_count,
                 "all_passed": self.all_passed,
             },
-            "checks": [
-                {
-                    "category": c.category,
-                    "name": c.name,
-                    "passed": c.passed,
-                    "message": c.message,
-                    "expected": c.expected,
-                    "actual": c.actual,
-                    "details": c.details,
-                }
-                for c in self.checks
-            ],
+            "checks": [asdict(c) for c in self.checks],
         }
 
 
@@ -117,6 +106,15 @@ class Neo4jValidator:
         self.neo4j_uri = neo4j_uri
         self.driver = None
 
+        # Translate ontology names to Neo4j names once, not per check
+        self._label_of = {
+            c: self._get_neo4j_label(c) for c in self.ontology.classes
+        }
+        self._rel_of = {r: self._get_neo4j_rel_type(r) for r in self.ontology.roles}
+
+        # Edge counts observed by _validate_relationship_counts (role -> count)
+        self._rel_counts: dict[str, int] = {}
+
     def _get_neo4j_label(self, class_name: str) -> str:
         """Get Neo4j label for an ontology class."""
         return LABEL_MAPPING.get(class_name, class_name)
@@ -129,14 +127,27 @@ class Neo4jValidator:
         """Establish Neo4j connection."""
         self.driver = GraphDatabase.driver(self.neo4j_uri, auth=NEO4J_AUTH)
         # Test connection
-        with self.driver.session() as session:
-            session.run("RETURN 1")
+        self.driver.verify_connectivity()
 
     def close(self):
         """Close Neo4j connection."""
         if self.driver:
             self.driver.close()
 
+    def _read_values(self, query: str) -> frozenset:
+        """Run a read-only auto-commit query and return its first column as a set."""
+        return frozenset(
+            self.driver.execute_query(
+                query, routing_=RoutingControl.READ, result_transformer_=Result.value
+            )
+        )
+
+    def _read_single(self, query: str) -> Record:
+        """Run a read-only auto-commit query that returns exactly one record."""
+        return self.driver.execute_query(
+            query, routing_=RoutingControl.READ, result_transformer_=Result.single
+        )
+
     def validate_all(self) -> ValidationReport:
         """Run all validations derived from ontology."""
         report = ValidationReport(
@@ -173,209 +184,215 @@ class Neo4jValidator:
     def _validate_node_labels(self) -> list[ValidationCheck]:
         """Verify all expected node labels exist in Neo4j."""
         checks = []
-        with self.driver.session() as session:
-            # Get all labels in database
-            result = session.run("CALL db.labels()")
-            db_labels = {record[0] for record in result}
-
-            for class_name in self.ontology.classes:
-                label = self._get_neo4j_label(class_name)
-                exists = label in db_labels
-
-                checks.append(
-                    ValidationCheck(
-                        category="node_label",
-                        name=class_name,
-                        passed=exists,
-                        message=f"Label '{label}' exists" if exists else f"Label '{label}' not found",
-                        expected=label,
-                        actual=label if exists else None,
-                    )
+        # Get all labels in database
+        db_labels = self._read_values("CALL db.labels() YIELD label RETURN label")
+
+        for class_name in self.ontology.classes:
+            label = self._label_of[class_name]
+            exists = label in db_labels
+
+            checks.append(
+                ValidationCheck(
+                    category="node_label",
+                    name=class_name,
+                    passed=exists,
+                    message=f"Label '{label}' exists" if exists else f"Label '{label}' not found",
+                    expected=label,
+                    actual=label if exists else None,
                 )
+            )
 
         return checks
 
     def _validate_node_counts(self) -> list[ValidationCheck]:
         """Verify node counts match ontology expectations."""
         checks = []
-        with self.driver.session() as session:
-            for class_name in self.ontology.classes:
-                expected = self.ontology.get_class_row_count(class_name)
-                if expected is None:
-                    continue  # Skip classes without row_count annotation
-
-                label = self._get_neo4j_label(class_name)
-                result = session.run(f"MATCH (n:{label}) RETURN count(n) as count")
-                actual = result.single()["count"]
-
-                passed = actual == expected
-                checks.append(
-                    ValidationCheck(
-                        category="node_count",
-                        name=class_name,
-                        passed=passed,
-                        message=f"{actual} nodes" if passed else f"{actual} nodes (expected {expected})",
-                        expected=expected,
-                        actual=actual,
-                    )
+        for class_name in self.ontology.classes:
+            expected = self.ontology.get_class_row_count(class_name)
+            if expected is None:
+                continue  # Skip classes without row_count annotation
+
+            label = self._label_of[class_name]
+            actual = self._read_single(f"MATCH (n:{label}) RETURN count(n) as count")["count"]
+
+            passed = actual == expected
+            checks.append(
+                ValidationCheck(
+                    category="node_count",
+                    name=class_name,
+                    passed=passed,
+                    message=f"{actual} nodes" if passed else f"{actual} nodes (expected {expected})",
+                    expected=expected,
+                    actual=actual,
                 )
+            )
 
         return checks
 
     def _validate_relationship_types(self) -> list[ValidationCheck]:
         """Verify all expected relationship types exist in Neo4j."""
         checks = []
-        with self.driver.session() as session:
-            # Get all relationship types in database
-            result = session.run("CALL db.relationshipTypes()")
-            db_rel_types = {record[0] for record in result}
-
-            for role_name in self.ontology.roles:
-                rel_type = self._get_neo4j_rel_type(role_name)
-                exists = rel_type in db_rel_types
+        # Get all relationship types in database
+        db_rel_types = self._read_values(
+            "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+        )
 
-                checks.append(
-                    ValidationCheck(
-                        category="relationship_type",
-                        name=role_name,
-                        passed=exists,
-                        message=f"Type '{rel_type}' exists" if exists else f"Type '{rel_type}' not found",
-                        expected=rel_type,
-                        actual=rel_type if exists else None,
-                    )
+        for role_name in self.ontology.roles:
+            rel_type = self._rel_of[role_name]
+            exists = rel_type in db_rel_types
+
+            checks.append(
+                ValidationCheck(
+                    category="relationship_type",
+                    name=role_name,
+                    passed=exists,
+                    message=f"Type '{rel_type}' exists" if exists else f"Type '{rel_type}' not found",
+                    expected=rel_type,
+                    actual=rel_type if exists else None,
                 )
+            )
 
         return checks
 
     def _validate_relationship_endpoints(self) -> list[ValidationCheck]:
         """Verify relationship endpoints match domain/range declarations."""
         checks = []
-        with self.driver.session() as session:
-            for role_name in self.ontology.roles:
-                rel_type = self._get_neo4j_rel_type(role_name)
-                domain_class = self.ontology.get_role_domain(role_name)
-                range_class = self.ontology.get_role_range(role_name)
-                domain_label = self._get_neo4j_label(domain_class)
-                range_label = self._get_neo4j_label(range_class)
-
-                # Find violations where endpoints don't match expected labels
-                query = f"""
-                    MATCH (a)-[r:{rel_type}]->(b)
-                    WHERE NOT a:{domain_label} OR NOT b:{range_label}
-                    RETURN count(*) as violations,
-                           collect(DISTINCT labels(a))[0..5] as bad_source_labels,
-                           collect(DISTINCT labels(b))[0..5] as bad_target_labels
-                """
-                result = session.run(query)
-                record = result.single()
-                violations = record["violations"]
-                bad_sources = record["bad_source_labels"] or []
-                bad_targets = record["bad_target_labels"] or []
-
-                passed = violations == 0
-                details = []
-                if not passed:
-                    if bad_sources:
-                        details.append(f"Unexpected source labels: {bad_sources}")
-                    if bad_targets:
-                        details.append(f"Unexpected target labels: {bad_targets}")
-
-                checks.append(
-                    ValidationCheck(
-                        category="relationship_endpoint",
-                        name=role_name,
-                        passed=passed,
-                        message=f"Endpoints {domain_label} -> {range_label}"
-                        if passed
-                        else f"{violations} endpoint violations",
-                        expected=f"{domain_label} -> {range_label}",
-                        actual=f"{violations} violations",
-                        details=details,
-                    )
+        for role_name in self.ontology.roles:
+            rel_type = self._rel_of[role_name]
+            domain_class = self.ontology.get_role_domain(role_name)
+            range_class = self.ontology.get_role_range(role_name)
+            # Loading validates domain/range against the classes _label_of covers
+            domain_label = self._label_of[domain_class]
+            range_label = self._label_of[range_class]
+
+            # Find violations where endpoints don't match expected labels
+            query = f"""
+                MATCH (a)-[r:{rel_type}]->(b)
+                WHERE NOT a:{domain_label} OR NOT b:{range_label}
+                RETURN count(*) as violations,
+                       collect(DISTINCT labels(a))[0..5] as bad_source_labels,
+                       collect(DISTINCT labels(b))[0..5] as bad_target_labels
+            """
+            record = self._read_single(query)
+            violations = record["violations"]
+            bad_sources = record["bad_source_labels"] or []
+            bad_targets = record["bad_target_labels"] or []
+
+            passed = violations == 0
+            details = []
+            if not passed:
+                if bad_sources:
+                    details.append(f"Unexpected source labels: {bad_sources}")
+                if bad_targets:
+                    details.append(f"Unexpected target labels: {bad_targets}")
+
+            checks.append(
+                ValidationCheck(
+                    category="relationship_endpoint",
+                    name=role_name,
+                    passed=passed,
+                    message=f"Endpoints {domain_label} -> {range_label}"
+                    if passed
+                    else f"{violations} endpoint violations",
+                    expected=f"{domain_label} -> {range_label}",
+                    actual=f"{violations} violations",
+                    details=details,
                 )
+            )
 
         return checks
 
     def _validate_relationship_counts(self) -> list[ValidationCheck]:
         """Verify relationship counts match ontology expectations."""
         checks = []
-        with self.driver.session() as session:
-            for role_name in self.ontology.roles:
-                expected = self.ontology.get_role_row_count(role_name)
-                if expected is None:
-                    continue  # Skip roles without row_count annotation
-
-                rel_type = self._get_neo4j_rel_type(role_name)
-                result = session.run(
-                    f"MATCH ()-[r:{rel_type}]->() RETURN count(r) as count"
+        for role_name in self.ontology.roles:
+            expected = self.ontology.get_role_row_count(role_name)
+            if expected is None:
+                continue  # Skip roles without row_count annotation
+
+            rel_type = self._rel_of[role_name]
+            actual = self._read_single(
+                f"MATCH ()-[r:{rel_type}]->() RETURN count(r) as count"
+            )["count"]
+            self._rel_counts[role_name] = actual
+
+            passed = actual == expected
+            checks.append(
+                ValidationCheck(
+                    category="relationship_count",
+                    name=role_name,
+                    passed=passed,
+                    message=f"{actual} edges" if passed else f"{actual} edges (expected {expected})",
+                    expected=expected,
+                    actual=actual,
                 )
-                actual = result.single()["count"]
+            )
+
+        return checks
+
+    def _validate_constraints(self) -> list[ValidationCheck]:
+        """
+        Validate OWL-like constraint properties (irreflexive, asymmetric).
+
+        Both properties are counted in a single scan of the role's edges,
+        so each constrained relationship type is read once. The reverse-edge
+        probe only runs for one orientation of each node pair, and roles
+        already counted as empty skip the query entirely.
+        """
+        checks = []
+        for role_name in self.ontology.roles:
+            props = self.ontology.get_role_properties(role_name)
+            irreflexive = props.get("irreflexive")
+            asymmetric = props.get("asymmetric")
+            if not (irreflexive or asymmetric):
+                continue
+
+            rel_type = self._rel_of[role_name]
+            if self._rel_counts.get(role_name) == 0:
+                record = {"self_loops": 0, "bidirectional": 0}
+            else:
+                query = f"""
+                    MATCH (a)-[r:{rel_type}]->(b)
+                    RETURN sum(CASE WHEN a = b THEN 1 ELSE 0 END) as self_loops,
+                           sum(CASE WHEN elementId(a) < elementId(b)
+                                    AND EXISTS {{ (b)-[:{rel_type}]->(a) }}
+                               THEN 1 ELSE 0 END) as bidirectional
+                """
+                record = self._read_single(query)
+
+            # Irreflexive check (no self-loops)
+            if irreflexive:
+                self_loops = record["self_loops"]
+                passed = self_loops == 0
 
-                passed = actual == expected
                 checks.append(
                     ValidationCheck(
-                        category="relationship_count",
+                        category="constraint_irreflexive",
                         name=role_name,
                         passed=passed,
-                        message=f"{actual} edges" if passed else f"{actual} edges (expected {expected})",
-                        expected=expected,
-                        actual=actual,
+                        message="No self-loops" if passed else f"{self_loops} self-loops found",
+                        expected=0,
+                        actual=self_loops,
                     )
                 )
 
-        return checks
-
-    def _validate_constraints(self) -> list[ValidationCheck]:
-        """Validate OWL-like constraint properties (irreflexive, asymmetric)."""
-        checks = []
-        with self.driver.session() as session:
-            for role_name in self.ontology.roles:
-                props = self.ontology.get_role_properties(role_name)
-                rel_type = self._get_neo4j_rel_type(role_name)
-
-                # Irreflexive check (no self-loops)
-                if props.get("irreflexive"):
-                    query = f"""
-                        MATCH (a)-[r:{rel_type}]->(a)
-                        RETURN count(*) as self_loops
-                    """
-                    result = session.run(query)
-                    self_loops = result.single()["self_loops"]
-                    passed = self_loops == 0
-
-                    checks.append(
-                        ValidationCheck(
-                            category="constraint_irreflexive",
-                            name=role_name,
-                            passed=passed,
-                            message="No self-loops" if passed else f"{self_loops} self-loops found",
-                            expected=0,
-                            actual=self_loops,
-                        )
-                    )
+            # Asymmetric check (no bidirectional edges)
+            if asymmetric:
+                bidirectional = record["bidirectional"]
+                passed = bidirectional == 0
 
-                # Asymmetric check (no bidirectional edges)
-                if props.get("asymmetric"):
-                    query = f"""
-                        MATCH (a)-[r1:{rel_type}]->(b)-[r2:{rel_type}]->(a)
-                        RETURN count(*) / 2 as bidirectional
-                    """
-                    result = session.run(query)
-                    bidirectional = result.single()["bidirectional"]
-                    passed = bidirectional == 0
-
-                    checks.append(
-                        ValidationCheck(
-                            category="constraint_asymmetric",
-                            name=role_name,
-                            passed=passed,
-                            message="No bidirectional edges"
-                            if passed
-                            else f"{bidirectional} bidirectional pairs found",
-                            expected=0,
-                            actual=bidirectional,
-                        )
+                checks.append(
+                    ValidationCheck(
+                        category="constraint_asymmetric",
+                        name=role_name,
+                        passed=passed,
+                        message="No bidirectional edges"
+                        if passed
+                        else f"{bidirectional} bidirectional pairs found",
+                        expected=0,
+                        actual=bidirectional,
                     )
+                )
 
         return checks
 
@@ -11,10 +11,15 @@ Usage:
     poetry run python scripts/validate_ontology.py --all
 """
 
-import subprocess
+import io
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 
+import yaml
+from linkml.linter.linter import Linter
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
@@ -27,27 +32,32 @@ def validate_linkml_structure(ontology_path: Path) -> bool:
 
     Validates YAML syntax and LinkML schema structure.
     Does NOT validate VG-specific annotations.
+
+    Runs the same check as `linkml-lint --validate-only`, in-process
+    rather than through a `poetry run` subprocess.
     """
     print(f"\n{'='*60}")
     print(f"Layer 1: LinkML Structure Validation")
     print(f"{'='*60}")
     print(f"File: {ontology_path}")
 
-    result = subprocess.run(
-        ["poetry", "run", "linkml-lint", "--validate-only", str(ontology_path)],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode == 0:
+    # Schema problems come back as lint results; only an unreadable file or
+    # invalid YAML raises. Anything else is a bug and propagates.
+    try:
+        problems = [
+            p.message
+            for p in Linter().lint(str(ontology_path), validate_only=True)
+        ]
+    except (OSError, yaml.YAMLError) as e:
+        problems = [str(e)]
+
+    if not problems:
         print("✓ LinkML structure validation passed")
         return True
     else:
         print("✗ LinkML structure validation failed:")
-        if result.stderr:
-            print(result.stderr)
-        if result.stdout:
-            print(result.stdout)
+        for problem in problems:
+            print(f"  - {problem}")
         return False
 
 
@@ -97,13 +107,21 @@ def validate_ontology(ontology_path: Path) -> bool:
     return layer1_passed and layer2_passed
 
 
+def _validate_ontology_captured(ontology_path: Path) -> tuple[bool, str]:
+    """Run validate_ontology in a worker, returning its output instead of printing."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        passed = validate_ontology(ontology_path)
+    return passed, buffer.getvalue()
+
+
 def main():
     example_ontology_dir = Path(__file__).parent.parent / "supply_chain_example" / "ontology"
 
     if len(sys.argv) > 1:
         if sys.argv[1] == "--all":
             # Validate all ontology files in supply_chain_example/ontology/ directory
-            ontology_files = list(example_ontology_dir.glob("*.yaml"))
+            ontology_files = sorted(example_ontology_dir.glob("*.yaml"))
             if not ontology_files:
                 print(f"No ontology files found in {example_ontology_dir}")
                 sys.exit(1)
@@ -112,10 +130,15 @@ def main():
             for f in ontology_files:
                 print(f"  - {f.name}")
 
-            all_passed = True
-            for path in sorted(ontology_files):
-                if not validate_ontology(path):
-                    all_passed = False
+            # Files are independent: validate in parallel, print in order
+            with ProcessPoolExecutor() as executor:
+                results = list(
+                    executor.map(_validate_ontology_captured, ontology_files)
+                )
+
+            for _, output in results:
+                print(output, end="")
+            all_passed = all(passed for passed, _ in results)
             sys.exit(0 if all_passed else 1)
         else:
             # Validate specific file
@@ -8,7 +8,7 @@ This module provides:
 - Runtime guards for safe traversal decisions
 """
 
-from .bounds import TableStats, get_table_bound, get_table_stats
+from .bounds import TableStats, clear_estimator_cache, get_table_bound, get_table_stats
 from .guards import GuardResult, check_guards
 from .models import EstimationConfig, estimate
 from .sampler import GraphSampler, SampleResult
@@ -24,6 +24,7 @@ __all__ = [
     "get_table_bound",
     "get_table_stats",
     "TableStats",
+    "clear_estimator_cache",
     # Guards
     "check_guards",
     "GuardResult",
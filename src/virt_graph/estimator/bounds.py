@@ -3,152 +3,269 @@ DDL introspection and table statistics for estimation bounds.
 
 Provides hard bounds on graph size from database metadata,
 which caps estimation to prevent wild over-estimates.
+
+Results are cached per connection for STATS_CACHE_TTL_SEC, so repeated
+estimates against the same table skip re-introspection.
 """
 
+import functools
+import sys
+import threading
+import time
+import weakref
 from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
 
 from psycopg2.extensions import connection as PgConnection
 
+T = TypeVar("T")
+
+STATS_CACHE_TTL_SEC = 300  # Re-fetch stats older than this
+
+# connection -> {(function, args): (fetched_at, result)}
+_stats_cache: "weakref.WeakKeyDictionary[PgConnection, dict[tuple, tuple[float, Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_stats_cache_lock = threading.Lock()
+
+
+def _cached_per_connection(func: Callable[..., T]) -> Callable[..., T]:
+    """Memoize a stats function per connection and arguments, with a TTL."""
+
+    @functools.wraps(func)
+    def wrapper(conn: PgConnection, *args: Any, **kwargs: Any) -> T:
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _stats_cache_lock:
+            hit = _stats_cache.setdefault(conn, {}).get(key)
+        if hit is not None and now - hit[0] < STATS_CACHE_TTL_SEC:
+            value = hit[1]
+        else:
+            value = func(conn, *args, **kwargs)
+            with _stats_cache_lock:
+                _stats_cache.setdefault(conn, {})[key] = (now, value)
+        # Hand out copies of mutable results so callers can't poison the cache
+        return dict(value) if isinstance(value, dict) else value
+
+    return wrapper
+
+
+def clear_estimator_cache(conn: PgConnection | None = None) -> None:
+    """
+    Drop cached table statistics.
+
+    Call after DDL or bulk loads that change a table's shape.
+
+    Args:
+        conn: Only clear entries for this connection (None = all connections)
+    """
+    with _stats_cache_lock:
+        if conn is None:
+            _stats_cache.clear()
+        else:
+            _stats_cache.pop(conn, None)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TableStats:
     """DDL-derived table statistics."""
 
+    # Fields of probes that did not run (see probes_run) keep their defaults
     row_count: int
-    is_junction: bool  # Composite PK (M:M pattern)
-    has_self_ref: bool  # Self-referencing FK
-    has_no_self_ref_constraint: bool  # CHECK constraint preventing self-ref
-    indexed_columns: list[str]
-    unique_from_nodes: int | None  # Distinct values in from column
-    unique_to_nodes: int | None  # Distinct values in to column
-    density: float | None  # edges/nodes^2 if calculable
-
+    is_junction: bool = False  # Composite PK (M:M pattern)
+    has_self_ref: bool = False  # Self-referencing FK
+    has_no_self_ref_constraint: bool = False  # CHECK constraint preventing self-ref
+    indexed_columns: frozenset[str] = frozenset()  # Interned names, for cheap membership tests
+    unique_from_nodes: int | None = None  # Distinct values in from column (pg_stats estimate)
+    unique_to_nodes: int | None = None  # Distinct values in to column (pg_stats estimate)
+    density: float | None = None  # edges/nodes^2 if calculable
+    probes_run: frozenset[str] = frozenset()  # TABLE_PROBES names that were evaluated
+
+
+# Optional catalog probes of get_table_stats (row_count is always fetched)
+TABLE_PROBES = frozenset({"is_junction", "self_ref", "check", "indexes", "unique_nodes"})
+# Everything the guards read; "check" and "indexes" are opt-in
+DEFAULT_TABLE_PROBES = frozenset({"is_junction", "self_ref", "unique_nodes"})
+
+# Catalog introspection for get_table_stats. The parameters are named once
+# in p (table, edge columns, probe flags); the planner pulls p up, so the
+# subqueries stay uncorrelated InitPlans, which are only evaluated when
+# their CASE branch is reached.
+_TABLE_STATS_SQL = """
+    SELECT
+        -- Row count from pg_stat_user_tables (approximate but fast)
+        COALESCE(
+            (SELECT n_live_tup FROM pg_stat_user_tables WHERE relname = p.tbl), 0
+        ) AS row_count,
+
+        -- Composite primary key (junction table indicator)
+        CASE WHEN p.is_junction THEN (SELECT COUNT(*)
+         FROM information_schema.key_column_usage kcu
+         JOIN information_schema.table_constraints tc
+             ON kcu.constraint_name = tc.constraint_name
+         WHERE tc.table_name = p.tbl
+             AND tc.constraint_type = 'PRIMARY KEY') END AS pk_cols,
+
+        -- Self-referencing foreign key
+        CASE WHEN p.self_ref THEN (SELECT COUNT(*) > 0
+         FROM information_schema.referential_constraints rc
+         JOIN information_schema.constraint_column_usage ccu
+             ON rc.constraint_name = ccu.constraint_name
+         WHERE rc.unique_constraint_catalog = ccu.constraint_catalog
+             AND ccu.table_name = p.tbl) END AS has_self_ref,
+
+        -- CHECK constraints (simplified - just check if any exist)
+        CASE WHEN p.check_probe THEN (SELECT COUNT(*) > 0
+         FROM information_schema.check_constraints cc
+         JOIN information_schema.constraint_column_usage ccu
+             ON cc.constraint_name = ccu.constraint_name
+         WHERE ccu.table_name = p.tbl) END AS has_check,
+
+        -- Indexed columns
+        CASE WHEN p.indexes THEN ARRAY(
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY(i.indkey)
+            WHERE c.relname = p.tbl
+        ) END AS indexed_columns,
+
+        -- Planner's distinct-value estimates (no table scan)
+        CASE WHEN p.unique_nodes THEN (SELECT n_distinct FROM pg_stats
+         WHERE tablename = p.tbl AND attname = p.from_col
+         LIMIT 1) END AS from_n_distinct,
+        CASE WHEN p.unique_nodes THEN (SELECT n_distinct FROM pg_stats
+         WHERE tablename = p.tbl AND attname = p.to_col
+         LIMIT 1) END AS to_n_distinct
+    FROM (
+        SELECT
+            %s::text AS tbl, %s::text AS from_col, %s::text AS to_col,
+            %s::boolean AS is_junction, %s::boolean AS self_ref,
+            %s::boolean AS check_probe, %s::boolean AS indexes,
+            %s::boolean AS unique_nodes
+    ) p
+"""
 
+@_cached_per_connection
 def get_table_stats(
     conn: PgConnection,
     table: str,
     from_col: str | None = None,
     to_col: str | None = None,
+    probes: frozenset[str] = DEFAULT_TABLE_PROBES,
 ) -> TableStats:
     """
     Introspect DDL via information_schema and pg_stat.
 
+    Distinct node counts come from the planner's pg_stats estimates;
+    an exact COUNT(DISTINCT) scan is only run for unanalyzed tables.
+
     Args:
         conn: Database connection
         table: Table name
         from_col: Optional edge source column (for distinct counts)
         to_col: Optional edge target column (for distinct counts)
+        probes: Catalog probes to run, from TABLE_PROBES; fields of
+            skipped probes keep their False/empty defaults and the ones
+            that ran are listed in probes_run. Add "check" / "indexes"
+            for has_no_self_ref_constraint / indexed_columns.
 
     Returns:
         TableStats with DDL-derived properties
     """
+    unknown = probes - TABLE_PROBES
+    if unknown:
+        raise ValueError(f"Unknown table probes: {sorted(unknown)}")
+
+    # Deferred: the handlers package imports the estimator
+    from ..handlers.base import _execute_prepared
+
     with conn.cursor() as cur:
-        # Get row count from pg_stat_user_tables (approximate but fast)
-        cur.execute(
-            """
-            SELECT COALESCE(n_live_tup, 0)
-            FROM pg_stat_user_tables
-            WHERE relname = %s
-            """,
-            (table,),
+        # All catalog probes in a single round trip, via a prepared statement
+        _execute_prepared(
+            conn,
+            cur,
+            _TABLE_STATS_SQL,
+            [
+                table,
+                from_col,
+                to_col,
+                "is_junction" in probes,
+                "self_ref" in probes,
+                "check" in probes,
+                "indexes" in probes,
+                "unique_nodes" in probes,
+            ],
         )
-        row = cur.fetchone()
-        row_count = row[0] if row else 0
+        (
+            row_count,
+            pk_cols,
+            has_self_ref,
+            has_no_self_ref_constraint,
+            indexed_columns,
+            from_n_distinct,
+            to_n_distinct,
+        ) = cur.fetchone()
 
         # If pg_stat is empty, get actual count (slower but accurate)
         if row_count == 0:
             cur.execute(f"SELECT COUNT(*) FROM {table}")  # noqa: S608
             row_count = cur.fetchone()[0]
 
-        # Check for composite primary key (junction table indicator)
-        cur.execute(
-            """
-            SELECT COUNT(*)
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.table_constraints tc
-                ON kcu.constraint_name = tc.constraint_name
-            WHERE tc.table_name = %s
-                AND tc.constraint_type = 'PRIMARY KEY'
-            """,
-            (table,),
-        )
-        pk_cols = cur.fetchone()[0]
-        is_junction = pk_cols >= 2
-
-        # Check for self-referencing foreign key
-        cur.execute(
-            """
-            SELECT COUNT(*) > 0
-            FROM information_schema.referential_constraints rc
-            JOIN information_schema.constraint_column_usage ccu
-                ON rc.constraint_name = ccu.constraint_name
-            WHERE rc.unique_constraint_catalog = ccu.constraint_catalog
-                AND ccu.table_name = %s
-            """,
-            (table,),
-        )
-        has_self_ref = cur.fetchone()[0]
-
-        # Check for CHECK constraints (simplified - just check if any exist)
-        cur.execute(
-            """
-            SELECT COUNT(*) > 0
-            FROM information_schema.check_constraints cc
-            JOIN information_schema.constraint_column_usage ccu
-                ON cc.constraint_name = ccu.constraint_name
-            WHERE ccu.table_name = %s
-            """,
-            (table,),
-        )
-        has_no_self_ref_constraint = cur.fetchone()[0]
-
-        # Get indexed columns
-        cur.execute(
-            """
-            SELECT a.attname
-            FROM pg_index i
-            JOIN pg_class c ON c.oid = i.indrelid
-            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY(i.indkey)
-            WHERE c.relname = %s
-            """,
-            (table,),
-        )
-        indexed_columns = [row[0] for row in cur.fetchall()]
-
         # Get distinct node counts if columns specified
         unique_from = None
         unique_to = None
-        density = None
-
-        if from_col and to_col:
-            cur.execute(
-                f"SELECT COUNT(DISTINCT {from_col}) FROM {table}"  # noqa: S608
-            )
-            unique_from = cur.fetchone()[0]
-
-            cur.execute(
-                f"SELECT COUNT(DISTINCT {to_col}) FROM {table}"  # noqa: S608
-            )
-            unique_to = cur.fetchone()[0]
-
-            # Calculate density if we have both
-            if unique_from and unique_to:
-                total_nodes = unique_from + unique_to  # Approximate
-                if total_nodes > 0:
-                    density = row_count / (total_nodes**2)
+        if from_col and to_col and "unique_nodes" in probes:
+            unique_from = _distinct_from_stats(from_n_distinct, row_count)
+            unique_to = _distinct_from_stats(to_n_distinct, row_count)
+
+            # Table not analyzed yet: fall back to exact counts (one scan)
+            if unique_from is None or unique_to is None:
+                cur.execute(
+                    f"""
+                    SELECT COUNT(DISTINCT {from_col}), COUNT(DISTINCT {to_col})
+                    FROM {table}
+                    """  # noqa: S608
+                )
+                unique_from, unique_to = cur.fetchone()
+
+    # Distinct counts need both edge columns
+    probes_run = probes if from_col and to_col else probes - {"unique_nodes"}
+
+    # Calculate density if we have both distinct counts
+    density = None
+    if unique_from and unique_to:
+        total_nodes = unique_from + unique_to  # Approximate
+        if total_nodes > 0:
+            density = row_count / (total_nodes**2)
 
     return TableStats(
         row_count=row_count,
-        is_junction=is_junction,
-        has_self_ref=has_self_ref,
-        has_no_self_ref_constraint=has_no_self_ref_constraint,
-        indexed_columns=indexed_columns,
+        is_junction=pk_cols is not None and pk_cols >= 2,
+        has_self_ref=bool(has_self_ref),
+        has_no_self_ref_constraint=bool(has_no_self_ref_constraint),
+        indexed_columns=frozenset(map(sys.intern, indexed_columns or ())),
         unique_from_nodes=unique_from,
         unique_to_nodes=unique_to,
         density=density,
+        probes_run=probes_run,
     )
 
 
+def _distinct_from_stats(n_distinct: float | None, row_count: int) -> int | None:
+    """
+    Convert a pg_stats n_distinct value to an absolute count.
+
+    Negative values are a fraction of the row count (-1 means unique).
+    """
+    if n_distinct is None:
+        return None
+    if n_distinct < 0:
+        return round(-n_distinct * row_count)
+    return int(n_distinct)
+
+
+@_cached_per_connection
 def get_table_bound(
     conn: PgConnection,
     edges_table: str,
@@ -184,6 +301,7 @@ def get_table_bound(
         return cur.fetchone()[0]
 
 
+@_cached_per_connection
 def get_cardinality_stats(
     conn: PgConnection,
     edges_table: str,
@@ -206,37 +324,24 @@ def get_cardinality_stats(
         Dict with avg_out_degree, max_out_degree, avg_in_degree, max_in_degree
     """
     with conn.cursor() as cur:
-        # Outbound degree stats
-        cur.execute(
-            f"""
-            SELECT
-                AVG(cnt)::float as avg_out,
-                MAX(cnt)::float as max_out
-            FROM (
-                SELECT {from_col}, COUNT(*) as cnt
-                FROM {edges_table}
-                GROUP BY {from_col}
-            ) degree_counts
-            """  # noqa: S608
-        )
-        out_row = cur.fetchone()
-        avg_out, max_out = out_row if out_row else (0.0, 0.0)
-
-        # Inbound degree stats
+        # Both degree distributions from a single scan: unpivot each edge
+        # into its (out, from) and (in, to) endpoints, then group once
         cur.execute(
             f"""
             SELECT
-                AVG(cnt)::float as avg_in,
-                MAX(cnt)::float as max_in
+                AVG(cnt) FILTER (WHERE dir = 'out')::float as avg_out,
+                MAX(cnt) FILTER (WHERE dir = 'out')::float as max_out,
+                AVG(cnt) FILTER (WHERE dir = 'in')::float as avg_in,
+                MAX(cnt) FILTER (WHERE dir = 'in')::float as max_in
             FROM (
-                SELECT {to_col}, COUNT(*) as cnt
-                FROM {edges_table}
-                GROUP BY {to_col}
+                SELECT v.dir, v.node, COUNT(*) as cnt
+                FROM {edges_table} e,
+                    LATERAL (VALUES ('out', e.{from_col}), ('in', e.{to_col})) v(dir, node)
+                GROUP BY v.dir, v.node
             ) degree_counts
             """  # noqa: S608
         )
-        in_row = cur.fetchone()
-        avg_in, max_in = in_row if in_row else (0.0, 0.0)
+        avg_out, max_out, avg_in, max_in = cur.fetchone()
 
     return {
         "avg_out_degree": avg_out or 0.0,
@@ -13,7 +13,7 @@ from .models import EstimationConfig, estimate
 from .sampler import SampleResult
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GuardResult:
     """Result of runtime guard checks."""
 
@@ -27,7 +27,7 @@ class GuardResult:
     ]
     reason: str | None
     estimated_nodes: int | None
-    warnings: list[str]
+    warnings: tuple[str, ...]
 
 
 def check_guards(
@@ -58,9 +58,8 @@ def check_guards(
         GuardResult with recommendation
     """
     warnings: list[str] = []
-    estimated = estimate(sample, max_depth, table_bound, estimation_config)
 
-    # 1. Scout Check: Hub detected
+    # 1. Scout Check: Hub detected (aborting, so skip the estimate)
     if sample.hub_detected:
         return GuardResult(
             safe_to_proceed=False,
@@ -69,8 +68,8 @@ def check_guards(
                 f"Hub node detected with expansion factor {sample.max_expansion_factor:.1f}x. "
                 "Add filters to reduce scope or increase hub_threshold in sampler."
             ),
-            estimated_nodes=estimated,
-            warnings=warnings,
+            estimated_nodes=sample.visited_count,
+            warnings=tuple(warnings),
         )
 
     # 2. Structure Check: Junction table (if stats available)
@@ -95,10 +94,11 @@ def check_guards(
             recommended_action="traverse",
             reason=f"Graph terminated at depth {len(sample.level_sizes) - 1} with {sample.visited_count} nodes.",
             estimated_nodes=sample.visited_count,
-            warnings=warnings,
+            warnings=tuple(warnings),
         )
 
     # 5. Volume Check: Estimate vs limit
+    estimated = estimate(sample, max_depth, table_bound, estimation_config)
     if estimated > max_nodes:
         # Check if table bound is actually smaller
         if table_bound and table_bound < max_nodes:
@@ -110,7 +110,7 @@ def check_guards(
                 recommended_action="warn_and_proceed",
                 reason=f"Table bound ({table_bound:,}) is below limit despite high estimate.",
                 estimated_nodes=min(estimated, table_bound),
-                warnings=warnings,
+                warnings=tuple(warnings),
             )
 
         # Over limit
@@ -122,7 +122,7 @@ def check_guards(
                 "Consider: max_nodes=N to increase limit, or skip_estimation=True to bypass."
             ),
             estimated_nodes=estimated,
-            warnings=warnings,
+            warnings=tuple(warnings),
         )
 
     # 6. Volume Check: Safe to proceed
@@ -131,7 +131,7 @@ def check_guards(
         recommended_action="traverse",
         reason=f"Estimated {estimated:,} nodes within limit of {max_nodes:,}.",
         estimated_nodes=estimated,
-        warnings=warnings,
+        warnings=tuple(warnings),
     )
 
 
@@ -189,11 +189,11 @@ def check_size_estimate(
     Returns:
         Tuple of (estimated, is_safe, message)
     """
-    estimated = estimate(sample, max_depth, table_bound, config)
-
     if sample.terminated:
         return sample.visited_count, True, f"Exact: {sample.visited_count} nodes"
 
+    estimated = estimate(sample, max_depth, table_bound, config)
+
     if estimated <= max_nodes:
         return estimated, True, f"Safe: ~{estimated:,} nodes (limit: {max_nodes:,})"
 
@@ -7,10 +7,16 @@ to detected graph properties.
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from .sampler import SampleResult
 
+# Extrapolated estimates saturate here: past float-exact integers, and far
+# above any node limit they are compared against
+ESTIMATE_CEILING = 2**53
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EstimationConfig:
     """Configuration for estimation behavior."""
 
@@ -31,6 +37,10 @@ class EstimationConfig:
     stable_growth_threshold: float = 0.2  # Growth rate change < this is "stable"
 
 
+# Shared default so estimate(config=None) does not build a config per call
+_DEFAULT_CONFIG = EstimationConfig()
+
+
 def estimate(
     sample: SampleResult,
     max_depth: int,
@@ -52,7 +62,7 @@ def estimate(
     Returns:
         Estimated number of reachable nodes
     """
-    config = config or EstimationConfig()
+    config = config or _DEFAULT_CONFIG
 
     # If sampling terminated (empty frontier), we have exact count
     if sample.terminated:
@@ -62,16 +72,28 @@ def estimate(
             estimate_val = min(estimate_val, table_bound)
         return estimate_val
 
-    # Compute adaptive damping based on detected properties
-    damping = _compute_damping(sample, config)
-
-    # Extrapolate from sampled levels
-    estimate_val = _damped_extrapolation(
-        sample.level_sizes,
-        max_depth,
-        damping,
-        sample.visited_count,
-    )
+    # Nothing to extrapolate from: the visited count is the estimate
+    if len(sample.level_sizes) < 2:
+        estimate_val = sample.visited_count
+    else:
+        # Compute adaptive damping based on detected properties; with no
+        # node sharing or shrinking frontier only the base damping applies
+        if (
+            sample.convergence_ratio >= config.convergence_threshold
+            and sample.growth_trend != "decreasing"
+        ):
+            damping = max(0.3, min(config.base_damping, 1.0))
+        else:
+            damping = _compute_damping(sample, config)
+
+        # Extrapolate from sampled levels
+        estimate_val = _damped_extrapolation(
+            sample.level_sizes,
+            sample.growth_rates,
+            max_depth,
+            damping,
+            sample.visited_count,
+        )
 
     # Apply safety margin
     estimate_val = int(estimate_val * config.safety_margin)
@@ -110,7 +132,8 @@ def _compute_damping(sample: SampleResult, config: EstimationConfig) -> float:
 
 
 def _damped_extrapolation(
-    level_sizes: list[int],
+    level_sizes: np.ndarray,
+    growth_rates: np.ndarray,
     max_depth: int,
     damping: float,
     visited_so_far: int,
@@ -124,20 +147,16 @@ def _damped_extrapolation(
     if len(level_sizes) < 2:
         return visited_so_far
 
-    # Calculate growth rates from sampled levels
-    growth_rates: list[float] = []
-    for i in range(1, len(level_sizes)):
-        if level_sizes[i - 1] > 0:
-            rate = level_sizes[i] / level_sizes[i - 1]
-            growth_rates.append(rate)
+    # Only rates out of non-empty levels are observations
+    growth_rates = growth_rates[level_sizes[:-1] > 0]
 
-    if not growth_rates or all(r == 0 for r in growth_rates):
+    if not growth_rates.any():
         return visited_so_far
 
     # Use the recent growth rate (last observed) as base
     # This is more predictive than average for convergent graphs
-    recent_rate = growth_rates[-1] if growth_rates[-1] > 0 else sum(growth_rates) / len(
-        growth_rates
+    recent_rate = float(
+        growth_rates[-1] if growth_rates[-1] > 0 else growth_rates.mean()
     )
 
     # Apply damping
@@ -151,7 +170,7 @@ def _damped_extrapolation(
                 level_sizes[-1] * damped_rate / (1 - damped_rate)
             )
         else:
-            remaining_estimate = level_sizes[-1] * (max_depth - len(level_sizes) + 1)
+            remaining_estimate = int(level_sizes[-1]) * (max_depth - len(level_sizes) + 1)
         return visited_so_far + remaining_estimate
 
     # Extrapolate remaining levels with damping
@@ -161,13 +180,19 @@ def _damped_extrapolation(
         return visited_so_far
 
     estimated = visited_so_far
-    current_level_size = level_sizes[-1]
+    current_level_size = int(level_sizes[-1])
 
     for _ in range(remaining_depth):
-        current_level_size = int(current_level_size * damped_rate)
+        next_level_size = current_level_size * damped_rate
+        # Also catches inf/nan from undamped growth over deep horizons
+        if not next_level_size < ESTIMATE_CEILING:
+            return ESTIMATE_CEILING
+        current_level_size = int(next_level_size)
         if current_level_size == 0:
             break
         estimated += current_level_size
+        if estimated >= ESTIMATE_CEILING:
+            return ESTIMATE_CEILING
 
         # Apply increasing damping as we go deeper (convergence effect)
         damped_rate *= damping
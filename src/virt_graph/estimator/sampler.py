@@ -5,19 +5,43 @@ Samples a graph to detect structural properties (convergence, cycles, hubs)
 that inform estimation and traversal strategy selection.
 """
 
-from dataclasses import dataclass
+from collections.abc import Iterator
+from contextlib import closing
+from dataclasses import dataclass, field, fields
 from typing import Literal
 
+import numpy as np
 from psycopg2.extensions import connection as PgConnection
+from psycopg2.extras import execute_values
 
+# Rows pulled per round trip from the server-side edge cursor
+EDGE_FETCH_CHUNK = 10_000
 
-@dataclass
+# With frontier_temp_table=True, frontiers larger than this are joined via a
+# temp table instead of ANY(%s)
+FRONTIER_TEMP_TABLE_MIN = 1000
+_FRONTIER_TABLE = "vg_sample_frontier"
+
+# Rows of the recursive CTE (one per distinct node per level) read before
+# the use_cte sampler stops the server-side expansion
+SAMPLE_CTE_MAX_ROWS = 100_000
+
+# Visited IDs below this are tracked in a byte-per-ID bitmap (16 MB at most)
+VISITED_BITMAP_MAX_ID = 1 << 24
+
+# Past VISITED_BITMAP_MIN_SIZE slots, a bitmap with more than this many
+# slots per visited ID is too sparse to beat the sorted array
+VISITED_BITMAP_MIN_SIZE = 1 << 16
+VISITED_BITMAP_MAX_SPARSITY = 100
+
+
+@dataclass(slots=True, frozen=True)
 class SampleResult:
     """Results from graph sampling with auto-detected properties."""
 
     # Basic metrics
     visited_count: int
-    level_sizes: list[int]
+    level_sizes: np.ndarray  # int64 new-node count per level; lists are converted
     terminated: bool  # Hit empty frontier before depth limit
 
     # Auto-detected properties (free from sampling)
@@ -32,6 +56,111 @@ class SampleResult:
     # Raw data for custom analysis
     edges_seen: int  # Total edges encountered during sampling
 
+    # level_sizes[i + 1] / level_sizes[i] (0.0 after an empty level), shared by
+    # trend detection and extrapolation; derived from level_sizes if omitted
+    growth_rates: np.ndarray | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Frozen: normalize derived fields through object.__setattr__
+        object.__setattr__(
+            self, "level_sizes", np.asarray(self.level_sizes, dtype=np.int64)
+        )
+        if self.growth_rates is None:
+            object.__setattr__(self, "growth_rates", _growth_rates(self.level_sizes))
+
+    def __eq__(self, other: object) -> bool:
+        # Field-wise like the generated __eq__, but array-aware
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            np.array_equal(getattr(self, f.name), getattr(other, f.name))
+            for f in fields(self)
+            if f.compare
+        )
+
+
+def _growth_rates(level_sizes: np.ndarray) -> np.ndarray:
+    """Level-to-level growth rates in one vectorized pass."""
+    sizes = level_sizes.astype(np.float64)
+    prev, cur = sizes[:-1], sizes[1:]
+    return np.divide(cur, prev, out=np.zeros_like(cur), where=prev > 0)
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sorted distinct values via sort + adjacent compare (cheaper than np.unique)."""
+    values = np.sort(values)
+    keep = np.empty(values.size, dtype=np.bool_)
+    keep[:1] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _in_sorted(values: np.ndarray, sorted_arr: np.ndarray) -> np.ndarray:
+    """Membership mask of values in a sorted array via binary search."""
+    idx = np.searchsorted(sorted_arr, values)
+    idx[idx == len(sorted_arr)] = 0
+    return sorted_arr[idx] == values
+
+
+class _VisitedIds:
+    """
+    Visited node IDs for the client-side sampling BFS.
+
+    Small non-negative IDs (the usual serial keys) live in a bitmap indexed
+    by ID, so membership and insertion are one vectorized index each. The
+    first ID outside that range, or growth that would leave the bitmap
+    mostly empty, switches to a sorted int64 array probed with binary search.
+    """
+
+    __slots__ = ("_mask", "_sorted", "_count")
+
+    def __init__(self, start_id: int):
+        self._count = 1
+        if 0 <= start_id < VISITED_BITMAP_MIN_SIZE:
+            self._mask: np.ndarray | None = np.zeros(
+                max(start_id + 1, 1024), dtype=np.bool_
+            )
+            self._mask[start_id] = True
+            self._sorted = np.empty(0, dtype=np.int64)
+        else:
+            self._mask = None
+            self._sorted = np.array([start_id], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_unseen(self, targets: np.ndarray) -> np.ndarray:
+        """Mark sorted unique targets visited and return the unseen ones."""
+        if not targets.size:
+            return targets
+
+        mask = self._mask
+        if mask is not None:
+            fits = targets[0] >= 0 and targets[-1] < VISITED_BITMAP_MAX_ID
+            if fits and targets[-1] >= len(mask):
+                # Grow geometrically so repeated small overflows stay cheap
+                size = min(max(int(targets[-1]) + 1, 2 * len(mask)), VISITED_BITMAP_MAX_ID)
+                max_size = VISITED_BITMAP_MAX_SPARSITY * (self._count + targets.size)
+                fits = size <= max(VISITED_BITMAP_MIN_SIZE, max_size)
+                if fits:
+                    grown = np.zeros(size, dtype=np.bool_)
+                    grown[: len(mask)] = mask
+                    self._mask = mask = grown
+            if fits:
+                new = targets[~mask[targets]]
+                mask[new] = True
+                self._count += new.size
+                return new
+            self._sorted = np.flatnonzero(mask).astype(np.int64)
+            self._mask = None
+
+        new = targets[~_in_sorted(targets, self._sorted)]
+        # new is disjoint from _sorted, so a plain merge-sort suffices
+        # (np.union1d would re-deduplicate the whole visited array)
+        self._sorted = np.sort(np.concatenate((self._sorted, new)))
+        self._count += new.size
+        return new
+
 
 class GraphSampler:
     """
@@ -49,6 +178,8 @@ class GraphSampler:
         to_col: str,
         direction: str = "outbound",
         hub_threshold: float = 50.0,
+        use_cte: bool = False,
+        frontier_temp_table: bool = False,
     ):
         """
         Initialize sampler.
@@ -60,6 +191,17 @@ class GraphSampler:
             to_col: Column for edge target
             direction: "outbound", "inbound", or "both"
             hub_threshold: Expansion factor threshold for hub detection
+            use_cte: Sample "outbound"/"inbound" in a single recursive CTE
+                round trip instead of one query per level. Bounded by
+                SAMPLE_CTE_MAX_ROWS and a per-level hub cutoff, but it
+                cannot stop mid-level or skip nodes seen at an earlier
+                level, so it reads more than the client-side BFS on
+                hub-heavy or heavily shared graphs
+            frontier_temp_table: Join frontiers over FRONTIER_TEMP_TABLE_MIN
+                IDs through a session temp table (vg_sample_frontier)
+                instead of an ANY(array) parameter. Runs DDL on conn and
+                leaves the table in its session; skipped on read-only
+                transactions and hot standbys
         """
         self.conn = conn
         self.edges_table = edges_table
@@ -67,8 +209,16 @@ class GraphSampler:
         self.to_col = to_col
         self.direction = direction
         self.hub_threshold = hub_threshold
-
-    def sample(self, start_id: int, depth: int = 5) -> SampleResult:
+        self.use_cte = use_cte
+        self.frontier_temp_table = frontier_temp_table
+        # Resolved on first use: whether conn may create the temp table
+        self._can_write: bool | None = None
+        # Edge column holding the target node; None for "both" (per-edge)
+        self._target_idx = {"outbound": 1, "inbound": 0}.get(direction)
+
+    def sample(
+        self, start_id: int, depth: int = 5, max_nodes: int | None = None
+    ) -> SampleResult:
         """
         Sample graph and detect properties automatically.
 
@@ -78,56 +228,46 @@ class GraphSampler:
         Args:
             start_id: Starting node ID
             depth: Number of levels to sample (default 5)
+            max_nodes: Stop sampling as soon as more nodes than this have
+                been visited; the sample is then already over any limit
+                this size. The CTE path reads at most max_nodes + 1 rows
+                and reruns client-side if those did not settle it
 
         Returns:
             SampleResult with detected properties
         """
-        frontier = {start_id}
-        visited = {start_id}
-        level_sizes = [1]  # Level 0 has 1 node
-        total_edges_seen = 0
-        expansion_factors: list[float] = []
-        terminated = False
-
-        for _ in range(depth):
-            if not frontier:
-                terminated = True
-                break
-
-            edges = self._fetch_edges(list(frontier))
-            total_edges_seen += len(edges)
-
-            next_frontier: set[int] = set()
-            for from_id, to_id in edges:
-                target = self._get_target(from_id, to_id, frontier)
-                if target is not None and target not in visited:
-                    next_frontier.add(target)
-                    visited.add(target)
-
-            # Calculate expansion factor
-            if frontier:
-                expansion = len(next_frontier) / len(frontier) if frontier else 0.0
-                expansion_factors.append(expansion)
-
-            level_sizes.append(len(next_frontier))
-            frontier = next_frontier
+        cte_result = None
+        if self.use_cte and self.direction != "both":
+            cte_result = self._bfs_cte(start_id, depth, max_nodes)
+        if cte_result is not None:
+            level_sizes, total_edges_seen, expansion_factors, hub_detected = (
+                cte_result
+            )
+            visited_count = int(level_sizes.sum())
+        else:
+            (
+                level_sizes,
+                total_edges_seen,
+                expansion_factors,
+                hub_detected,
+                visited_count,
+            ) = self._bfs_python(start_id, depth, max_nodes)
 
         # If frontier is empty after depth levels, we terminated
-        if not frontier:
-            terminated = True
+        terminated = bool(level_sizes[-1] == 0)
 
         # Detect properties from collected metrics
-        growth_trend = self._detect_growth_trend(level_sizes)
-        convergence_ratio = self._compute_convergence_ratio(len(visited), total_edges_seen)
-        max_expansion = max(expansion_factors) if expansion_factors else 0.0
-        hub_detected = max_expansion > self.hub_threshold
+        growth_rates = _growth_rates(level_sizes)
+        growth_trend = self._detect_growth_trend(growth_rates)
+        convergence_ratio = self._compute_convergence_ratio(visited_count, total_edges_seen)
+        max_expansion = float(expansion_factors.max()) if expansion_factors.size else 0.0
 
         # Cycle detection: if convergence_ratio < 1.0 significantly, nodes are shared
         # This is a heuristic - true cycle detection requires path tracking
         has_cycles = convergence_ratio < 0.9 and not terminated
 
         return SampleResult(
-            visited_count=len(visited),
+            visited_count=visited_count,
             level_sizes=level_sizes,
             terminated=terminated,
             growth_trend=growth_trend,
@@ -136,84 +276,308 @@ class GraphSampler:
             max_expansion_factor=max_expansion,
             hub_detected=hub_detected,
             edges_seen=total_edges_seen,
+            growth_rates=growth_rates,
         )
 
-    def _fetch_edges(self, frontier_ids: list[int]) -> list[tuple[int, int]]:
-        """Fetch edges for frontier nodes."""
-        if not frontier_ids:
-            return []
+    def _bfs_cte(
+        self, start_id: int, depth: int, max_nodes: int | None = None
+    ) -> tuple[np.ndarray, int, np.ndarray, bool] | None:
+        """
+        Run the sampling BFS server-side in one recursive CTE.
+
+        Returns per-level new-node counts (BFS first-seen level) and the
+        out-edges of each level, so no frontier IDs cross the wire.
+        Unlike the client-side path this cannot stop reading mid-level at
+        a hub. The server stops expanding a level whose distinct nodes
+        (revisits included) exceed hub_threshold times the previous
+        level's, and reads at most SAMPLE_CTE_MAX_ROWS (node, level) rows,
+        or max_nodes + 1 when given; levels past the first hub level are
+        discarded afterwards.
+
+        A row can repeat a node seen at an earlier level, so hitting the
+        row cap only proves the node limit was exceeded if more than
+        max_nodes distinct nodes came back.
 
+        Returns:
+            (level_sizes, edges_seen, expansion_factors, hub_detected), or
+            None if the row cap cut the sample short without exceeding
+            max_nodes
+        """
+        if self.direction == "outbound":
+            src, dst = self.from_col, self.to_col
+        else:  # inbound
+            src, dst = self.to_col, self.from_col
+
+        row_cap = SAMPLE_CTE_MAX_ROWS
+        if max_nodes is not None:
+            row_cap = min(row_cap, max_nodes + 1)
+
+        # Each recursion step is one BFS level, so the LIMIT in capped ends
+        # the recursion itself once that many rows have been produced. The
+        # seed is COALESCEd with a NULL of the key column's type: a bound
+        # int alone is integer and clashes with bigint keys.
+        query = f"""
+            WITH RECURSIVE bfs(node, lvl, lvl_size, prev_size) AS (
+                SELECT
+                    COALESCE(
+                        %(start_id)s,
+                        (SELECT {dst} FROM {self.edges_table} LIMIT 0)
+                    ),
+                    0, 1::bigint, 1::bigint
+                UNION ALL
+                SELECT node, lvl, COUNT(*) OVER (), prev_size
+                FROM (
+                    SELECT DISTINCT e.{dst} AS node, bfs.lvl + 1 AS lvl,
+                        bfs.lvl_size AS prev_size
+                    FROM {self.edges_table} e
+                    JOIN bfs ON e.{src} = bfs.node
+                    WHERE bfs.lvl < %(depth)s
+                      AND bfs.lvl_size <= %(hub_threshold)s * bfs.prev_size
+                ) level
+            ),
+            capped AS (
+                SELECT node, lvl FROM bfs LIMIT %(row_cap)s
+            ),
+            first_seen AS (
+                SELECT node, MIN(lvl) AS lvl FROM capped GROUP BY node
+            )
+            SELECT
+                lvl,
+                COUNT(*),
+                COALESCE(SUM(
+                    CASE WHEN lvl < %(depth)s THEN
+                        (SELECT COUNT(*) FROM {self.edges_table} e
+                         WHERE e.{src} = first_seen.node)
+                    ELSE 0 END
+                ), 0),
+                (SELECT COUNT(*) FROM capped)
+            FROM first_seen
+            GROUP BY lvl
+            ORDER BY lvl
+        """
         with self.conn.cursor() as cur:
-            if self.direction == "outbound":
-                query = f"""
-                    SELECT {self.from_col}, {self.to_col}
-                    FROM {self.edges_table}
-                    WHERE {self.from_col} = ANY(%s)
-                """
-                cur.execute(query, (frontier_ids,))
-            elif self.direction == "inbound":
-                query = f"""
-                    SELECT {self.from_col}, {self.to_col}
-                    FROM {self.edges_table}
-                    WHERE {self.to_col} = ANY(%s)
-                """
-                cur.execute(query, (frontier_ids,))
-            else:  # both
-                query = f"""
-                    SELECT {self.from_col}, {self.to_col}
-                    FROM {self.edges_table}
-                    WHERE {self.from_col} = ANY(%s) OR {self.to_col} = ANY(%s)
-                """
-                cur.execute(query, (frontier_ids, frontier_ids))
+            cur.execute(query, {
+                "start_id": start_id,
+                "depth": depth,
+                "hub_threshold": self.hub_threshold,
+                "row_cap": row_cap,
+            })
+            rows = cur.fetchall()
+
+        truncated = rows[0][3] >= row_cap
+        if truncated and (
+            max_nodes is None or sum(row[1] for row in rows) <= max_nodes
+        ):
+            return None
+
+        # BFS levels are contiguous; a short result means an empty level,
+        # which stays zero in the preallocated arrays. A truncated result
+        # ends at the partially read level instead.
+        n_levels = len(rows) if truncated else min(len(rows) + 1, depth + 1)
+        level_sizes = np.zeros(n_levels, dtype=np.int64)
+        level_edges = np.zeros(n_levels, dtype=np.int64)
+        for lvl, count, edges, _ in rows:
+            level_sizes[lvl] = count
+            level_edges[lvl] = edges
+
+        # Every level before the last reached is non-empty
+        expansion_factors = level_sizes[1:] / level_sizes[:-1]
+        hubs = np.flatnonzero(expansion_factors > self.hub_threshold)
+        hub_detected = bool(hubs.size)
+        if hub_detected:
+            level_sizes = level_sizes[: hubs[0] + 2]
+            expansion_factors = expansion_factors[: hubs[0] + 1]
+
+        # Edges were read from every level except the last one reached
+        edges_seen = int(level_edges[: len(level_sizes) - 1].sum())
+        return level_sizes, edges_seen, expansion_factors, hub_detected
+
+    def _bfs_python(
+        self, start_id: int, depth: int, max_nodes: int | None = None
+    ) -> tuple[np.ndarray, int, np.ndarray, bool, int]:
+        """
+        Run the sampling BFS client-side, one edge query per level.
+
+        Returns:
+            (level_sizes, edges_seen, expansion_factors, hub_detected,
+            visited_count)
+        """
+        frontier = np.array([start_id], dtype=np.int64)
+        visited = _VisitedIds(start_id)
+        level_sizes = np.zeros(depth + 1, dtype=np.int64)
+        level_sizes[0] = 1  # Level 0 has 1 node
+        n_levels = 1
+        total_edges_seen = 0
+        expansion_factors = np.zeros(depth, dtype=np.float64)
+        hub_detected = False
+        over_limit = False
+
+        for _ in range(depth):
+            if not frontier.size:
+                break
+
+            # Stream edges in chunks; stop reading once the level is a hub
+            new_nodes: list[np.ndarray] = []
+            new_count = 0
+            with closing(self._fetch_edges(frontier.tolist())) as chunks:
+                for edges in chunks:
+                    total_edges_seen += len(edges)
+
+                    # Unseen targets, deduplicated in C rather than per-edge
+                    targets = visited.add_unseen(
+                        _sorted_unique(self._get_targets(edges, frontier))
+                    )
+                    new_nodes.append(targets)
+                    new_count += targets.size
+
+                    if new_count / frontier.size > self.hub_threshold:
+                        hub_detected = True
+                        break
+                    if max_nodes is not None and len(visited) > max_nodes:
+                        over_limit = True
+                        break
+
+            # Calculate expansion factor
+            expansion_factors[n_levels - 1] = new_count / frontier.size
+
+            level_sizes[n_levels] = new_count
+            n_levels += 1
+            # Sorted so "both" can test edge sources with a binary search
+            frontier = (
+                np.sort(np.concatenate(new_nodes))
+                if new_nodes
+                else np.empty(0, dtype=np.int64)
+            )
+
+            # A hub or a blown node limit aborts traversal anyway; deeper
+            # levels add nothing
+            if hub_detected or over_limit:
+                break
+
+        return (
+            level_sizes[:n_levels],
+            total_edges_seen,
+            expansion_factors[: n_levels - 1],
+            hub_detected,
+            len(visited),
+        )
+
+    def _fetch_edges(self, frontier_ids: list[int]) -> Iterator[np.ndarray]:
+        """
+        Stream edges for frontier nodes as (n, 2) int64 array chunks.
 
-            return cur.fetchall()
+        Uses a server-side cursor so a high-fanout level is never
+        materialized client-side at once; closing the generator early
+        closes the cursor and discards the unread rows.
+        """
+        if not frontier_ids:
+            return
+
+        # Large frontiers can join a temp table: a huge ANY(array) literal is
+        # costly to ship and can push the planner into a seq scan
+        if (
+            self.frontier_temp_table
+            and len(frontier_ids) > FRONTIER_TEMP_TABLE_MIN
+            and self._connection_writable()
+        ):
+            self._load_frontier_table(frontier_ids)
+            match = f"IN (SELECT id FROM {_FRONTIER_TABLE})"
+            params = {}
+        else:
+            match = "= ANY(%(ids)s)"
+            # int IDs as one '{...}' literal: cheaper than per-element
+            # list adaptation, and it takes the column's array type
+            params = {"ids": "{" + ",".join(map(str, frontier_ids)) + "}"}
 
-    def _get_target(
-        self, from_id: int, to_id: int, frontier: set[int]
-    ) -> int | None:
-        """Get target node based on direction."""
         if self.direction == "outbound":
-            return to_id
+            wheres = [f"{self.from_col} {match}"]
         elif self.direction == "inbound":
-            return from_id
+            wheres = [f"{self.to_col} {match}"]
         else:  # both
-            if from_id in frontier:
-                return to_id
-            elif to_id in frontier:
-                return from_id
-            return None
+            # One index-friendly SELECT per endpoint instead of an OR, which
+            # large frontiers turn into a full scan; the second skips edges
+            # the first already returned
+            wheres = [
+                f"{self.from_col} {match}",
+                f"{self.to_col} {match} AND ({self.from_col} {match}) IS NOT TRUE",
+            ]
+
+        # Named cursors need a transaction unless declared WITH HOLD
+        with self.conn.cursor(
+            name=f"vg_sample_{id(self)}", withhold=self.conn.autocommit
+        ) as cur:
+            cur.itersize = EDGE_FETCH_CHUNK
+            query = " UNION ALL ".join(
+                f"""
+                SELECT {self.from_col}, {self.to_col}
+                FROM {self.edges_table}
+                WHERE {where}
+                """
+                for where in wheres
+            )
+            cur.execute(query, params)
 
-    def _detect_growth_trend(
-        self, level_sizes: list[int]
-    ) -> Literal["increasing", "stable", "decreasing"]:
-        """Detect overall growth trend from level sizes."""
-        if len(level_sizes) < 3:
-            return "stable"
+            while rows := cur.fetchmany(EDGE_FETCH_CHUNK):
+                yield np.array(rows, dtype=np.int64).reshape(-1, 2)
 
-        # Compare early vs late growth rates
-        # Skip level 0 (always 1) and use levels 1-end
-        sizes = level_sizes[1:]  # Exclude start node
-        if len(sizes) < 2:
-            return "stable"
+    def _connection_writable(self) -> bool:
+        """
+        Whether conn's transaction may run the temp-table DDL.
 
-        # Calculate growth rates between consecutive levels
-        growth_rates: list[float] = []
-        for i in range(1, len(sizes)):
-            if sizes[i - 1] > 0:
-                growth_rates.append(sizes[i] / sizes[i - 1])
-            else:
-                growth_rates.append(0.0)
+        Checked before any CREATE, since a failed one would abort the
+        caller's transaction. Covers set_session(readonly=True) and hot
+        standbys, which both report transaction_read_only.
+        """
+        if self._can_write is None:
+            with self.conn.cursor() as cur:
+                cur.execute("SHOW transaction_read_only")
+                self._can_write = cur.fetchone()[0] == "off"
+        return self._can_write
 
-        if not growth_rates:
-            return "stable"
+    def _load_frontier_table(self, frontier_ids: list[int]) -> None:
+        """
+        Replace the contents of the session temp table with frontier_ids.
+
+        The table is session-scoped rather than ON COMMIT DROP so it also
+        survives between statements under autocommit.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {_FRONTIER_TABLE} (id bigint PRIMARY KEY)"
+            )
+            cur.execute(f"TRUNCATE {_FRONTIER_TABLE}")
+            execute_values(
+                cur,
+                f"INSERT INTO {_FRONTIER_TABLE} (id) VALUES %s",
+                [(node_id,) for node_id in frontier_ids],
+                page_size=EDGE_FETCH_CHUNK,
+            )
+
+    def _get_targets(self, edges: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+        """Get target node of each edge based on direction (frontier sorted)."""
+        if self._target_idx is not None:
+            return edges[:, self._target_idx]
+
+        # both: every fetched edge touches the frontier, so an edge whose
+        # source is not in the frontier was reached via its target.
+        # frontier is kept sorted, so membership needs no per-chunk re-sort
+        return np.where(_in_sorted(edges[:, 0], frontier), edges[:, 1], edges[:, 0])
+
+    def _detect_growth_trend(
+        self, growth_rates: np.ndarray
+    ) -> Literal["increasing", "stable", "decreasing"]:
+        """Detect overall growth trend from level-to-level growth rates."""
+        # Compare early vs late growth rates
+        # Skip the level 0 -> 1 rate (level 0 is always the start node)
+        rates = growth_rates[1:]
 
         # Compare first half vs second half average growth
-        mid = len(growth_rates) // 2
+        mid = len(rates) // 2
         if mid == 0:
             return "stable"
 
-        early_avg = sum(growth_rates[:mid]) / mid
-        late_avg = sum(growth_rates[mid:]) / len(growth_rates[mid:])
+        early_avg = rates[:mid].mean()
+        late_avg = rates[mid:].mean()
 
         if late_avg > early_avg * 1.2:
             return "increasing"
@@ -15,12 +15,31 @@ from .base import (
     MAX_NODES,
     MAX_RESULTS,
     QUERY_TIMEOUT_SEC,
+    BFSArena,
     SafetyLimitExceeded,
     SubgraphTooLarge,
     check_limits,
+    clear_stop_cache,
+    close_connection_pools,
+    configure_connection,
     estimate_reachable_nodes,  # DEPRECATED - use virt_graph.estimator
+    fetch_edges_array,
     fetch_edges_for_frontier,
+    fetch_edges_with_stop,
     fetch_nodes,
+    fetch_nodes_columnar,
+    fetch_nodes_iter,
+    fetch_nodes_ordered,
+    fetch_nodes_sample,
+    init_connection_pool,
+    iter_edges_for_frontier,
+    make_edge_fetcher,
+    pooled_connection,
+    reachable_nodes,
+    should_stop,
+    should_stop_many,
+    subgraph_exceeds,
+    traverse_edges_cte,
     # Result TypedDicts for type hints
     AllShortestPathsResult,
     CentralityResult,
@@ -59,10 +78,29 @@ __all__ = [
     "SafetyLimitExceeded",
     "SubgraphTooLarge",
     # Base functions
+    "BFSArena",
     "check_limits",
+    "clear_stop_cache",
+    "close_connection_pools",
+    "configure_connection",
     "estimate_reachable_nodes",  # DEPRECATED
+    "fetch_edges_array",
     "fetch_edges_for_frontier",
+    "fetch_edges_with_stop",
     "fetch_nodes",
+    "fetch_nodes_columnar",
+    "fetch_nodes_iter",
+    "fetch_nodes_ordered",
+    "fetch_nodes_sample",
+    "init_connection_pool",
+    "iter_edges_for_frontier",
+    "make_edge_fetcher",
+    "pooled_connection",
+    "reachable_nodes",
+    "should_stop",
+    "should_stop_many",
+    "subgraph_exceeds",
+    "traverse_edges_cte",
     # Result TypedDicts
     "TraverseResult",
     "PathAggregateResult",
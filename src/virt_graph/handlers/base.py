@@ -11,12 +11,25 @@ This module provides the foundation for all graph operation handlers:
 Note: estimate_reachable_nodes is deprecated. Use the estimator module instead.
 """
 
+import functools
+import hashlib
+import itertools
+import re
+import threading
 import warnings
+import weakref
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from decimal import Decimal
 from typing import Any, TypedDict, Union
 
+import numpy as np
 import psycopg2
+import psycopg2.errorcodes
+import psycopg2.extensions
+import psycopg2.pool
 from psycopg2.extensions import connection as PgConnection
 
 # Type alias for node IDs - can be single value or tuple for composite keys
@@ -175,6 +188,82 @@ MAX_RESULTS = 100_000  # Max rows to return (covers demo DB's largest table ~60K
 QUERY_TIMEOUT_SEC = 30  # Per-query timeout
 
 
+# NUMERIC -> float via psycopg2's C float parser, registered per node cursor.
+# Prevents Decimal/float TypeErrors in calculations without a per-value pass.
+_NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, "NUMERIC_AS_FLOAT", psycopg2.extensions.FLOAT
+)
+# NUMERIC[] elements go through the same caster instead of Decimal
+_NUMERIC_ARRAY_AS_FLOAT = psycopg2.extensions.new_array_type(
+    psycopg2.extensions.DECIMALARRAY.values, "NUMERIC_ARRAY_AS_FLOAT", _NUMERIC_AS_FLOAT
+)
+
+
+def _register_numeric_as_float(cur: Any) -> None:
+    """Decode NUMERIC and NUMERIC[] as float on cur only; other cursors keep Decimal."""
+    psycopg2.extensions.register_type(_NUMERIC_AS_FLOAT, cur)
+    psycopg2.extensions.register_type(_NUMERIC_ARRAY_AS_FLOAT, cur)
+
+
+# Frontiers larger than this fetch edges through a server-side cursor,
+# EDGE_FETCH_ITERSIZE rows per round trip
+SERVER_CURSOR_MIN_FRONTIER = 500
+EDGE_FETCH_ITERSIZE = 10_000
+
+# With shard=True, single-direction frontiers larger than this are split
+# into PARALLEL_FETCH_SHARDS queries run concurrently on pooled connections
+PARALLEL_FETCH_MIN_FRONTIER = 5000
+PARALLEL_FETCH_SHARDS = 4
+
+# direction="both" query strategies, matching the endpoint index on edges_table
+ENDPOINT_INDEXES = (None, "union_all", "gin_array")
+
+# Max distinct query shapes (per builder) whose SQL text is kept
+QUERY_CACHE_MAXSIZE = 256
+
+# Placeholders in cached edge-query params, bound per call by _bind_edge_params
+_FRONTIER_ARRAY = object()  # frontier as an array literal (see _id_array_param)
+_FRONTIER_LIST = object()  # frontier as a Python list (typed array for unnest)
+_VALID_AT = object()  # temporal filter timestamp
+
+
+class _FrontierColumn:
+    """Placeholder for one column of tuple frontier IDs, bound as a typed array."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+# Max edge-query shapes kept as server-side prepared statements per connection
+PREPARED_STATEMENTS_MAX = 64
+
+# Names of statements already PREPAREd on each connection
+_prepared: "weakref.WeakKeyDictionary[PgConnection, set[str]]" = weakref.WeakKeyDictionary()
+# Names still PREPAREd server-side but unusable (their result type changed);
+# DEALLOCATEd before the next PREPARE
+_stale_prepared: "weakref.WeakKeyDictionary[PgConnection, set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+_prepared_lock = threading.Lock()
+
+# Max should_stop() answers remembered per connection (least recently used
+# evicted first)
+STOP_CACHE_MAXSIZE = 100_000
+
+# connection -> {(nodes_table, node_id, stop_condition, id_cols): matches}
+_stop_cache: "weakref.WeakKeyDictionary[PgConnection, dict[tuple, bool]]" = (
+    weakref.WeakKeyDictionary()
+)
+_stop_cache_lock = threading.Lock()
+
+# Connections whose session already carries the statement timeout
+_timeout_conns: "weakref.WeakSet[PgConnection]" = weakref.WeakSet()
+_timeout_lock = threading.Lock()
+_STATEMENT_TIMEOUT_OPTION = f"-c statement_timeout={QUERY_TIMEOUT_SEC * 1000}"
+
+
 class SafetyLimitExceeded(Exception):
     """Raised when a handler would exceed safety limits."""
 
@@ -187,6 +276,214 @@ class SubgraphTooLarge(Exception):
     pass
 
 
+class BFSArena:
+    """
+    Nodes reached by a BFS, in discovery order, with parent indices.
+
+    Traversal records one parent index per node instead of copying the
+    parent's path list; paths are rebuilt from the parent chain only
+    when asked for.
+    """
+
+    __slots__ = ("nodes", "parents", "index")
+
+    def __init__(self, root: NodeId) -> None:
+        self.nodes: list[NodeId] = [root]
+        self.parents = array("q", [-1])
+        self.index: dict[NodeId, int] = {root: 0}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: NodeId) -> bool:
+        return node in self.index
+
+    def add(self, node: NodeId, parent: NodeId) -> None:
+        """Record node as reached from parent (already in the arena)."""
+        self.index[node] = len(self.nodes)
+        self.nodes.append(node)
+        self.parents.append(self.index[parent])
+
+    def path_to(self, node: NodeId) -> list[NodeId]:
+        """Path from the root to node, both included."""
+        path = []
+        i = self.index[node]
+        while i >= 0:
+            path.append(self.nodes[i])
+            i = self.parents[i]
+        path.reverse()
+        return path
+
+    def paths(self, include_root: bool = True) -> dict[NodeId, list[NodeId]]:
+        """Every node's path from the root; parents precede children, so each is built once."""
+        nodes = self.nodes
+        built: list[list[NodeId]] = []
+        for i, parent in enumerate(self.parents):
+            built.append(built[parent] + [nodes[i]] if parent >= 0 else [nodes[i]])
+        start = 0 if include_root else 1
+        return dict(zip(nodes[start:], built[start:]))
+
+
+def _id_array_param(ids: list[NodeId]) -> Any:
+    """
+    Bind value for an ID list matched with `col = ANY(%s)`.
+
+    psycopg2 adapts lists element by element into ARRAY[...] (~1.5 us per
+    ID). Plain int IDs are sent as one '{1,2,...}' array literal instead;
+    left untyped, it takes the column's array type, so index and hashed
+    ANY() lookups are unaffected. Other ID types keep list adaptation.
+    """
+    if all(type(i) is int for i in ids):
+        return "{" + ",".join(map(str, ids)) + "}"
+    return list(ids)
+
+
+# Table/column arguments are spliced into SQL text (so query text can be
+# cached without a connection): plain or double-quoted identifiers, optionally
+# schema-qualified. sql_filter/stop_condition/order_by stay raw SQL.
+_IDENTIFIER_PART = r'(?:[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+")'
+_IDENTIFIER_RE = re.compile(rf"{_IDENTIFIER_PART}(?:\.{_IDENTIFIER_PART})?")
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _is_identifier(name: str) -> bool:
+    return isinstance(name, str) and _IDENTIFIER_RE.fullmatch(name) is not None
+
+
+def _check_identifiers(*names: str | Sequence[str] | None) -> None:
+    """
+    Raise ValueError unless every table/column name is a SQL identifier.
+
+    Each argument is a name, a sequence of names (composite keys) or None.
+    """
+    for name in names:
+        if name is None:
+            continue
+        for part in (name,) if isinstance(name, str) else name:
+            if not _is_identifier(part):
+                raise ValueError(f"Invalid SQL identifier: {part!r}")
+
+
+def _unique_ids(ids: list[NodeId]) -> list[NodeId]:
+    """
+    Drop repeated IDs, keeping first-seen order.
+
+    Repeats never add rows to `= ANY()`/IN matches, but they inflate the
+    bound array or VALUES list and, across frontier shards, would return
+    the same edges twice. Ordering is left to the server: B-tree scans
+    sort ScalarArrayOp keys themselves.
+    """
+    return list(dict.fromkeys(ids))
+
+
+# psycopg2 placeholder grammar: %% is a literal percent, %s a parameter
+_PLACEHOLDER_RE = re.compile(r"%[%s]")
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _numbered_query(query: str) -> tuple[str, int]:
+    """
+    Rewrite a %s-parameterized query with $1..$n placeholders for PREPARE.
+
+    Tokenized the way psycopg2 reads it, so %% escapes (including a
+    literal %s written as %%s in sql_filter/stop_condition) stay text.
+    Built once per cached query shape. Returns (text, placeholder count).
+    """
+    count = 0
+
+    def number(match: re.Match) -> str:
+        nonlocal count
+        if match.group() == "%%":
+            return "%%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER_RE.sub(number, query), count
+
+
+def _execute_prepared(conn: PgConnection, cur: Any, query: str, params: list[Any]) -> None:
+    """
+    Execute a %s-parameterized query through a server-side prepared statement.
+
+    Each distinct query text is PREPAREd once per connection (named by its
+    hash) and re-run with EXECUTE, skipping parse and plan on repeat calls.
+    The first PREPARE is sent in the same round-trip as its EXECUTE.
+    Past PREPARED_STATEMENTS_MAX shapes, queries run unprepared. Parameter
+    types are inferred by the server from how each placeholder is used,
+    except Python lists of ints: they are declared bigint[], since
+    placeholders such as unnest(%s) give the server nothing to infer from.
+
+    A name the server no longer knows (after DISCARD ALL or DEALLOCATE) is
+    forgotten and re-PREPAREd. So is one whose result columns changed
+    under it ("cached plan must not change result type", e.g. a SELECT *
+    after ALTER TABLE ... ADD COLUMN), after a DEALLOCATE. If the failed
+    EXECUTE aborted the caller's transaction the error is raised instead,
+    and the next call re-PREPAREs.
+    """
+    types = [
+        "bigint[]" if type(p) is list and all(type(i) is int for i in p) else "unknown"
+        for p in params
+    ]
+    declared = f" ({', '.join(types)})" if "bigint[]" in types else ""
+    name = f"vg_{hashlib.md5((query + declared).encode()).hexdigest()[:16]}"
+    with _prepared_lock:
+        prepared = _prepared.setdefault(conn, set())
+        known = name in prepared
+        if not known and len(prepared) >= PREPARED_STATEMENTS_MAX:
+            known = None
+    numbered, n_placeholders = _numbered_query(query)
+    if known is None or n_placeholders != len(params):
+        # A placeholder/parameter mismatch fails here as it would unprepared
+        cur.execute(query, params)
+        return
+    execute = f"EXECUTE {name}({', '.join(['%s'] * len(params))})"
+    if known:
+        try:
+            cur.execute(execute, params)
+            return
+        except psycopg2.Error as e:
+            if e.pgcode not in (
+                psycopg2.errorcodes.INVALID_SQL_STATEMENT_NAME,
+                psycopg2.errorcodes.FEATURE_NOT_SUPPORTED,
+            ):
+                raise
+            with _prepared_lock:
+                prepared.discard(name)
+                if e.pgcode == psycopg2.errorcodes.FEATURE_NOT_SUPPORTED:
+                    _stale_prepared.setdefault(conn, set()).add(name)
+            if (
+                conn.info.transaction_status
+                == psycopg2.extensions.TRANSACTION_STATUS_INERROR
+            ):
+                raise
+
+    with _prepared_lock:
+        stale = _stale_prepared.get(conn)
+        deallocate = f"DEALLOCATE {name}; " if stale and name in stale else ""
+    try:
+        cur.execute(
+            f"{deallocate}PREPARE {name}{declared} AS {numbered}; {execute}", params
+        )
+    except psycopg2.Error as e:
+        # PREPARE outlives a failing EXECUTE; only syntax/analysis errors
+        # (class 42), or a failed DEALLOCATE ahead of it, mean the statement
+        # was never created. Either way no stale one is left behind.
+        with _prepared_lock:
+            if stale:
+                stale.discard(name)
+            if (
+                e.pgcode
+                and not e.pgcode.startswith("42")
+                and e.pgcode != psycopg2.errorcodes.INVALID_SQL_STATEMENT_NAME
+            ):
+                prepared.add(name)
+        raise
+    with _prepared_lock:
+        if stale:
+            stale.discard(name)
+        prepared.add(name)
+
+
 def check_limits(depth: int, visited_count: int) -> None:
     """
     Check traversal hasn't exceeded safety limits.
@@ -238,21 +535,414 @@ def estimate_reachable_nodes(
     """
     warnings.warn(
         "estimate_reachable_nodes is deprecated. "
-        "Use virt_graph.estimator.estimate() with GraphSampler for better accuracy.",
+        "Use virt_graph.estimator.estimate() with GraphSampler for better accuracy, "
+        "or subgraph_exceeds() when only the limit check matters.",
         DeprecationWarning,
         stacklevel=2,
     )
 
-    # Delegate to new estimator for backwards compatibility
+    # Delegate to new estimator for backwards compatibility. The warning
+    # and this import cost ~2 us together next to the sampling queries;
+    # the warnings registry already dedupes per call site
     from ..estimator import GraphSampler, estimate, get_table_bound
 
     sampler = GraphSampler(conn, edges_table, edge_from_col, edge_to_col, direction)
-    sample = sampler.sample(start_id, depth=min(3, max_depth))
+    sample = sampler.sample(start_id, depth=min(3, max_depth), max_nodes=MAX_NODES)
+    if sample.terminated and sample.visited_count == 1:
+        # No edges out of start_id: the answer is exact, skip the table bound
+        return 1
     table_bound = get_table_bound(conn, edges_table, edge_from_col, edge_to_col)
 
     return estimate(sample, max_depth, table_bound)
 
 
+def subgraph_exceeds(
+    conn: PgConnection,
+    edges_table: str,
+    start_id: NodeId,
+    edge_from_col: str,
+    edge_to_col: str,
+    cap: int = MAX_NODES,
+    max_depth: int = MAX_DEPTH,
+    direction: str = "outbound",
+    sql_filter: str | None = None,
+) -> bool:
+    """
+    Check whether more than `cap` nodes are reachable from start_id.
+
+    Exact bounded BFS for callers that only need the limit decision, not a
+    count. Each level fetches at most cap + 1 distinct neighbors, so
+    PostgreSQL stops scanning as soon as the answer is known, and the
+    walk returns as soon as the visited count passes cap.
+
+    Args:
+        conn: Database connection
+        edges_table: Table containing edges
+        start_id: Starting node ID
+        edge_from_col: Column for edge source
+        edge_to_col: Column for edge target
+        cap: Node limit to test against (start node included)
+        max_depth: Maximum traversal depth (clamped to MAX_DEPTH)
+        direction: "outbound", "inbound", or "both"
+        sql_filter: SQL WHERE clause to filter edges (e.g., "is_active = true")
+
+    Returns:
+        True if the reachable subgraph has more than cap nodes
+    """
+    from ..estimator.sampler import _VisitedIds
+
+    query, slots = _neighbors_query(
+        edges_table, edge_from_col, edge_to_col, direction, sql_filter
+    )
+    # Integer keys use the sampler's bitmap-backed visited set, which
+    # filters a whole level in one vectorized pass
+    int_ids = type(start_id) is int
+    visited: Any = _VisitedIds(start_id) if int_ids else {start_id}
+    frontier = [start_id]
+
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        for _ in range(min(max_depth, MAX_DEPTH)):
+            if len(visited) > cap:
+                return True
+            if not frontier:
+                return False
+
+            params = _bind_edge_params(slots, frontier, None) + [cap + 1]
+            cur.execute(query, params)
+            neighbors = [row[0] for row in cur.fetchall()]
+            # More distinct neighbors than cap on one level settles it;
+            # otherwise the level was read in full
+            if len(neighbors) > cap:
+                return True
+
+            if int_ids:
+                # add_unseen() takes sorted unique IDs; DISTINCT made them unique
+                level = np.sort(np.array(neighbors, dtype=np.int64))
+                frontier = visited.add_unseen(level).tolist()
+            else:
+                frontier = [n for n in neighbors if n not in visited]
+                visited.update(frontier)
+
+    return len(visited) > cap
+
+
+def reachable_nodes(
+    conn: PgConnection,
+    edges_table: str,
+    start_id: NodeId,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str = "outbound",
+    max_depth: int = 10,
+    max_nodes: int = MAX_NODES,
+    sql_filter: str | None = None,
+) -> dict[NodeId, int]:
+    """
+    Map every node reachable from start_id to its BFS depth, in one query.
+
+    Server-side counterpart of traverse() for callers that only need the
+    reachable set: the search runs as one recursive CTE, so it costs a
+    single round trip at any depth and no edges cross the wire. The
+    recursion keeps distinct (node, depth) pairs rather than paths, so
+    DAGs with shared subtrees do not blow up into one row per path.
+
+    Args:
+        conn: Database connection
+        edges_table: Table containing edges
+        start_id: Starting node ID
+        edge_from_col: Column for edge source
+        edge_to_col: Column for edge target
+        direction: "outbound", "inbound", or "both"
+        max_depth: Maximum traversal depth (clamped to MAX_DEPTH)
+        max_nodes: Raise instead of returning more nodes than this
+        sql_filter: SQL WHERE clause to filter edges (e.g., "is_active = true")
+
+    Returns:
+        Dict of node ID -> depth at which BFS first reaches it (start node at 0)
+
+    Raises:
+        SubgraphTooLarge: If more than max_nodes nodes are reachable
+    """
+    query = _reachable_query(edges_table, edge_from_col, edge_to_col, direction, sql_filter)
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        cur.execute(query, [start_id, min(max_depth, MAX_DEPTH), max_nodes + 1])
+        depths = dict(cur.fetchall())
+
+    if len(depths) > max_nodes:
+        raise SubgraphTooLarge(
+            f"More than {max_nodes:,} nodes reachable from {start_id!r} "
+            f"within depth {max_depth}"
+        )
+    return depths
+
+
+def _as_column_type(expr: str, table: str, column: str) -> str:
+    """
+    SQL for expr coerced to the type of table.column.
+
+    A bound Python int is an integer constant, so a recursive CTE seeded
+    with it fails against bigint key columns ("column 1 has type integer
+    in non-recursive term but type bigint overall"). COALESCE with a NULL
+    of the column's type resolves to that type; the planner folds it away.
+    """
+    return f"COALESCE({expr}, (SELECT {column} FROM {table} LIMIT 0))"
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _reachable_query(
+    edges_table: str,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str,
+    sql_filter: str | None,
+) -> str:
+    """Recursive BFS CTE for reachable_nodes()."""
+    _check_identifiers(edges_table, edge_from_col, edge_to_col)
+    sql_filter_clause = f" AND ({sql_filter})" if sql_filter else ""
+    outbound = f"""
+        SELECT e.{edge_to_col} AS node FROM {edges_table} e
+        WHERE e.{edge_from_col} = bfs.node{sql_filter_clause}
+    """
+    inbound = f"""
+        SELECT e.{edge_from_col} AS node FROM {edges_table} e
+        WHERE e.{edge_to_col} = bfs.node{sql_filter_clause}
+    """
+    if direction == "outbound":
+        step = outbound
+    elif direction == "inbound":
+        step = inbound
+    else:  # both: one index lookup per endpoint
+        step = f"{outbound} UNION ALL {inbound}"
+    # The seed takes the key type of the nodes the step returns
+    seed = _as_column_type(
+        "%s", edges_table, edge_from_col if direction == "inbound" else edge_to_col
+    )
+    # UNION drops repeated (node, lvl) pairs; MIN(lvl) is the BFS depth
+    return f"""
+        WITH RECURSIVE bfs(node, lvl) AS (
+            SELECT {seed}, 0
+            UNION
+            SELECT n.node, bfs.lvl + 1
+            FROM bfs CROSS JOIN LATERAL ({step}) n
+            WHERE bfs.lvl < %s
+        )
+        SELECT node, MIN(lvl) FROM bfs GROUP BY node LIMIT %s
+    """
+
+
+def traverse_edges_cte(
+    conn: PgConnection,
+    edges_table: str,
+    start_ids: list[NodeId],
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str = "outbound",
+    max_depth: int = 10,
+    max_nodes: int = MAX_NODES,
+    nodes_table: str | None = None,
+    node_id_column: str = "id",
+    soft_delete_column: str | None = None,
+    valid_at: datetime | None = None,
+    temporal_start_col: str | None = None,
+    temporal_end_col: str | None = None,
+    sql_filter: str | None = None,
+) -> list[tuple[NodeId, NodeId, int]]:
+    """
+    Fetch every edge a bounded BFS from start_ids crosses, in one query.
+
+    Server-side counterpart of calling fetch_edges_for_frontier() once per
+    level: the search runs as one recursive CTE, so a depth-D traversal
+    costs one round trip instead of D. Each edge comes back once, tagged
+    with the level at which the BFS first crosses it (1 for edges out of
+    the start nodes). Edge filters behave as in fetch_edges_for_frontier().
+    Single-column keys only.
+
+    Args:
+        conn: Database connection
+        edges_table: Table containing edges
+        start_ids: Node IDs the search starts from (depth 0)
+        edge_from_col: Column for edge source
+        edge_to_col: Column for edge target
+        direction: "outbound", "inbound", or "both"
+        max_depth: Maximum traversal depth (clamped to MAX_DEPTH)
+        max_nodes: Raise instead of returning the edges of more nodes than this
+        nodes_table: Node table (required for soft_delete_column)
+        node_id_column: ID column of nodes_table
+        soft_delete_column: Skip edges touching nodes where this column is set
+        valid_at: Only follow edges valid at this time
+        temporal_start_col: Edge validity start column (used with valid_at)
+        temporal_end_col: Edge validity end column (used with valid_at)
+        sql_filter: SQL WHERE clause to filter edges (e.g., "is_active = true")
+
+    Returns:
+        List of (from_id, to_id, depth) tuples
+
+    Raises:
+        SubgraphTooLarge: If more than max_nodes nodes are reachable
+    """
+    if not start_ids:
+        return []
+    start_ids = _unique_ids(start_ids)
+    temporal = bool(valid_at and temporal_start_col and temporal_end_col)
+    query, branch_count = _edges_cte_query(
+        edges_table, edge_from_col, edge_to_col, direction,
+        nodes_table if soft_delete_column else None, node_id_column, soft_delete_column,
+        temporal_start_col if temporal else None, temporal_end_col if temporal else None,
+        sql_filter,
+    )
+    depth = min(max_depth, MAX_DEPTH)
+    valid_params = [valid_at, valid_at] if temporal else []
+    # A Python list binds as a typed ARRAY[...], which unnest() needs
+    params = (
+        [start_ids] + valid_params * branch_count + [depth, max_nodes + 1]
+        + ([depth] + valid_params) * branch_count
+    )
+
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        cur.execute(query, params)
+        rows = cur.fetchall()
+
+    node_count = rows[0][3] if rows else len(start_ids)
+    if node_count > max_nodes:
+        raise SubgraphTooLarge(
+            f"More than {max_nodes:,} nodes reachable from {len(start_ids)} "
+            f"start node(s) within depth {max_depth}"
+        )
+    return [(from_id, to_id, lvl) for from_id, to_id, lvl, _ in rows]
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _edges_cte_query(
+    edges_table: str,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str,
+    nodes_table: str | None,
+    node_id_column: str,
+    soft_delete_column: str | None,
+    temporal_start_col: str | None,
+    temporal_end_col: str | None,
+    sql_filter: str | None,
+) -> tuple[str, int]:
+    """
+    Recursive BFS CTE for traverse_edges_cte().
+
+    Returns (query, branch_count): the number of directions followed,
+    i.e. how many times the valid_at pair is bound in the recursive step
+    and again in the edge select.
+    """
+    _check_identifiers(
+        edges_table, edge_from_col, edge_to_col, nodes_table, node_id_column,
+        soft_delete_column, temporal_start_col, temporal_end_col,
+    )
+    # Same edge filters as _build_edges_query(), applied to both the
+    # recursion and the final edge select
+    joins = ""
+    if soft_delete_column and nodes_table:
+        joins = f"""
+            JOIN {nodes_table} n_from ON e.{edge_from_col} = n_from.{node_id_column}
+                AND n_from.{soft_delete_column} IS NULL
+            JOIN {nodes_table} n_to ON e.{edge_to_col} = n_to.{node_id_column}
+                AND n_to.{soft_delete_column} IS NULL
+        """
+    filters = ""
+    if temporal_start_col and temporal_end_col:
+        filters += f"""
+            AND (e.{temporal_start_col} IS NULL OR e.{temporal_start_col} <= %s)
+            AND (e.{temporal_end_col} IS NULL OR e.{temporal_end_col} >= %s)
+        """
+    if sql_filter:
+        filters += f" AND ({sql_filter})"
+
+    # (near end, far end) of the edge for each direction followed
+    if direction == "outbound":
+        ends = [(edge_from_col, edge_to_col)]
+    elif direction == "inbound":
+        ends = [(edge_to_col, edge_from_col)]
+    else:  # both: one index lookup per endpoint
+        ends = [(edge_from_col, edge_to_col), (edge_to_col, edge_from_col)]
+
+    step = " UNION ALL ".join(
+        f"SELECT e.{far} AS node FROM {edges_table} e {joins} "
+        f"WHERE e.{near} = bfs.node {filters}"
+        for near, far in ends
+    )
+    branches = []
+    for i, (near, far) in enumerate(ends):
+        if len(ends) == 1:
+            crossed_here = ""
+        else:
+            # Each edge once, from whichever end the BFS reached first
+            # (the from side on a tie)
+            later = ">=" if i == 0 else ">"
+            crossed_here = (
+                f"LEFT JOIN depths o ON o.node = e.{far}"
+                f" WHERE (o.node IS NULL OR o.lvl {later} d.lvl) AND"
+            )
+        branches.append(f"""
+            SELECT e.{edge_from_col}, e.{edge_to_col}, d.lvl + 1,
+                   (SELECT count(*) FROM depths)
+            FROM depths d
+            JOIN {edges_table} e ON e.{near} = d.node
+            {joins}
+            {crossed_here or "WHERE"} d.lvl < %s
+            {filters}
+        """)
+
+    # The seed takes the key type of the nodes the step returns
+    seed = _as_column_type("s.id", edges_table, ends[0][1])
+    # UNION drops repeated (node, lvl) pairs; MIN(lvl) is the BFS depth
+    query = f"""
+        WITH RECURSIVE bfs(node, lvl) AS (
+            SELECT {seed}, 0 FROM unnest(%s) s(id)
+            UNION
+            SELECT n.node, bfs.lvl + 1
+            FROM bfs CROSS JOIN LATERAL ({step}) n
+            WHERE bfs.lvl < %s
+        ),
+        depths AS (
+            SELECT node, MIN(lvl) AS lvl FROM bfs GROUP BY node LIMIT %s
+        )
+        {" UNION ALL ".join(branches)}
+    """
+    return query, len(ends)
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _neighbors_query(
+    edges_table: str,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str,
+    sql_filter: str | None,
+) -> tuple[str, tuple]:
+    """
+    Distinct frontier neighbors, LIMITed, for subgraph_exceeds().
+
+    Returns (query, slots): slots lays out the frontier parameters for
+    _bind_edge_params(); the LIMIT is bound after them.
+    """
+    _check_identifiers(edges_table, edge_from_col, edge_to_col)
+    sql_filter_clause = f" AND ({sql_filter})" if sql_filter else ""
+    outbound = f"""
+        SELECT e.{edge_to_col} FROM {edges_table} e
+        WHERE e.{edge_from_col} = ANY(%s){sql_filter_clause}
+    """
+    inbound = f"""
+        SELECT e.{edge_from_col} FROM {edges_table} e
+        WHERE e.{edge_to_col} = ANY(%s){sql_filter_clause}
+    """
+    if direction == "outbound":
+        return f"SELECT DISTINCT * FROM ({outbound}) n LIMIT %s", (_FRONTIER_ARRAY,)
+    if direction == "inbound":
+        return f"SELECT DISTINCT * FROM ({inbound}) n LIMIT %s", (_FRONTIER_ARRAY,)
+    # UNION de-duplicates across both endpoints
+    return f"{outbound} UNION {inbound} LIMIT %s", (_FRONTIER_ARRAY, _FRONTIER_ARRAY)
+
+
 def fetch_edges_for_frontier(
     conn: PgConnection,
     edges_table: str,
@@ -269,6 +959,8 @@ def fetch_edges_for_frontier(
     temporal_end_col: str | None = None,
     # Edge filtering
     sql_filter: str | None = None,
+    endpoint_index: str | None = None,
+    shard: bool = False,
 ) -> list[tuple[NodeId, NodeId]]:
     """
     Fetch all edges for a frontier in a SINGLE query.
@@ -277,6 +969,17 @@ def fetch_edges_for_frontier(
     Uses PostgreSQL's ANY operator for efficient IN clause with arrays.
     Supports composite keys by accepting lists of column names.
 
+    direction="both" runs one indexed lookup per endpoint joined with
+    UNION ALL, so edges_table should be indexed on both edge_from_col and
+    edge_to_col. With endpoint_index="gin_array" it instead runs a single
+    array-overlap lookup, which needs a GIN index on both endpoints:
+
+        CREATE INDEX ... ON edges_table USING gin ((ARRAY[edge_from_col, edge_to_col]))
+
+    With shard=True, single-direction frontiers above
+    PARALLEL_FETCH_MIN_FRONTIER are split across concurrent pooled
+    connections instead (see _can_shard() for when that is skipped).
+
     Args:
         conn: Database connection
         edges_table: Table containing edges
@@ -296,143 +999,689 @@ def fetch_edges_for_frontier(
                          Required if valid_at is provided.
         sql_filter: SQL WHERE clause to filter edges (e.g., "is_active = true").
                    Injected into the query for edge-level filtering.
+        endpoint_index: How direction="both" matches the frontier: None or
+                       "union_all" (B-tree per endpoint) or "gin_array"
+                       (GIN on ARRAY[from, to]; single-column keys only).
+        shard: Opt in to the parallel fetch for large frontiers. Shards
+               connect with only conn's host, port, database, user and
+               password, and read committed data on their own backends:
+               they do not see conn's uncommitted writes, temp tables or
+               session settings (other than the pool's statement timeout).
 
     Returns:
         List of (from_id, to_id) tuples. For composite keys, each ID is a tuple.
     """
-    if not frontier_ids:
-        return []
+    return _fetch_frontier_edges(
+        conn, edges_table, frontier_ids, edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        shard=shard, endpoint_index=endpoint_index,
+    )
 
-    # Normalize columns to lists for composite key support
-    from_cols = [edge_from_col] if isinstance(edge_from_col, str) else list(edge_from_col)
-    to_cols = [edge_to_col] if isinstance(edge_to_col, str) else list(edge_to_col)
-    id_cols = [node_id_column] if isinstance(node_id_column, str) else list(node_id_column)
 
-    # Check if using composite keys
-    is_composite = len(from_cols) > 1 or len(to_cols) > 1
+def iter_edges_for_frontier(
+    conn: PgConnection,
+    edges_table: str,
+    frontier_ids: list[NodeId],
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    direction: str = "outbound",
+    nodes_table: str | None = None,
+    node_id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+    valid_at: datetime | None = None,
+    temporal_start_col: str | None = None,
+    temporal_end_col: str | None = None,
+    sql_filter: str | None = None,
+    endpoint_index: str | None = None,
+    itersize: int = EDGE_FETCH_ITERSIZE,
+) -> Iterator[tuple[NodeId, NodeId]]:
+    """
+    Stream edges for a frontier.
 
-    # Build column select expressions
-    from_cols_select = ", ".join(f"e.{c}" for c in from_cols)
-    to_cols_select = ", ".join(f"e.{c}" for c in to_cols)
+    Same arguments and edges as fetch_edges_for_frontier(), but edges are
+    pulled from a server-side cursor `itersize` at a time instead of
+    materialized in a list. Use when a hub's fan-out is consumed once
+    (e.g. counted or folded into a set) rather than kept.
 
-    # Build soft-delete join clause if needed
-    soft_delete_join = ""
-    if soft_delete_column and nodes_table:
-        # For composite keys, need to match all columns
-        from_join_conds = " AND ".join(
-            f"e.{fc} = n_from.{ic}" for fc, ic in zip(from_cols, id_cols)
-        )
-        to_join_conds = " AND ".join(
-            f"e.{tc} = n_to.{ic}" for tc, ic in zip(to_cols, id_cols)
+    Yields:
+        (from_id, to_id) tuples. For composite keys, each ID is a tuple.
+    """
+    if endpoint_index not in ENDPOINT_INDEXES:
+        raise ValueError(
+            f"endpoint_index must be one of {ENDPOINT_INDEXES}, got {endpoint_index!r}"
         )
-        soft_delete_join = f"""
-            JOIN {nodes_table} n_from ON {from_join_conds}
-                AND n_from.{soft_delete_column} IS NULL
-            JOIN {nodes_table} n_to ON {to_join_conds}
-                AND n_to.{soft_delete_column} IS NULL
-        """
-
-    # Build temporal filter clause if needed
-    temporal_filter = ""
-    temporal_params: list = []
-    if valid_at is not None and temporal_start_col and temporal_end_col:
-        temporal_filter = f"""
-            AND (e.{temporal_start_col} IS NULL OR e.{temporal_start_col} <= %s)
-            AND (e.{temporal_end_col} IS NULL OR e.{temporal_end_col} >= %s)
-        """
-        temporal_params = [valid_at, valid_at]
+    if not frontier_ids:
+        return
+    frontier_ids = _unique_ids(frontier_ids)
+
+    query, params, to_edges = _frontier_edges_query(
+        edges_table, frontier_ids, edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        None, endpoint_index,
+    )
+    for rows in _edge_batches(conn, query, params, itersize):
+        yield from (to_edges(rows) if to_edges else rows)
 
-    # Build sql_filter clause if provided
-    sql_filter_clause = ""
-    if sql_filter:
-        sql_filter_clause = f" AND ({sql_filter})"
 
-    # Build frontier matching clause
-    def build_frontier_match(cols: list[str], alias: str = "e") -> tuple[str, list]:
-        """Build WHERE clause for matching frontier IDs."""
-        if len(cols) == 1:
-            # Simple case: single column
-            return f"{alias}.{cols[0]} = ANY(%s)", [frontier_ids]
-        else:
-            # Composite case: use row value comparison
-            # Convert frontier tuples to proper format for PostgreSQL
+def fetch_edges_array(
+    conn: PgConnection,
+    edges_table: str,
+    frontier_ids: list[int] | np.ndarray,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str = "outbound",
+    nodes_table: str | None = None,
+    node_id_column: str = "id",
+    soft_delete_column: str | None = None,
+    valid_at: datetime | None = None,
+    temporal_start_col: str | None = None,
+    temporal_end_col: str | None = None,
+    sql_filter: str | None = None,
+    endpoint_index: str | None = None,
+) -> np.ndarray:
+    """
+    Fetch edges for a frontier as an (n, 2) int64 array.
+
+    Same arguments and edges as fetch_edges_for_frontier(), for
+    single-column integer keys. Column 0 holds from_id and column 1
+    to_id. Large results are converted one server-cursor batch at a time,
+    so the list of row tuples is never held whole. An array takes
+    16 bytes per edge against roughly 120 for a tuple of two ints, and
+    supports vectorized frontier operations such as np.unique(edges[:, 1]).
+    frontier_ids may itself be an integer array, e.g. the next frontier
+    built that way; it is de-duplicated with np.unique().
+
+    Returns:
+        int64 array of shape (n, 2)
+    """
+    if not (isinstance(edge_from_col, str) and isinstance(edge_to_col, str)):
+        raise ValueError("fetch_edges_array() requires single-column keys")
+    if endpoint_index not in ENDPOINT_INDEXES:
+        raise ValueError(
+            f"endpoint_index must be one of {ENDPOINT_INDEXES}, got {endpoint_index!r}"
+        )
+    if len(frontier_ids) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    if isinstance(frontier_ids, np.ndarray):
+        # Sorted, de-duplicated Python ints: numpy scalars don't adapt
+        frontier_ids = np.unique(frontier_ids).tolist()
+    else:
+        frontier_ids = _unique_ids(frontier_ids)
+
+    query, params, _ = _frontier_edges_query(
+        edges_table, frontier_ids, edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        None, endpoint_index,
+    )
+    if len(frontier_ids) <= SERVER_CURSOR_MIN_FRONTIER:
+        rows = _run_edges_query(
+            conn, query, params, len(frontier_ids), _can_prepare(direction, frontier_ids)
+        )
+        return np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+    # COPY ... (FORMAT BINARY) decoded with np.frombuffer was measured
+    # no faster here (every BOM edge: ~55 ms either way); the server scan
+    # dominates, and COPY cannot take bound parameters or be PREPAREd
+    chunks = [
+        np.array(rows, dtype=np.int64).reshape(-1, 2)
+        for rows in _edge_batches(conn, query, params, EDGE_FETCH_ITERSIZE)
+    ]
+    return np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int64)
+
+
+def _edge_batches(
+    conn: PgConnection, query: str, params: list[Any], itersize: int
+) -> Iterator[list[tuple]]:
+    """Yield raw rows of a frontier edge query `itersize` at a time from a server-side cursor."""
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+
+    # Named cursors need a transaction unless declared WITH HOLD
+    with conn.cursor(name=f"vg_edges_{id(params)}", withhold=conn.autocommit) as cur:
+        cur.itersize = itersize
+        cur.execute(query, params)
+        while rows := cur.fetchmany(itersize):
+            yield rows
+
+
+def fetch_edges_with_stop(
+    conn: PgConnection,
+    edges_table: str,
+    nodes_table: str,
+    frontier_ids: list[NodeId],
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    stop_condition: str,
+    node_id_column: str | list[str] = "id",
+    direction: str = "outbound",
+    soft_delete_column: str | None = None,
+    # Temporal filtering
+    valid_at: datetime | None = None,
+    temporal_start_col: str | None = None,
+    temporal_end_col: str | None = None,
+    # Edge filtering
+    sql_filter: str | None = None,
+    endpoint_index: str | None = None,
+) -> list[tuple[NodeId, NodeId, bool]]:
+    """
+    Fetch frontier edges and check the stop condition in the SAME query.
+
+    Like fetch_edges_for_frontier(), but each edge also carries whether its
+    target node (the end away from the frontier) matches stop_condition,
+    evaluated as an EXISTS subquery against nodes_table. Saves the separate
+    stop-check round trip per traversal level.
+
+    Args:
+        conn: Database connection
+        edges_table: Table containing edges
+        nodes_table: Table containing nodes (stop_condition is evaluated here)
+        frontier_ids: List of node IDs in current frontier (can be tuples for composite keys)
+        edge_from_col: Column(s) for edge source - string or list for composite keys
+        edge_to_col: Column(s) for edge target - string or list for composite keys
+        stop_condition: SQL WHERE clause fragment on nodes_table (e.g., "tier = 3")
+        node_id_column: ID column(s) in nodes_table - string or list for composite keys
+        direction: "outbound", "inbound", or "both"
+        soft_delete_column: See fetch_edges_for_frontier()
+        valid_at: See fetch_edges_for_frontier()
+        temporal_start_col: See fetch_edges_for_frontier()
+        temporal_end_col: See fetch_edges_for_frontier()
+        sql_filter: See fetch_edges_for_frontier()
+        endpoint_index: See fetch_edges_for_frontier()
+
+    Returns:
+        List of (from_id, to_id, target_stops) tuples. For "both", the target
+        is to_id when from_id is in the frontier, otherwise from_id.
+    """
+    return _fetch_frontier_edges(
+        conn, edges_table, frontier_ids, edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        stop_condition=stop_condition, endpoint_index=endpoint_index,
+    )
+
+
+def _fetch_start_edges_with_stop(
+    conn: PgConnection,
+    edges_table: str,
+    nodes_table: str,
+    start_id: NodeId,
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    stop_condition: str,
+    node_id_column: str | list[str] = "id",
+    direction: str = "outbound",
+    soft_delete_column: str | None = None,
+    valid_at: datetime | None = None,
+    temporal_start_col: str | None = None,
+    temporal_end_col: str | None = None,
+    sql_filter: str | None = None,
+    endpoint_index: str | None = None,
+) -> tuple[list[tuple[NodeId, NodeId, bool]], bool | None]:
+    """
+    fetch_edges_with_stop() for the frontier [start_id], also checking
+    start_id itself against stop_condition in the same query.
+
+    Returns (edges, start_stops). start_stops rides on the edge rows, so
+    it is None when start_id has no edges and should_stop() must answer.
+    """
+    rows = _fetch_frontier_edges(
+        conn, edges_table, [start_id], edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        stop_condition=stop_condition, endpoint_index=endpoint_index, frontier_stop=True,
+    )
+    if not rows:
+        return [], None
+    return [row[:3] for row in rows], rows[0][3]
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def make_edge_fetcher(
+    edges_table: str,
+    edge_from_col: str,
+    edge_to_col: str,
+    direction: str = "outbound",
+) -> Callable[[PgConnection, list[NodeId]], list[tuple[NodeId, NodeId]]]:
+    """
+    Build an edge fetcher specialized to one edge table and direction.
+
+    The returned fetch(conn, frontier_ids) behaves like
+    fetch_edges_for_frontier() without filters, but its SQL text is built
+    once here and only the frontier is bound per call. Fetchers are cached,
+    so repeated calls with the same arguments return the same function.
+
+    Args:
+        edges_table: Table containing edges
+        edge_from_col: Column for edge source
+        edge_to_col: Column for edge target
+        direction: "outbound", "inbound", or "both"
+
+    Returns:
+        fetch(conn, frontier_ids) -> list of (from_id, to_id) tuples
+    """
+    query, slots = _edges_query(
+        edges_table, (edge_from_col,), (edge_to_col,), direction, None, ("id",),
+        None, None, None, None, None, None,
+    )
+
+    def fetch(conn: PgConnection, frontier_ids: list[NodeId]) -> list[tuple[NodeId, NodeId]]:
+        if not frontier_ids:
+            return []
+        frontier_ids = _unique_ids(frontier_ids)
+        params = _bind_edge_params(slots, frontier_ids, None)
+        return _run_edges_query(
+            conn, query, params, len(frontier_ids), _can_prepare(direction, frontier_ids)
+        )
+
+    return fetch
+
+
+def _build_edges_query(
+    edges_table: str,
+    from_cols: tuple[str, ...],
+    to_cols: tuple[str, ...],
+    direction: str,
+    nodes_table: str | None,
+    id_cols: tuple[str, ...],
+    soft_delete_column: str | None,
+    temporal_start_col: str | None,
+    temporal_end_col: str | None,
+    sql_filter: str | None,
+    stop_condition: str | None,
+    endpoint_index: str | None,
+    tuple_frontier: bool = False,
+    frontier_stop: bool = False,
+) -> tuple[str, tuple]:
+    """
+    Build the frontier edge query for one schema/filter shape.
+
+    Returns (query, params) where params holds the _FRONTIER_ARRAY,
+    _FRONTIER_LIST, _FrontierColumn and _VALID_AT placeholders. The result
+    depends only on the arguments, so _edges_query caches it. tuple_frontier
+    says composite-key frontiers hold tuples rather than first-column IDs.
+    frontier_stop appends a last column saying whether any frontier node
+    itself matches stop_condition.
+    """
+    _check_identifiers(
+        edges_table, from_cols, to_cols, nodes_table, id_cols,
+        soft_delete_column, temporal_start_col, temporal_end_col,
+    )
+    # Build column select expressions
+    from_cols_select = ", ".join(f"e.{c}" for c in from_cols)
+    to_cols_select = ", ".join(f"e.{c}" for c in to_cols)
+
+    # Build soft-delete join clause if needed
+    soft_delete_join = ""
+    if soft_delete_column and nodes_table:
+        # For composite keys, need to match all columns
+        from_join_conds = " AND ".join(
+            f"e.{fc} = n_from.{ic}" for fc, ic in zip(from_cols, id_cols)
+        )
+        to_join_conds = " AND ".join(
+            f"e.{tc} = n_to.{ic}" for tc, ic in zip(to_cols, id_cols)
+        )
+        soft_delete_join = f"""
+            JOIN {nodes_table} n_from ON {from_join_conds}
+                AND n_from.{soft_delete_column} IS NULL
+            JOIN {nodes_table} n_to ON {to_join_conds}
+                AND n_to.{soft_delete_column} IS NULL
+        """
+
+    # Build temporal filter clause if needed
+    temporal_filter = ""
+    temporal_params: list = []
+    if temporal_start_col and temporal_end_col:
+        temporal_filter = f"""
+            AND (e.{temporal_start_col} IS NULL OR e.{temporal_start_col} <= %s)
+            AND (e.{temporal_end_col} IS NULL OR e.{temporal_end_col} >= %s)
+        """
+        temporal_params = [_VALID_AT, _VALID_AT]
+
+    # Build sql_filter clause if provided. The fragment is part of the
+    # cache key, and the text is PREPAREd once per connection, so a repeated
+    # filter is parsed once; values belong in it pre-composed
+    # (psycopg2.sql ... .as_string(conn)), with any literal % doubled
+    sql_filter_clause = ""
+    if sql_filter:
+        sql_filter_clause = f" AND ({sql_filter})"
+
+    # Build frontier matching clause
+    def build_frontier_match(cols: tuple[str, ...], alias: str = "e") -> tuple[str, list]:
+        """Build WHERE clause for matching frontier IDs."""
+        if len(cols) == 1:
+            # Simple case: single column
+            return f"{alias}.{cols[0]} = ANY(%s)", [_FRONTIER_ARRAY]
+        else:
+            # Composite case: use row value comparison
             col_tuple = f"({', '.join(f'{alias}.{c}' for c in cols)})"
-            # Build VALUES list for composite key matching
-            if frontier_ids and isinstance(frontier_ids[0], tuple):
-                values_list = ", ".join(
-                    f"({', '.join('%s' for _ in cols)})" for _ in frontier_ids
+            if tuple_frontier:
+                # One typed array per key column, zipped back into rows by
+                # unnest(): fixed query text whatever the frontier size
+                unnest_args = ", ".join("%s" for _ in cols)
+                return (
+                    f"{col_tuple} IN (SELECT * FROM unnest({unnest_args}))",
+                    [_FrontierColumn(i) for i in range(len(cols))],
                 )
-                flat_ids = [v for tup in frontier_ids for v in tup]
-                return f"{col_tuple} IN (VALUES {values_list})", flat_ids
             else:
-                # Single value frontier_ids, wrap in tuple
-                values_list = ", ".join(
-                    f"({', '.join('%s' for _ in cols)})" for _ in frontier_ids
+                # Plain (non-tuple) IDs match the first column
+                return f"{alias}.{cols[0]} = ANY(%s)", [_FRONTIER_ARRAY]
+
+    # Stop flag for the target end of each edge: LEFT JOIN the stop nodes as
+    # a derived table, which keeps stop_condition's unqualified columns
+    # scoped to nodes_table and lets the planner hash-join them
+    def stop_parts(target_exprs: list[str]) -> tuple[str, str]:
+        """(select, join) SQL flagging whether the target_exprs end stops."""
+        if not stop_condition:
+            return "", ""
+        id_list = ", ".join(id_cols)
+        match = " AND ".join(f"s.{ic} = {x}" for x, ic in zip(target_exprs, id_cols))
+        return (
+            f", s.{id_cols[0]} IS NOT NULL",
+            f"LEFT JOIN (SELECT {id_list} FROM {nodes_table} "
+            f"WHERE ({stop_condition})) s ON {match}",
+        )
+
+    # Build one SELECT per frontier-matched endpoint:
+    # (where, params, target exprs, params of the target exprs)
+    if direction == "outbound":
+        branches = [(*build_frontier_match(from_cols), [f"e.{c}" for c in to_cols], [])]
+    elif direction == "inbound":
+        branches = [(*build_frontier_match(to_cols), [f"e.{c}" for c in from_cols], [])]
+    elif endpoint_index == "gin_array":
+        # One GIN lookup on ARRAY[from, to] for both endpoints; every edge
+        # comes back once, so the target is whichever end is not in the frontier
+        from_col, to_col = from_cols[0], to_cols[0]
+        branches = [(
+            f"ARRAY[e.{from_col}, e.{to_col}] && %s",
+            [_FRONTIER_ARRAY],
+            [f"CASE WHEN e.{from_col} = ANY(%s) THEN e.{to_col} ELSE e.{from_col} END"],
+            [_FRONTIER_ARRAY],
+        )]
+    else:  # both
+        # UNION ALL of one match per endpoint instead of an OR: on large
+        # frontiers the OR form gets planned as a filtered scan of the whole
+        # table. The second side skips edges the first already returned
+        # (both ends in the frontier), via a hashed anti-join when possible.
+        # An arm with no matches is one empty index probe, the same work an
+        # EXISTS pre-check would do; skipping arms on past hit rates could
+        # drop real edges.
+        from_clause, from_params = build_frontier_match(from_cols)
+        to_clause, to_params = build_frontier_match(to_cols)
+        if len(from_cols) == 1:
+            seen_clause = (
+                f"NOT EXISTS (SELECT 1 FROM unnest(%s) f(id) WHERE f.id = e.{from_cols[0]})"
+            )
+            # unnest() needs a typed array, so this one stays a list
+            seen_params = [_FRONTIER_LIST]
+        else:
+            seen_clause = f"({from_clause}) IS NOT TRUE"
+            seen_params = from_params
+        branches = [
+            (from_clause, from_params, [f"e.{c}" for c in to_cols], []),
+            (
+                f"{to_clause} AND {seen_clause}",
+                to_params + seen_params,
+                [f"e.{c}" for c in from_cols],
+                [],
+            ),
+        ]
+
+    # Uncorrelated, so Postgres evaluates it once per query (an InitPlan)
+    frontier_stop_select = ""
+    frontier_stop_params: list = []
+    if frontier_stop and stop_condition:
+        node_match, frontier_stop_params = build_frontier_match(id_cols, alias="f")
+        frontier_stop_select = (
+            f", EXISTS (SELECT 1 FROM {nodes_table} f "
+            f"WHERE {node_match} AND ({stop_condition}))"
+        )
+
+    selects = []
+    params: list = []
+    for frontier_clause, frontier_params, target_exprs, target_params in branches:
+        stop_select, stop_join = stop_parts(target_exprs)
+        params += frontier_stop_params
+        if stop_join:
+            params += target_params
+        selects.append(f"""
+            SELECT {from_cols_select}, {to_cols_select}{stop_select}{frontier_stop_select}
+            FROM {edges_table} e
+            {soft_delete_join}
+            {stop_join}
+            WHERE {frontier_clause}
+            {temporal_filter}
+            {sql_filter_clause}
+        """)
+        params += frontier_params + temporal_params
+    return "UNION ALL".join(selects), tuple(params)
+
+
+_edges_query = functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)(_build_edges_query)
+
+
+def _bind_edge_params(
+    slots: tuple, frontier_ids: list[NodeId], valid_at: datetime | None
+) -> list[Any]:
+    """Substitute per-call values for the placeholders in edge-query params."""
+    frontier_array = _id_array_param(frontier_ids)
+    columns: list[list[Any]] = []
+    if any(isinstance(p, _FrontierColumn) for p in slots):
+        columns = [list(col) for col in zip(*frontier_ids)]
+    return [
+        frontier_array if p is _FRONTIER_ARRAY
+        else frontier_ids if p is _FRONTIER_LIST
+        else valid_at if p is _VALID_AT
+        else columns[p.index] if isinstance(p, _FrontierColumn)
+        else p
+        for p in slots
+    ]
+
+
+def _fetch_frontier_edges(
+    conn: PgConnection,
+    edges_table: str,
+    frontier_ids: list[NodeId],
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    direction: str,
+    nodes_table: str | None,
+    node_id_column: str | list[str],
+    soft_delete_column: str | None,
+    valid_at: datetime | None,
+    temporal_start_col: str | None,
+    temporal_end_col: str | None,
+    sql_filter: str | None,
+    stop_condition: str | None = None,
+    shard: bool = False,
+    endpoint_index: str | None = None,
+    frontier_stop: bool = False,
+) -> list[tuple]:
+    """Shared implementation of fetch_edges_for_frontier/fetch_edges_with_stop."""
+    if endpoint_index not in ENDPOINT_INDEXES:
+        raise ValueError(
+            f"endpoint_index must be one of {ENDPOINT_INDEXES}, got {endpoint_index!r}"
+        )
+    if not frontier_ids:
+        return []
+    frontier_ids = _unique_ids(frontier_ids)
+
+    # Opted-in, very large single-direction frontiers: one query per shard,
+    # each on its own backend. "both" stays whole since its de-dup needs
+    # every frontier id.
+    if (
+        shard
+        and direction != "both"
+        and len(frontier_ids) > PARALLEL_FETCH_MIN_FRONTIER
+        and _can_shard(conn)
+    ):
+        connect_params = _connect_params(conn)
+
+        def fetch_shard(shard_ids: list[NodeId]) -> list[tuple]:
+            with pooled_connection(**connect_params) as shard_conn:
+                return _fetch_frontier_edges(
+                    shard_conn, edges_table, shard_ids, edge_from_col, edge_to_col,
+                    direction, nodes_table, node_id_column, soft_delete_column,
+                    valid_at, temporal_start_col, temporal_end_col, sql_filter,
+                    stop_condition=stop_condition, shard=False,
+                    endpoint_index=endpoint_index,
                 )
-                # Each frontier_id becomes a single-element tuple
-                flat_ids = [fid for fid in frontier_ids]
-                return f"{alias}.{cols[0]} = ANY(%s)", [frontier_ids]
 
-    with conn.cursor() as cur:
-        # Set statement timeout for safety
-        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
+        shards = [frontier_ids[i::PARALLEL_FETCH_SHARDS] for i in range(PARALLEL_FETCH_SHARDS)]
+        with ThreadPoolExecutor(max_workers=PARALLEL_FETCH_SHARDS) as pool:
+            return list(itertools.chain.from_iterable(pool.map(fetch_shard, shards)))
 
-        # Build and execute query based on direction
-        if direction == "outbound":
-            frontier_clause, frontier_params = build_frontier_match(from_cols)
-            query = f"""
-                SELECT {from_cols_select}, {to_cols_select}
-                FROM {edges_table} e
-                {soft_delete_join}
-                WHERE {frontier_clause}
-                {temporal_filter}
-                {sql_filter_clause}
-            """
-            cur.execute(query, frontier_params + temporal_params)
-        elif direction == "inbound":
-            frontier_clause, frontier_params = build_frontier_match(to_cols)
-            query = f"""
-                SELECT {from_cols_select}, {to_cols_select}
-                FROM {edges_table} e
-                {soft_delete_join}
-                WHERE {frontier_clause}
-                {temporal_filter}
-                {sql_filter_clause}
-            """
-            cur.execute(query, frontier_params + temporal_params)
-        else:  # both
-            from_clause, from_params = build_frontier_match(from_cols)
-            to_clause, to_params = build_frontier_match(to_cols)
-            query = f"""
-                SELECT {from_cols_select}, {to_cols_select}
-                FROM {edges_table} e
-                {soft_delete_join}
-                WHERE ({from_clause} OR {to_clause})
-                {temporal_filter}
-                {sql_filter_clause}
-            """
-            cur.execute(query, from_params + to_params + temporal_params)
+    query, params, to_edges = _frontier_edges_query(
+        edges_table, frontier_ids, edge_from_col, edge_to_col, direction,
+        nodes_table, node_id_column, soft_delete_column,
+        valid_at, temporal_start_col, temporal_end_col, sql_filter,
+        stop_condition, endpoint_index, frontier_stop,
+    )
+
+    # Per-level queries repeat the same shape: reuse a prepared plan
+    return _run_edges_query(
+        conn, query, params, len(frontier_ids),
+        prepare=_can_prepare(direction, frontier_ids),
+        to_edges=to_edges,
+    )
+
+
+def _can_prepare(direction: str, frontier_ids: list[NodeId]) -> bool:
+    """Whether an edge query can run prepared for this frontier."""
+    # unnest(%s) needs a typed array, which PREPARE can only declare for
+    # int IDs (bigint[], see _execute_prepared). Tuple frontiers unnest
+    # every key column; single-column "both" unnests the frontier.
+    if isinstance(frontier_ids[0], tuple):
+        return all(type(v) is int for fid in frontier_ids for v in fid)
+    return direction != "both" or all(type(i) is int for i in frontier_ids)
 
-        rows = cur.fetchall()
 
-    # Convert results to proper format
-    results: list[tuple[NodeId, NodeId]] = []
+def _frontier_edges_query(
+    edges_table: str,
+    frontier_ids: list[NodeId],
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    direction: str,
+    nodes_table: str | None,
+    node_id_column: str | list[str],
+    soft_delete_column: str | None,
+    valid_at: datetime | None,
+    temporal_start_col: str | None,
+    temporal_end_col: str | None,
+    sql_filter: str | None,
+    stop_condition: str | None,
+    endpoint_index: str | None,
+    frontier_stop: bool = False,
+) -> tuple[str, list[Any], Callable[[list[tuple]], list[tuple]] | None]:
+    """Build a frontier edge query, its params and (composite keys only) a row converter."""
+    # Normalize columns to tuples for composite key support
+    from_cols = (edge_from_col,) if isinstance(edge_from_col, str) else tuple(edge_from_col)
+    to_cols = (edge_to_col,) if isinstance(edge_to_col, str) else tuple(edge_to_col)
+    id_cols = (node_id_column,) if isinstance(node_id_column, str) else tuple(node_id_column)
+
+    # Check if using composite keys
+    is_composite = len(from_cols) > 1 or len(to_cols) > 1
+    if is_composite and endpoint_index == "gin_array":
+        raise ValueError("endpoint_index='gin_array' requires single-column keys")
+
+    temporal = valid_at is not None and bool(temporal_start_col and temporal_end_col)
+    shape = (
+        edges_table, from_cols, to_cols, direction, nodes_table, id_cols,
+        soft_delete_column,
+        temporal_start_col if temporal else None,
+        temporal_end_col if temporal else None,
+        sql_filter, stop_condition, endpoint_index,
+    )
+    tuple_frontier = is_composite and isinstance(frontier_ids[0], tuple)
+    query, slots = _edges_query(*shape, tuple_frontier, frontier_stop)
+    params = _bind_edge_params(slots, frontier_ids, valid_at)
+
     n_from = len(from_cols)
     n_to = len(to_cols)
 
-    for row in rows:
-        if is_composite:
-            # Extract tuples for composite keys
-            from_id = tuple(row[:n_from]) if n_from > 1 else row[0]
-            to_id = tuple(row[n_from:n_from + n_to]) if n_to > 1 else row[n_from]
-        else:
-            from_id = row[0]
-            to_id = row[1]
-        results.append((from_id, to_id))
+    def to_edges(rows: list[tuple]) -> list[tuple]:
+        """Extract (from_id, to_id[, target_stops]) tuples for composite keys."""
+        # Any stop flag stays last
+        return [
+            (
+                tuple(row[:n_from]) if n_from > 1 else row[0],
+                tuple(row[n_from:n_from + n_to]) if n_to > 1 else row[n_from],
+            )
+            + row[n_from + n_to:]
+            for row in rows
+        ]
+
+    return query, params, to_edges if is_composite else None
+
+
+def _run_edges_query(
+    conn: PgConnection,
+    query: str,
+    params: list[Any],
+    frontier_size: int,
+    prepare: bool,
+    to_edges: Callable[[list[tuple]], list[tuple]] | None = None,
+) -> list[tuple]:
+    """Execute a frontier edge query, converting rows with to_edges if given."""
+    with conn.cursor() as cur:
+        # Set statement timeout for safety
+        _ensure_statement_timeout(conn, cur)
+
+        if frontier_size <= SERVER_CURSOR_MIN_FRONTIER:
+            if prepare:
+                _execute_prepared(conn, cur, query, params)
+            else:
+                cur.execute(query, params)
+            rows = cur.fetchall()
+            return to_edges(rows) if to_edges else rows
+
+    # Large frontiers may hit hubs: stream through a server-side cursor so
+    # the raw rows are never all buffered next to the converted results.
+    # Named cursors need a transaction unless declared WITH HOLD.
+    results: list[tuple] = []
+    with conn.cursor(name=f"vg_edges_{id(params)}", withhold=conn.autocommit) as cur:
+        cur.itersize = EDGE_FETCH_ITERSIZE
+        cur.execute(query, params)
+        while rows := cur.fetchmany(EDGE_FETCH_ITERSIZE):
+            results.extend(to_edges(rows) if to_edges else rows)
 
     return results
 
 
+def _can_shard(conn: PgConnection) -> bool:
+    """
+    Whether edge queries may run on other connections than conn.
+
+    Shards read committed data through their own backends. That matches
+    what conn would see only when it has no open transaction (so no
+    uncommitted writes or transaction-scoped state) and runs at the
+    default READ COMMITTED isolation.
+    """
+    if conn.status != psycopg2.extensions.STATUS_READY:
+        return False
+    if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        return False
+    return conn.isolation_level in (
+        None,
+        psycopg2.extensions.ISOLATION_LEVEL_READ_COMMITTED,
+        psycopg2.extensions.ISOLATION_LEVEL_READ_UNCOMMITTED,
+    )
+
+
+def _connect_params(conn: PgConnection) -> dict[str, Any]:
+    """pooled_connection() arguments reaching the same database as conn."""
+    info = conn.info
+    return {
+        "host": info.host,
+        "port": info.port,
+        "database": info.dbname,
+        "user": info.user,
+        "password": info.password,
+    }
+
+
 def fetch_nodes(
     conn: PgConnection,
     nodes_table: str,
@@ -459,14 +1708,298 @@ def fetch_nodes(
                   Use "column_name DESC" for descending order.
 
     Returns:
-        List of node dicts with requested columns, ordered if order_by specified
+        List of node dicts with requested columns, ordered if order_by specified.
+        At most MAX_RESULTS rows are returned; a warning is issued when more
+        rows matched.
     """
     if not node_ids:
         return []
 
-    # Limit results
-    if len(node_ids) > MAX_RESULTS:
-        node_ids = node_ids[:MAX_RESULTS]
+    col_names, rows = _fetch_node_rows(
+        conn, nodes_table, node_ids, columns, id_column, soft_delete_column, order_by,
+        "fetch_nodes",
+    )
+    # Plain tuples + dict(zip()) beat RealDictCursor, whose rows are
+    # filled one __setitem__ at a time in Python (~2.7x slower on all of
+    # parts). NamedTupleCursor is no faster and would change the row type.
+    return [dict(zip(col_names, row)) for row in rows]
+
+
+def fetch_nodes_columnar(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    columns: list[str] | None = None,
+    id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+    order_by: str | None = None,
+) -> dict[str, list[Any]]:
+    """
+    Fetch node data for a list of node IDs, one list per column.
+
+    Same arguments, rows and MAX_RESULTS cap as fetch_nodes(), but the
+    result is transposed to {column: [values...]} instead of one dict per
+    row. Use when the caller reads a few columns across many nodes: the
+    transpose runs in C (zip(*rows)) and no per-row dict is built.
+
+    Returns:
+        Dict mapping each column name to its values, in row order
+        (empty if node_ids is empty)
+    """
+    if not node_ids:
+        return {}
+
+    col_names, rows = _fetch_node_rows(
+        conn, nodes_table, node_ids, columns, id_column, soft_delete_column, order_by,
+        "fetch_nodes_columnar",
+    )
+    if not rows:
+        return {name: [] for name in col_names}
+    return {name: list(values) for name, values in zip(col_names, zip(*rows))}
+
+
+def _fetch_node_rows(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    columns: list[str] | None,
+    id_column: str | list[str],
+    soft_delete_column: str | None,
+    order_by: str | None,
+    caller: str,
+) -> tuple[list[str], list[tuple]]:
+    """Run the capped node SELECT; returns (column names, row tuples)."""
+    # One row past the cap tells us whether the result was truncated
+    query, params = _build_nodes_query(
+        nodes_table, node_ids, columns, id_column, soft_delete_column, order_by,
+        limit=MAX_RESULTS + 1,
+    )
+
+    with conn.cursor() as cur:
+        # NUMERIC decodes straight to float, so no per-row Decimal pass
+        _register_numeric_as_float(cur)
+        _ensure_statement_timeout(conn, cur)
+        _execute_if_preparable(conn, cur, query, params)
+        # Column.name, not desc[0]: psycopg2's tuple emulation is ~6x slower
+        col_names = [desc.name for desc in cur.description]
+        # COPY ... (FORMAT BINARY) moves no fewer bytes, and decoding it with
+        # a struct loop in Python is ~2x slower than psycopg2's C text parsers.
+        rows = cur.fetchall()
+
+    # Warn from the public function's caller, one frame further out
+    _truncate_rows(rows, caller, nodes_table, stacklevel=4)
+    return col_names, rows
+
+
+def fetch_nodes_ordered(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    columns: list[str] | None = None,
+    id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Fetch node data in the order of node_ids.
+
+    Joins the table against unnest(node_ids) WITH ORDINALITY and sorts on
+    the ordinal server-side, so callers reconstructing a path get rows
+    back in path order without a lookup dict. IDs with no (live) row are
+    skipped. Composite keys fall back to fetch_nodes() and are reordered
+    in Python (the ID columns must be among `columns`).
+
+    Args:
+        conn: Database connection
+        nodes_table: Table containing nodes
+        node_ids: Node IDs in the desired order (tuples for composite keys)
+        columns: Columns to return (None = all)
+        id_column: Name(s) of the ID column(s) - string or list for composite keys
+        soft_delete_column: Column to check for soft-delete (e.g., "deleted_at")
+
+    Returns:
+        List of node dicts, ordered as node_ids
+    """
+    if not node_ids:
+        return []
+
+    if not isinstance(id_column, str):
+        rows = fetch_nodes(conn, nodes_table, node_ids, columns, id_column, soft_delete_column)
+        by_id = {tuple(row[col] for col in id_column): row for row in rows}
+        return [by_id[nid] for nid in _unique_ids(node_ids) if nid in by_id]
+
+    query = _ordered_nodes_query(
+        nodes_table, tuple(columns) if columns else None, id_column, soft_delete_column
+    )
+
+    with conn.cursor() as cur:
+        _register_numeric_as_float(cur)
+        _ensure_statement_timeout(conn, cur)
+        # A Python list binds as a typed ARRAY[...], which unnest() needs
+        _execute_if_preparable(conn, cur, query, [_unique_ids(node_ids)])
+        col_names = [desc.name for desc in cur.description]
+        rows = cur.fetchall()
+
+    _truncate_rows(rows, "fetch_nodes_ordered", nodes_table)
+    return [dict(zip(col_names, row)) for row in rows]
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _ordered_nodes_query(
+    nodes_table: str,
+    columns: tuple[str, ...] | None,
+    id_column: str,
+    soft_delete_column: str | None,
+) -> str:
+    """SELECT for fetch_nodes_ordered(); the ID array is its only parameter."""
+    _check_identifiers(nodes_table, id_column, columns, soft_delete_column)
+    col_spec = ", ".join(f"n.{col}" for col in columns) if columns else "n.*"
+    query = f"""
+        SELECT {col_spec}
+        FROM unnest(%s) WITH ORDINALITY AS k(id, ord)
+        JOIN {nodes_table} n ON n.{id_column} = k.id
+    """
+    if soft_delete_column:
+        query += f" WHERE n.{soft_delete_column} IS NULL"
+    return query + f" ORDER BY k.ord LIMIT {MAX_RESULTS + 1}"
+
+
+def _truncate_rows(
+    rows: list[tuple], caller: str, nodes_table: str, stacklevel: int = 3
+) -> None:
+    """Cut rows fetched with LIMIT MAX_RESULTS + 1 back to MAX_RESULTS, warning if needed."""
+    if len(rows) > MAX_RESULTS:
+        warnings.warn(
+            f"{caller}() matched more than MAX_RESULTS={MAX_RESULTS} rows "
+            f"in {nodes_table}; returning the first {MAX_RESULTS}",
+            stacklevel=stacklevel,
+        )
+        del rows[MAX_RESULTS:]
+
+
+def _execute_if_preparable(conn: PgConnection, cur: Any, query: str, params: list[Any]) -> None:
+    """Run query prepared unless an array parameter has a type PREPARE cannot declare."""
+    # Lists bind to unnest(%s); _execute_prepared only declares bigint[]
+    if all(type(p) is not list or all(type(v) is int for v in p) for p in params):
+        _execute_prepared(conn, cur, query, params)
+    else:
+        cur.execute(query, params)
+
+
+def fetch_nodes_sample(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    k: int,
+    columns: list[str] | None = None,
+    id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Fetch a uniform random sample of k nodes from a list of node IDs.
+
+    Unlike fetch_nodes(), whose MAX_RESULTS cap keeps an arbitrary prefix,
+    every matching row is equally likely to be picked. The sample is drawn
+    server-side (ORDER BY random() LIMIT k, a bounded top-k sort), so only
+    k rows cross the wire.
+
+    Args:
+        conn: Database connection
+        nodes_table: Table containing nodes
+        node_ids: Candidate node IDs (can be tuples for composite keys)
+        k: Sample size; all matching nodes are returned if there are fewer
+        columns: Columns to return (None = all)
+        id_column: Name(s) of the ID column(s) - string or list for composite keys
+        soft_delete_column: Column to check for soft-delete (e.g., "deleted_at")
+
+    Returns:
+        List of up to k node dicts, in random order
+    """
+    if not node_ids or k <= 0:
+        return []
+
+    query, params = _build_nodes_query(
+        nodes_table, node_ids, columns, id_column, soft_delete_column, "random()",
+        limit=min(k, MAX_RESULTS),
+    )
+
+    with conn.cursor() as cur:
+        _register_numeric_as_float(cur)
+        _ensure_statement_timeout(conn, cur)
+        _execute_if_preparable(conn, cur, query, params)
+        col_names = [desc.name for desc in cur.description]
+        return [dict(zip(col_names, row)) for row in cur.fetchall()]
+
+
+def fetch_nodes_iter(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    columns: list[str] | None = None,
+    id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+    order_by: str | None = None,
+    itersize: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream node data for a list of node IDs.
+
+    Same arguments and rows as fetch_nodes(), but rows are pulled from a
+    server-side cursor `itersize` at a time instead of materialized at
+    once. Use when the caller only iterates over the nodes. Like
+    fetch_nodes(), stops after MAX_RESULTS rows with a warning.
+
+    Yields:
+        Node dicts with requested columns, ordered if order_by specified
+    """
+    if not node_ids:
+        return
+
+    # One row past the cap tells us whether the result was truncated
+    query, params = _build_nodes_query(
+        nodes_table, node_ids, columns, id_column, soft_delete_column, order_by,
+        limit=MAX_RESULTS + 1,
+    )
+
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+
+    # Named cursors need a transaction unless declared WITH HOLD
+    with conn.cursor(name=f"vg_nodes_{id(node_ids)}", withhold=conn.autocommit) as cur:
+        _register_numeric_as_float(cur)
+        cur.itersize = itersize
+        cur.execute(query, params)
+        col_names: list[str] | None = None
+        for n, row in enumerate(cur):
+            if n == MAX_RESULTS:
+                warnings.warn(
+                    f"fetch_nodes_iter() matched more than MAX_RESULTS={MAX_RESULTS} rows "
+                    f"in {nodes_table}; returning the first {MAX_RESULTS}",
+                    stacklevel=2,
+                )
+                return
+            # Named cursors only have a description after the first fetch
+            if col_names is None:
+                col_names = [desc.name for desc in cur.description]
+            yield dict(zip(col_names, row))
+
+
+def _build_nodes_query(
+    nodes_table: str,
+    node_ids: list[NodeId],
+    columns: list[str] | None,
+    id_column: str | list[str],
+    soft_delete_column: str | None,
+    order_by: str | None,
+    limit: int | None = None,
+) -> tuple[str, list[Any]]:
+    """Build the SELECT for fetch_nodes(); returns (query, params)."""
+    node_ids = _unique_ids(node_ids)
+    if columns is None and order_by is None and isinstance(id_column, str):
+        # Common shape: identifiers are checked once, when the text is cached
+        query = _simple_nodes_query(nodes_table, id_column, soft_delete_column, limit)
+        return query, [_id_array_param(node_ids)]
+
+    _check_identifiers(nodes_table, id_column, columns, soft_delete_column)
 
     # Normalize id_column to list
     id_cols = [id_column] if isinstance(id_column, str) else list(id_column)
@@ -475,25 +2008,57 @@ def fetch_nodes(
     col_spec = ", ".join(columns) if columns else "*"
 
     # Build WHERE clause for composite or simple keys
-    if is_composite:
-        # Composite key: use row value comparison
-        col_tuple = f"({', '.join(id_cols)})"
-        if node_ids and isinstance(node_ids[0], tuple):
-            values_list = ", ".join(
-                f"({', '.join('%s' for _ in id_cols)})" for _ in node_ids
-            )
-            flat_ids = [v for tup in node_ids for v in tup]
-            where_clause = f"{col_tuple} IN (VALUES {values_list})"
-            params = flat_ids
-        else:
-            # Single values, wrap each in tuple
-            values_list = ", ".join(f"(%s)" for _ in node_ids)
-            where_clause = f"{id_cols[0]} IN (VALUES {values_list})"
-            params = node_ids
+    if is_composite and isinstance(node_ids[0], tuple):
+        where_clause, params = _key_columns_match(id_cols, node_ids)
     else:
-        where_clause = f"{id_cols[0]} = ANY(%s)"
-        params = [node_ids]
+        # Single-column keys, or plain IDs matching a composite key's first column
+        where_clause, params = f"{id_cols[0]} = ANY(%s)", [_id_array_param(node_ids)]
+
+    query = _nodes_query(
+        nodes_table, col_spec, where_clause, soft_delete_column, order_by, limit
+    )
+    return query, params
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _simple_nodes_query(
+    nodes_table: str, id_column: str, soft_delete_column: str | None, limit: int | None
+) -> str:
+    """SELECT * by a single ID column; the unordered fetch_nodes() shape."""
+    _check_identifiers(nodes_table, id_column, soft_delete_column)
+    return _nodes_query(
+        nodes_table, "*", f"{id_column} = ANY(%s)", soft_delete_column, None, limit
+    )
 
+
+def _key_columns_match(
+    id_cols: Sequence[str], node_ids: list[tuple]
+) -> tuple[str, list[list[Any]]]:
+    """
+    Row-value match of id_cols against tuple IDs; returns (clause, params).
+
+    Each key column is bound as one Python list (a typed ARRAY[...]) and
+    unnest() zips them back into rows, so the clause text does not grow
+    with the number of IDs.
+    """
+    col_tuple = f"({', '.join(id_cols)})"
+    unnest_args = ", ".join("%s" for _ in id_cols)
+    return (
+        f"{col_tuple} IN (SELECT * FROM unnest({unnest_args}))",
+        [list(col) for col in zip(*node_ids)],
+    )
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _nodes_query(
+    nodes_table: str,
+    col_spec: str,
+    where_clause: str,
+    soft_delete_column: str | None,
+    order_by: str | None,
+    limit: int | None = None,
+) -> str:
+    """Node SELECT text; cached for the fixed-shape ANY() lookups."""
     query = f"""
         SELECT {col_spec}
         FROM {nodes_table}
@@ -503,26 +2068,9 @@ def fetch_nodes(
         query += f" AND {soft_delete_column} IS NULL"
     if order_by:
         query += f" ORDER BY {order_by}"
-
-    with conn.cursor() as cur:
-        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
-        if is_composite:
-            cur.execute(query, params)
-        else:
-            cur.execute(query, tuple(params))
-        col_names = [desc[0] for desc in cur.description]
-        rows = cur.fetchall()
-
-    nodes = []
-    for row in rows:
-        node = dict(zip(col_names, row))
-        # Convert Decimal to float for numeric fields (prevents TypeError in calculations)
-        for key, value in node.items():
-            if isinstance(value, Decimal):
-                node[key] = float(value)
-        nodes.append(node)
-
-    return nodes
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query
 
 
 def should_stop(
@@ -531,11 +2079,13 @@ def should_stop(
     node_id: NodeId,
     stop_condition: str,
     id_column: str | list[str] = "id",
+    use_cache: bool = False,
 ) -> bool:
     """
     Check if a node matches the stop condition.
 
     Supports composite keys by accepting lists of column names and tuple IDs.
+    To check many nodes at once, use should_stop_many() instead.
 
     Args:
         conn: Database connection
@@ -543,12 +2093,147 @@ def should_stop(
         node_id: Node ID to check (can be tuple for composite keys)
         stop_condition: SQL WHERE clause fragment (e.g., "tier = 3")
         id_column: Name(s) of the ID column(s) - string or list for composite keys
+        use_cache: Remember the answer per connection, so repeated checks of
+                   the same node skip the round trip. Call clear_stop_cache()
+                   when the underlying rows may have changed.
 
     Returns:
         True if node matches stop condition
     """
     # Normalize id_column to list
     id_cols = [id_column] if isinstance(id_column, str) else list(id_column)
+
+    if not use_cache:
+        return _should_stop_uncached(conn, nodes_table, node_id, stop_condition, id_cols)
+
+    key = (nodes_table, node_id, stop_condition, tuple(id_cols))
+    with _stop_cache_lock:
+        hit = _cached_stop_answer(_stop_cache.setdefault(conn, {}), key)
+    if hit is not None:
+        return hit
+
+    matches = _should_stop_uncached(conn, nodes_table, node_id, stop_condition, id_cols)
+    _cache_stop_answers(conn, {key: matches})
+    return matches
+
+
+def _cached_stop_answer(cache: dict[tuple, bool], key: tuple) -> bool | None:
+    """Look up a stop answer and mark it most recently used; caller holds the lock."""
+    hit = cache.pop(key, None)
+    if hit is not None:
+        # Re-insert at the end: hubs reached along many paths stay cached
+        cache[key] = hit
+    return hit
+
+
+def _cache_stop_answers(conn: PgConnection, answers: dict[tuple, bool]) -> None:
+    """Store stop-condition answers for conn, evicting the least recently used first."""
+    with _stop_cache_lock:
+        cache = _stop_cache.setdefault(conn, {})
+        for key, matches in answers.items():
+            if len(cache) >= STOP_CACHE_MAXSIZE:
+                # Dicts keep insertion order and hits are re-inserted, so
+                # the first entry is the least recently used
+                del cache[next(iter(cache))]
+            cache[key] = matches
+
+
+def should_stop_many(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    stop_condition: str,
+    id_column: str | list[str] = "id",
+    use_cache: bool = False,
+) -> set[NodeId]:
+    """
+    Find which of node_ids match the stop condition in a SINGLE query.
+
+    Batched counterpart of should_stop() for checking a whole frontier;
+    callers test membership in the returned set instead of issuing one
+    query per node.
+
+    Args:
+        conn: Database connection
+        nodes_table: Table containing nodes
+        node_ids: Node IDs to check (tuples for composite keys)
+        stop_condition: SQL WHERE clause fragment (e.g., "tier = 3")
+        id_column: Name(s) of the ID column(s) - string or list for composite keys
+        use_cache: Share should_stop()'s per-connection answers: only IDs
+                   not seen before are queried, and their answers are kept.
+
+    Returns:
+        Set of the node IDs that match the stop condition
+    """
+    if not node_ids:
+        return set()
+    node_ids = _unique_ids(node_ids)
+
+    # Normalize id_column to list
+    id_cols = [id_column] if isinstance(id_column, str) else list(id_column)
+    _check_identifiers(nodes_table, id_cols)
+    if not use_cache:
+        return _should_stop_many_uncached(conn, nodes_table, node_ids, stop_condition, id_cols)
+
+    keys = {nid: (nodes_table, nid, stop_condition, tuple(id_cols)) for nid in node_ids}
+    with _stop_cache_lock:
+        cache = _stop_cache.setdefault(conn, {})
+        known = {nid: _cached_stop_answer(cache, key) for nid, key in keys.items()}
+    matching = {nid for nid, hit in known.items() if hit}
+    unknown = [nid for nid, hit in known.items() if hit is None]
+    if unknown:
+        found = _should_stop_many_uncached(conn, nodes_table, unknown, stop_condition, id_cols)
+        _cache_stop_answers(conn, {keys[nid]: nid in found for nid in unknown})
+        matching |= found
+    return matching
+
+
+def _should_stop_many_uncached(
+    conn: PgConnection,
+    nodes_table: str,
+    node_ids: list[NodeId],
+    stop_condition: str,
+    id_cols: list[str],
+) -> set[NodeId]:
+    """Run the batched stop-condition query for node_ids."""
+    is_composite = len(id_cols) > 1
+
+    if is_composite:
+        where_clause, params = _key_columns_match(id_cols, node_ids)
+    else:
+        where_clause, params = f"{id_cols[0]} = ANY(%s)", [_id_array_param(node_ids)]
+    query = _stop_query(nodes_table, tuple(id_cols), where_clause, stop_condition)
+
+    with conn.cursor() as cur:
+        _execute_if_preparable(conn, cur, query, params)
+        if is_composite:
+            return {tuple(row) for row in cur.fetchall()}
+        return {row[0] for row in cur.fetchall()}
+
+
+def clear_stop_cache(conn: PgConnection | None = None) -> None:
+    """
+    Drop cached should_stop() answers.
+
+    Args:
+        conn: Only clear entries for this connection (None = all connections)
+    """
+    with _stop_cache_lock:
+        if conn is None:
+            _stop_cache.clear()
+        else:
+            _stop_cache.pop(conn, None)
+
+
+def _should_stop_uncached(
+    conn: PgConnection,
+    nodes_table: str,
+    node_id: NodeId,
+    stop_condition: str,
+    id_cols: list[str],
+) -> bool:
+    """Run the stop-condition query for a single node."""
+    _check_identifiers(nodes_table, id_cols)
     is_composite = len(id_cols) > 1
 
     if is_composite:
@@ -559,16 +2244,24 @@ def should_stop(
         conditions = f"{id_cols[0]} = %s"
         params = (node_id,)
 
-    query = f"""
-        SELECT 1 FROM {nodes_table}
-        WHERE {conditions} AND ({stop_condition})
-    """
+    query = _stop_query(nodes_table, ("1",), conditions, stop_condition)
 
     with conn.cursor() as cur:
-        cur.execute(query, params)
+        _execute_prepared(conn, cur, query, list(params))
         return cur.fetchone() is not None
 
 
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _stop_query(
+    nodes_table: str, select_cols: tuple[str, ...], where_clause: str, stop_condition: str
+) -> str:
+    """Stop-condition SELECT text for should_stop()/should_stop_many()."""
+    return f"""
+        SELECT {', '.join(select_cols)} FROM {nodes_table}
+        WHERE {where_clause} AND ({stop_condition})
+    """
+
+
 def get_connection(
     host: str = "localhost",
     port: int = 5432,
@@ -589,10 +2282,172 @@ def get_connection(
     Returns:
         PostgreSQL connection
     """
-    return psycopg2.connect(
+    conn = psycopg2.connect(
         host=host,
         port=port,
         database=database,
         user=user,
         password=password,
+        options=_STATEMENT_TIMEOUT_OPTION,
+    )
+    with _timeout_lock:
+        _timeout_conns.add(conn)
+    return conn
+
+
+def configure_connection(conn: PgConnection) -> None:
+    """
+    Apply the session settings handlers rely on to a caller-made connection.
+
+    Sets the QUERY_TIMEOUT_SEC statement timeout once for the session, so
+    handlers skip the per-call SET LOCAL. Connections from get_connection()
+    or pooled_connection() already have it. If conn is inside a transaction
+    the setting only lasts until that ends, and handlers keep re-applying it.
+
+    Args:
+        conn: Database connection
+    """
+    # Only a SET outside any open transaction can be made durable: a
+    # rollback of the caller's transaction would otherwise undo it
+    idle = conn.autocommit or (
+        conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
     )
+    with conn.cursor() as cur:
+        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
+    if idle:
+        if not conn.autocommit:
+            conn.commit()
+        with _timeout_lock:
+            _timeout_conns.add(conn)
+
+
+def _ensure_statement_timeout(conn: PgConnection, cur: Any) -> None:
+    """Apply the statement timeout for this handler call unless conn's session has it."""
+    with _timeout_lock:
+        if conn in _timeout_conns:
+            return
+    if conn.autocommit:
+        # No transaction to scope a SET LOCAL to; settle for the session
+        configure_connection(conn)
+        return
+    # Ends with the caller's transaction instead of leaking into whatever
+    # the session (or the next borrower of a caller-managed pool) runs later
+    cur.execute(f"SET LOCAL statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
+
+
+# Shared connection pools, keyed by connect parameters
+POOL_MIN_CONN = 1
+POOL_MAX_CONN = 16
+# Server ends pooled sessions left idle inside a transaction this long, so a
+# caller that stalls mid-transaction cannot pin locks or a pool slot
+POOL_IDLE_IN_TRANSACTION_TIMEOUT_SEC = 60
+_pools: dict[tuple, psycopg2.pool.ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(
+    key: tuple, minconn: int = POOL_MIN_CONN, maxconn: int = POOL_MAX_CONN
+) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the shared pool for these connect parameters, creating it lazily."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            host, port, database, user, password = key
+            pool = psycopg2.pool.ThreadedConnectionPool(
+                minconn,
+                maxconn,
+                host=host,
+                port=port,
+                database=database,
+                user=user,
+                password=password,
+                options=(
+                    f"{_STATEMENT_TIMEOUT_OPTION} -c idle_in_transaction_session_timeout="
+                    f"{POOL_IDLE_IN_TRANSACTION_TIMEOUT_SEC * 1000}"
+                ),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def init_connection_pool(
+    minconn: int = POOL_MIN_CONN,
+    maxconn: int = POOL_MAX_CONN,
+    host: str = "localhost",
+    port: int = 5432,
+    database: str = "supply_chain",
+    user: str = "virt_graph",
+    password: str = "dev_password",
+) -> None:
+    """
+    Open the shared pool for these connect parameters ahead of first use.
+
+    minconn connections are established immediately, so the first
+    pooled_connection() calls (and the sharded edge fetch) skip the
+    handshake; at most maxconn are kept. An already open pool for the same
+    parameters is left as is.
+
+    Args:
+        minconn: Connections to open now and keep open
+        maxconn: Maximum connections the pool hands out at once
+        host: Database host
+        port: Database port
+        database: Database name
+        user: Database user
+        password: Database password
+    """
+    if not 0 <= minconn <= maxconn:
+        raise ValueError(f"need 0 <= minconn <= maxconn, got {minconn} and {maxconn}")
+    _get_pool((host, port, database, user, password), minconn, maxconn)
+
+
+@contextmanager
+def pooled_connection(
+    host: str = "localhost",
+    port: int = 5432,
+    database: str = "supply_chain",
+    user: str = "virt_graph",
+    password: str = "dev_password",
+) -> Iterator[PgConnection]:
+    """
+    Borrow a connection from a shared, thread-safe pool.
+
+    Avoids the TCP/auth handshake of get_connection() for short-lived
+    callers. The connection is rolled back and returned to the pool on
+    exit; broken connections are discarded instead. Pooled sessions carry
+    the statement timeout and are ended by the server if left idle in a
+    transaction for POOL_IDLE_IN_TRANSACTION_TIMEOUT_SEC.
+
+    Args:
+        host: Database host
+        port: Database port
+        database: Database name
+        user: Database user
+        password: Database password
+
+    Yields:
+        PostgreSQL connection owned by the pool (do not close it)
+    """
+    pool = _get_pool((host, port, database, user, password))
+    conn = pool.getconn()
+    with _timeout_lock:
+        _timeout_conns.add(conn)
+    try:
+        yield conn
+    finally:
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        pool.putconn(conn, close=broken)
+
+
+def close_connection_pools() -> None:
+    """Close every pooled connection, e.g. at process shutdown."""
+    with _pools_lock:
+        for pool in _pools.values():
+            if not pool.closed:
+                pool.closeall()
+        _pools.clear()
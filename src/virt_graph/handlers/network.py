@@ -7,21 +7,34 @@ larger portions of the graph.
 Supports composite primary/foreign keys - NetworkX handles tuple nodes natively.
 """
 
-from decimal import Decimal
+import functools
+import heapq
+from dataclasses import dataclass
 from typing import Any, Literal
 
 import networkx as nx
+import numpy as np
 from psycopg2.extensions import connection as PgConnection
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components as _csgraph_components
+from scipy.sparse.csgraph import shortest_path as _csgraph_shortest_path
 
 from .base import (
+    EDGE_FETCH_ITERSIZE,
     MAX_NODES,
     MAX_RESULTS,
+    QUERY_CACHE_MAXSIZE,
     NodeId,
-    QUERY_TIMEOUT_SEC,
     SubgraphTooLarge,
+    _check_identifiers,
+    _ensure_statement_timeout,
+    _register_numeric_as_float,
     fetch_nodes,
 )
 
+# Sources per scipy shortest-path call in _closeness_scores()
+CLOSENESS_BATCH = 256
+
 
 def centrality(
     conn: PgConnection,
@@ -79,12 +92,21 @@ def centrality(
         ... )
         >>> print(f"Most critical facility: {result['results'][0]['node']['name']}")
     """
-    # Load full graph
-    G = _load_full_graph(
-        conn, edges_table, edge_from_col, edge_to_col, weight_col,
-        nodes_table=nodes_table, node_id_column=id_column, soft_delete_column=soft_delete_column,
-        sql_filter=sql_filter
-    )
+    # Load full graph; degree and (unweighted) closeness centrality run on
+    # arrays, so integer-keyed graphs skip building a DiGraph
+    G: nx.DiGraph | _Adjacency
+    if centrality_type in ("degree", "closeness"):
+        G = _load_graph_or_adjacency(
+            conn, edges_table, edge_from_col, edge_to_col,
+            nodes_table=nodes_table, node_id_column=id_column,
+            soft_delete_column=soft_delete_column, sql_filter=sql_filter,
+        )
+    else:
+        G = _load_full_graph(
+            conn, edges_table, edge_from_col, edge_to_col, weight_col,
+            nodes_table=nodes_table, node_id_column=id_column, soft_delete_column=soft_delete_column,
+            sql_filter=sql_filter
+        )
 
     node_count = G.number_of_nodes()
     edge_count = G.number_of_edges()
@@ -95,25 +117,32 @@ def centrality(
             "Consider filtering to a subgraph."
         )
 
-    # Calculate centrality based on type
-    if centrality_type == "degree":
-        scores = nx.degree_centrality(G)
-    elif centrality_type == "betweenness":
-        # Use weight if available for betweenness
-        if weight_col:
-            scores = nx.betweenness_centrality(G, weight="weight")
+    # Calculate centrality based on type, then take the top N
+    limit = min(top_n, MAX_RESULTS)
+    if isinstance(G, _Adjacency):
+        if centrality_type == "degree":
+            score_array = _degree_scores(G)
         else:
-            scores = nx.betweenness_centrality(G)
-    elif centrality_type == "closeness":
-        scores = nx.closeness_centrality(G)
-    elif centrality_type == "pagerank":
-        scores = nx.pagerank(G)
+            score_array = _closeness_scores(G)
+        top = _top_indices(score_array, limit)
+        top_nodes = list(zip(G.node_ids[top].tolist(), score_array[top].tolist()))
     else:
-        raise ValueError(f"Unknown centrality type: {centrality_type}")
-
-    # Sort and get top N
-    sorted_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    top_nodes = sorted_nodes[:min(top_n, MAX_RESULTS)]
+        if centrality_type == "degree":
+            scores = nx.degree_centrality(G)
+        elif centrality_type == "betweenness":
+            # Use weight if available for betweenness
+            if weight_col:
+                scores = nx.betweenness_centrality(G, weight="weight")
+            else:
+                scores = nx.betweenness_centrality(G)
+        elif centrality_type == "closeness":
+            scores = nx.closeness_centrality(G)
+        elif centrality_type == "pagerank":
+            scores = nx.pagerank(G)
+        else:
+            raise ValueError(f"Unknown centrality type: {centrality_type}")
+        # Same order as a full stable sort, ties included, in O(n log top_n)
+        top_nodes = heapq.nlargest(limit, scores.items(), key=lambda x: x[1])
 
     # Fetch node details
     node_ids = [node_id for node_id, _ in top_nodes]
@@ -139,8 +168,11 @@ def centrality(
         "graph_stats": {
             "nodes": node_count,
             "edges": edge_count,
-            "density": nx.density(G),
-            "is_connected": nx.is_weakly_connected(G) if G.is_directed() else nx.is_connected(G),
+            "density": G.density() if isinstance(G, _Adjacency) else nx.density(G),
+            "is_connected": (
+                G.is_connected("weak") if isinstance(G, _Adjacency)
+                else nx.is_weakly_connected(G) if G.is_directed() else nx.is_connected(G)
+            ),
         },
         "nodes_loaded": node_count,
     }
@@ -263,10 +295,12 @@ def graph_density(
     Returns:
         dict with graph statistics
     """
-    G = _load_full_graph(
-        conn, edges_table, edge_from_col, edge_to_col, weight_col,
-        nodes_table=nodes_table, node_id_column=node_id_column, soft_delete_column=soft_delete_column,
-        sql_filter=sql_filter
+    _check_identifiers(weight_col)
+    # Weights don't enter any statistic below
+    G = _load_graph_or_adjacency(
+        conn, edges_table, edge_from_col, edge_to_col,
+        nodes_table=nodes_table, node_id_column=node_id_column,
+        soft_delete_column=soft_delete_column, sql_filter=sql_filter,
     )
 
     if G.number_of_nodes() > MAX_NODES:
@@ -274,6 +308,9 @@ def graph_density(
             f"Graph has {G.number_of_nodes():,} nodes, exceeds limit {MAX_NODES:,}"
         )
 
+    if isinstance(G, _Adjacency):
+        return _adjacency_stats(G)
+
     stats = {
         "nodes": G.number_of_nodes(),
         "edges": G.number_of_edges(),
@@ -333,6 +370,9 @@ def neighbors(
             - outbound_count: number of outgoing edges
             - inbound_count: number of incoming edges
     """
+    _check_identifiers(
+        nodes_table, edges_table, edge_from_col, edge_to_col, id_column, soft_delete_column
+    )
     outbound_ids = []
     inbound_ids = []
 
@@ -349,33 +389,31 @@ def neighbors(
                 AND n.{soft_delete_column} IS NULL
         """
 
+    outbound_query = (
+        f"SELECT e.{edge_to_col} FROM {edges_table} e {soft_delete_join_out} WHERE e.{edge_from_col} = %s"
+    )
+    inbound_query = (
+        f"SELECT e.{edge_from_col} FROM {edges_table} e {soft_delete_join_in} WHERE e.{edge_to_col} = %s"
+    )
+
     with conn.cursor() as cur:
-        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
-
-        if direction in ("outbound", "both"):
-            if soft_delete_column:
-                cur.execute(
-                    f"SELECT e.{edge_to_col} FROM {edges_table} e {soft_delete_join_out} WHERE e.{edge_from_col} = %s",
-                    (node_id,),
-                )
-            else:
-                cur.execute(
-                    f"SELECT {edge_to_col} FROM {edges_table} WHERE {edge_from_col} = %s",
-                    (node_id,),
-                )
+        _ensure_statement_timeout(conn, cur)
+
+        if direction == "both":
+            # One round trip, one index scan per endpoint; the first column
+            # tags which side each neighbor came from
+            cur.execute(
+                f"SELECT true, o.* FROM ({outbound_query}) o "
+                f"UNION ALL SELECT false, i.* FROM ({inbound_query}) i",
+                (node_id, node_id),
+            )
+            for is_outbound, neighbor_id in cur.fetchall():
+                (outbound_ids if is_outbound else inbound_ids).append(neighbor_id)
+        elif direction == "outbound":
+            cur.execute(outbound_query, (node_id,))
             outbound_ids = [row[0] for row in cur.fetchall()]
-
-        if direction in ("inbound", "both"):
-            if soft_delete_column:
-                cur.execute(
-                    f"SELECT e.{edge_from_col} FROM {edges_table} e {soft_delete_join_in} WHERE e.{edge_to_col} = %s",
-                    (node_id,),
-                )
-            else:
-                cur.execute(
-                    f"SELECT {edge_from_col} FROM {edges_table} WHERE {edge_to_col} = %s",
-                    (node_id,),
-                )
+        elif direction == "inbound":
+            cur.execute(inbound_query, (node_id,))
             inbound_ids = [row[0] for row in cur.fetchall()]
 
     # Combine unique neighbor IDs
@@ -535,6 +573,183 @@ def resilience_analysis(
     }
 
 
+@dataclass(slots=True, frozen=True)
+class _Adjacency:
+    """
+    Directed simple graph in CSR form over dense node indices.
+
+    Built with a few array passes from fetched (from_id, to_id) edges, for
+    handlers that only need degrees or connectivity; NetworkX would spend
+    most of the load time filling its dict-of-dicts. Parallel edges
+    collapse as in nx.DiGraph, and node_ids keep NetworkX's insertion
+    order, so ties sort the same way.
+    """
+
+    node_ids: np.ndarray  # index -> node ID, in first-seen order
+    indptr: np.ndarray  # targets of index u are indices[indptr[u]:indptr[u + 1]]
+    indices: np.ndarray
+
+    @classmethod
+    def from_edges(cls, edges: np.ndarray) -> "_Adjacency":
+        """Build from a non-empty (n, 2) int64 array of (from_id, to_id)."""
+        endpoints = edges.ravel()
+        unique, first_seen = np.unique(endpoints, return_index=True)
+        order = np.argsort(first_seen, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.size)
+        codes = rank[np.searchsorted(unique, endpoints)].reshape(-1, 2)
+
+        # Sorted distinct (from, to) pairs are the CSR rows in order
+        n = order.size
+        pairs = np.unique(codes[:, 0] * n + codes[:, 1])
+        sources = pairs // n
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        return cls(unique[order], indptr, pairs % n)
+
+    def number_of_nodes(self) -> int:
+        return self.node_ids.size
+
+    def number_of_edges(self) -> int:
+        return self.indices.size
+
+    def neighbors(self, u: int) -> np.ndarray:
+        """Target indices of node index u."""
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def degrees(self) -> np.ndarray:
+        """In- plus out-degree per node index, as DiGraph.degree() counts it."""
+        return np.diff(self.indptr) + np.bincount(self.indices, minlength=self.node_ids.size)
+
+    def density(self) -> float:
+        """Same value as nx.density() on the equivalent DiGraph."""
+        n = self.number_of_nodes()
+        if n <= 1:
+            return 0
+        return self.number_of_edges() / (n * (n - 1))
+
+    def matrix(self) -> csr_array:
+        """Unweighted sparse adjacency matrix over node indices."""
+        n = self.number_of_nodes()
+        return csr_array(
+            (np.ones(self.indices.size, dtype=np.int8), self.indices, self.indptr), shape=(n, n)
+        )
+
+    def is_connected(self, connection: Literal["weak", "strong"] = "weak") -> bool:
+        count = _csgraph_components(
+            self.matrix(), directed=True, connection=connection, return_labels=False
+        )
+        return count == 1
+
+
+def _degree_scores(adjacency: _Adjacency) -> np.ndarray:
+    """nx.degree_centrality() per node index of an _Adjacency."""
+    n = adjacency.number_of_nodes()
+    if n <= 1:
+        return np.ones(n)
+    return adjacency.degrees() * (1.0 / (n - 1.0))
+
+
+def _closeness_scores(adjacency: _Adjacency) -> np.ndarray:
+    """
+    nx.closeness_centrality() (unweighted, wf_improved) per node index.
+
+    Incoming distances come from BFS over the transposed matrix in
+    scipy's C Dijkstra, CLOSENESS_BATCH sources at a time so the distance
+    block stays at CLOSENESS_BATCH x n floats.
+    """
+    n = adjacency.number_of_nodes()
+    scores = np.zeros(n)
+    if n <= 1:
+        return scores
+    reverse = adjacency.matrix().T.tocsr()
+    for start in range(0, n, CLOSENESS_BATCH):
+        sources = np.arange(start, min(start + CLOSENESS_BATCH, n))
+        dist = _csgraph_shortest_path(reverse, method="D", unweighted=True, indices=sources)
+        reached = np.isfinite(dist)
+        reach = reached.sum(axis=1) - 1.0
+        total = np.where(reached, dist, 0.0).sum(axis=1)
+        # Same operation order as NetworkX, so scores (and ties) match exactly
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block = (reach / total) * (reach / (n - 1))
+        scores[sources] = np.where(total > 0, block, 0.0)
+    return scores
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, highest first, ties by lowest index.
+
+    Same selection as sorted(..., reverse=True)[:k] over the scores in
+    index order, but only the candidates at or above the k-th largest
+    score (found with np.partition) are sorted.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        kth = np.partition(scores, scores.size - k)[scores.size - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+
+
+def _adjacency_stats(adjacency: _Adjacency) -> dict[str, Any]:
+    """graph_density() statistics computed on an _Adjacency."""
+    stats: dict[str, Any] = {
+        "nodes": adjacency.number_of_nodes(),
+        "edges": adjacency.number_of_edges(),
+        "density": adjacency.density(),
+        "is_directed": True,
+    }
+    stats["is_weakly_connected"] = adjacency.is_connected("weak")
+    if stats["is_weakly_connected"]:
+        stats["is_strongly_connected"] = adjacency.is_connected("strong")
+
+    # Degree statistics
+    degrees = adjacency.degrees()
+    stats["avg_degree"] = int(degrees.sum()) / degrees.size
+    stats["max_degree"] = int(degrees.max())
+    stats["min_degree"] = int(degrees.min())
+
+    return stats
+
+
+def _load_graph_or_adjacency(
+    conn: PgConnection,
+    edges_table: str,
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    nodes_table: str | None = None,
+    node_id_column: str | list[str] = "id",
+    soft_delete_column: str | None = None,
+    sql_filter: str | None = None,
+) -> "nx.DiGraph | _Adjacency":
+    """
+    Load the unweighted graph as an _Adjacency when it has integer keys.
+
+    Integer-keyed edges are converted into an array batch by batch (see
+    _fetch_all_edges_array()). Falls back to the _load_full_graph() DiGraph for composite or
+    non-integer keys, and for an empty edge table (so NetworkX's errors on
+    empty graphs are unchanged).
+    """
+    if isinstance(edge_from_col, str) and isinstance(edge_to_col, str):
+        edges = _fetch_all_edges_array(
+            conn, edges_table, edge_from_col, edge_to_col,
+            nodes_table, node_id_column, soft_delete_column, sql_filter,
+        )
+        if isinstance(edges, np.ndarray):
+            if edges.size:
+                return _Adjacency.from_edges(edges)
+            edges = []
+        return _graph_from_rows(edges, edge_from_col, edge_to_col, None)
+    rows = _fetch_all_edges(
+        conn, edges_table, edge_from_col, edge_to_col, None,
+        nodes_table, node_id_column, soft_delete_column, sql_filter,
+    )
+    return _graph_from_rows(rows, edge_from_col, edge_to_col, None)
+
+
 def _load_full_graph(
     conn: PgConnection,
     edges_table: str,
@@ -564,15 +779,108 @@ def _load_full_graph(
         soft_delete_column: Column to check for soft-delete filtering
         sql_filter: SQL WHERE clause for edge filtering
     """
-    G = nx.DiGraph()
+    rows = _fetch_all_edges(
+        conn, edges_table, edge_from_col, edge_to_col, weight_col,
+        nodes_table, node_id_column, soft_delete_column, sql_filter,
+    )
+    return _graph_from_rows(rows, edge_from_col, edge_to_col, weight_col)
+
+
+def _fetch_all_edges(
+    conn: PgConnection,
+    edges_table: str,
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    weight_col: str | None,
+    nodes_table: str | None,
+    node_id_column: str | list[str],
+    soft_delete_column: str | None,
+    sql_filter: str | None,
+) -> list[tuple]:
+    """Fetch every (from cols..., to cols..., [weight]) row of the edge table; see _load_full_graph()."""
+    # Composite column lists as tuples, for the query cache
+    query = _all_edges_query(
+        edges_table,
+        edge_from_col if isinstance(edge_from_col, str) else tuple(edge_from_col),
+        edge_to_col if isinstance(edge_to_col, str) else tuple(edge_to_col),
+        weight_col,
+        nodes_table,
+        node_id_column if isinstance(node_id_column, str) else tuple(node_id_column),
+        soft_delete_column,
+        sql_filter,
+    )
+
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        # NUMERIC weights come back as float
+        _register_numeric_as_float(cur)
+        cur.execute(query)
+        return cur.fetchall()
+
+
+def _fetch_all_edges_array(
+    conn: PgConnection,
+    edges_table: str,
+    edge_from_col: str,
+    edge_to_col: str,
+    nodes_table: str | None,
+    node_id_column: str | list[str],
+    soft_delete_column: str | None,
+    sql_filter: str | None,
+) -> np.ndarray | list[tuple]:
+    """
+    Fetch every (from_id, to_id) edge into an (n, 2) int64 array.
+
+    Rows are turned into Python tuples EDGE_FETCH_ITERSIZE at a time and
+    each batch is converted on arrival, so the full list of row tuples is
+    never held. Returns the rows as a list instead if any batch has
+    non-integer or NULL IDs, for _graph_from_rows().
+    """
+    query = _all_edges_query(
+        edges_table, edge_from_col, edge_to_col, None, nodes_table,
+        node_id_column if isinstance(node_id_column, str) else tuple(node_id_column),
+        soft_delete_column, sql_filter,
+    )
+    chunks: list[np.ndarray] = []
+    # A plain cursor rather than a named one: DECLARE plans for a fast first
+    # row (cursor_tuple_fraction), which reorders rows and so centrality ties
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        cur.execute(query)
+        while rows := cur.fetchmany(EDGE_FETCH_ITERSIZE):
+            try:
+                if type(rows[0][0]) is not int or type(rows[0][1]) is not int:
+                    raise TypeError
+                chunks.append(np.array(rows, dtype=np.int64).reshape(-1, 2))
+            except (TypeError, ValueError, OverflowError):
+                # Keep what was converted as rows and read the rest unconverted
+                fallback = [tuple(edge) for chunk in chunks for edge in chunk.tolist()]
+                return fallback + rows + cur.fetchall()
+    return np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int64)
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _all_edges_query(
+    edges_table: str,
+    edge_from_col: str | tuple[str, ...],
+    edge_to_col: str | tuple[str, ...],
+    weight_col: str | None,
+    nodes_table: str | None,
+    node_id_column: str | tuple[str, ...],
+    soft_delete_column: str | None,
+    sql_filter: str | None,
+) -> str:
+    """Whole-table edge SELECT for _fetch_all_edges(); cached per shape."""
+    _check_identifiers(
+        edges_table, edge_from_col, edge_to_col, weight_col,
+        nodes_table, node_id_column, soft_delete_column,
+    )
 
     # Normalize columns to lists
     from_cols = [edge_from_col] if isinstance(edge_from_col, str) else list(edge_from_col)
     to_cols = [edge_to_col] if isinstance(edge_to_col, str) else list(edge_to_col)
     id_cols = [node_id_column] if isinstance(node_id_column, str) else list(node_id_column)
 
-    is_composite = len(from_cols) > 1 or len(to_cols) > 1
-
     # Build column select expressions
     from_cols_select = ", ".join(f"e.{c}" for c in from_cols)
     to_cols_select = ", ".join(f"e.{c}" for c in to_cols)
@@ -599,21 +907,27 @@ def _load_full_graph(
     if sql_filter:
         sql_filter_clause = f"WHERE ({sql_filter})" if not soft_delete_join else f"AND ({sql_filter})"
 
-    with conn.cursor() as cur:
-        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
+    return f"""
+        SELECT {from_cols_select}, {to_cols_select}{weight_select}
+        FROM {edges_table} e
+        {soft_delete_join}
+        {sql_filter_clause}
+    """
 
-        query = f"""
-            SELECT {from_cols_select}, {to_cols_select}{weight_select}
-            FROM {edges_table} e
-            {soft_delete_join}
-            {sql_filter_clause}
-        """
-        cur.execute(query)
-        rows = cur.fetchall()
+
+def _graph_from_rows(
+    rows: list[tuple],
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    weight_col: str | None,
+) -> nx.DiGraph:
+    """Build the DiGraph for rows from _fetch_all_edges()."""
+    G = nx.DiGraph()
+    n_from = 1 if isinstance(edge_from_col, str) else len(edge_from_col)
+    n_to = 1 if isinstance(edge_to_col, str) else len(edge_to_col)
+    is_composite = n_from > 1 or n_to > 1
 
     # Convert results to proper format
-    n_from = len(from_cols)
-    n_to = len(to_cols)
 
     for row in rows:
         if is_composite:
@@ -624,9 +938,7 @@ def _load_full_graph(
             to_id = row[1]
 
         if weight_col:
-            # Convert Decimal to float for weights
-            weight = float(row[-1]) if isinstance(row[-1], Decimal) else row[-1]
-            G.add_edge(from_id, to_id, weight=weight)
+            G.add_edge(from_id, to_id, weight=row[-1])
         else:
             G.add_edge(from_id, to_id)
 
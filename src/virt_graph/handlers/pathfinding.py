@@ -6,7 +6,7 @@ Implements shortest path algorithms with weighted edges.
 Supports composite primary/foreign keys - NetworkX handles tuple nodes natively.
 """
 
-from decimal import Decimal
+import functools
 from typing import Any
 
 import networkx as nx
@@ -15,11 +15,17 @@ from psycopg2.extensions import connection as PgConnection
 from .base import (
     MAX_DEPTH,
     MAX_NODES,
+    QUERY_CACHE_MAXSIZE,
     NodeId,
-    QUERY_TIMEOUT_SEC,
     SubgraphTooLarge,
+    _check_identifiers,
+    _ensure_statement_timeout,
+    _execute_if_preparable,
+    _id_array_param,
+    _key_columns_match,
+    _register_numeric_as_float,
     fetch_edges_for_frontier,
-    fetch_nodes,
+    fetch_nodes_ordered,
 )
 
 
@@ -65,7 +71,7 @@ def shortest_path(
     Returns:
         dict with:
             - path: list of node IDs from start to end (None if no path)
-            - path_nodes: list of node dicts with details
+            - path_nodes: list of node dicts with details, in path order
             - distance: total path weight/length (None if no path)
             - edges: list of edge dicts with weights along the path
             - nodes_explored: number of nodes loaded into graph
@@ -87,6 +93,29 @@ def shortest_path(
         ... )
         >>> print(f"Route avoiding Denver costs ${result['distance']:.2f}")
     """
+    return _shortest_path(
+        conn, nodes_table, edges_table, edge_from_col, edge_to_col, start_id, end_id,
+        weight_col, max_depth, id_column, excluded_nodes, soft_delete_column, sql_filter,
+    )
+
+
+def _shortest_path(
+    conn: PgConnection,
+    nodes_table: str,
+    edges_table: str,
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    start_id: NodeId,
+    end_id: NodeId,
+    weight_col: str | None,
+    max_depth: int,
+    id_column: str | list[str],
+    excluded_nodes: list[NodeId] | None,
+    soft_delete_column: str | None,
+    sql_filter: str | None,
+    edge_cache: "_EdgeCache | None" = None,
+) -> dict[str, Any]:
+    """shortest_path() body; edge_cache keeps the fetched edges for a later pass."""
     max_depth = min(max_depth, MAX_DEPTH)
 
     # Set of nodes to exclude (for filtering edges)
@@ -134,6 +163,7 @@ def shortest_path(
                 node_id_column=id_column,
                 soft_delete_column=soft_delete_column,
                 sql_filter=sql_filter,
+                cache=edge_cache,
             )
 
             next_forward = set()
@@ -162,6 +192,7 @@ def shortest_path(
                 node_id_column=id_column,
                 soft_delete_column=soft_delete_column,
                 sql_filter=sql_filter,
+                cache=edge_cache,
             )
 
             next_backward = set()
@@ -231,7 +262,7 @@ def shortest_path(
         }
 
     # Fetch node details for path
-    path_nodes = fetch_nodes(
+    path_nodes = fetch_nodes_ordered(
         conn, nodes_table, path, id_column=id_column, soft_delete_column=soft_delete_column
     )
 
@@ -306,8 +337,12 @@ def all_shortest_paths(
     # Set of nodes to exclude (for filtering edges)
     excluded_set = set(excluded_nodes) if excluded_nodes else set()
 
+    # The rebuild below walks outbound from start again; the forward half of
+    # the bidirectional search has already fetched its first levels
+    edge_cache = _EdgeCache()
+
     # First find one shortest path to get the graph
-    result = shortest_path(
+    result = _shortest_path(
         conn,
         nodes_table,
         edges_table,
@@ -321,6 +356,7 @@ def all_shortest_paths(
         excluded_nodes,
         soft_delete_column,
         sql_filter,
+        edge_cache,
     )
 
     if result["path"] is None:
@@ -354,6 +390,7 @@ def all_shortest_paths(
             node_id_column=id_column,
             soft_delete_column=soft_delete_column,
             sql_filter=sql_filter,
+            cache=edge_cache,
         )
 
         next_frontier = set()
@@ -396,6 +433,52 @@ def all_shortest_paths(
     }
 
 
+class _EdgeCache:
+    """
+    Weighted edges fetched during one handler call, per node and direction.
+
+    Only valid while the edge table, filters and weight column stay fixed,
+    so it is created per call and never shared.
+    """
+
+    __slots__ = ("_edges",)
+
+    def __init__(self) -> None:
+        self._edges: dict[tuple[str, NodeId], list[tuple[NodeId, NodeId, float | None]]] = {}
+
+    def lookup(
+        self, direction: str, frontier_ids: list[NodeId]
+    ) -> tuple[list[tuple[NodeId, NodeId, float | None]], list[NodeId]]:
+        """Return (cached edges, frontier nodes with nothing cached)."""
+        edges: list[tuple[NodeId, NodeId, float | None]] = []
+        missing: list[NodeId] = []
+        for node_id in frontier_ids:
+            hit = self._edges.get((direction, node_id))
+            if hit is None:
+                missing.append(node_id)
+            else:
+                edges.extend(hit)
+        return edges, missing
+
+    def store(
+        self,
+        direction: str,
+        frontier_ids: list[NodeId],
+        edges: list[tuple[NodeId, NodeId, float | None]],
+    ) -> None:
+        """Record edges fetched for frontier_ids, including nodes that had none."""
+        end = 0 if direction == "outbound" else 1
+        by_node: dict[NodeId, list] = {node_id: [] for node_id in frontier_ids}
+        for edge in edges:
+            bucket = by_node.get(edge[end])
+            if bucket is None:
+                # Frontier and edge IDs differ in shape; don't guess
+                return
+            bucket.append(edge)
+        for node_id, node_edges in by_node.items():
+            self._edges[(direction, node_id)] = node_edges
+
+
 def _fetch_edges_with_weights(
     conn: PgConnection,
     edges_table: str,
@@ -408,6 +491,7 @@ def _fetch_edges_with_weights(
     node_id_column: str | list[str] = "id",
     soft_delete_column: str | None = None,
     sql_filter: str | None = None,
+    cache: "_EdgeCache | None" = None,
 ) -> list[tuple[NodeId, NodeId, float | None]]:
     """
     Fetch edges with optional weights for the frontier.
@@ -427,16 +511,92 @@ def _fetch_edges_with_weights(
         node_id_column: ID column(s) in nodes_table
         soft_delete_column: Column to check for soft-delete filtering
         sql_filter: SQL WHERE clause for edge filtering
+        cache: Edges already fetched in this handler call; only frontier
+               nodes it has not seen are queried
     """
     if not frontier_ids:
         return []
-
-    # Normalize columns to lists
-    from_cols = [edge_from_col] if isinstance(edge_from_col, str) else list(edge_from_col)
-    to_cols = [edge_to_col] if isinstance(edge_to_col, str) else list(edge_to_col)
-    id_cols = [node_id_column] if isinstance(node_id_column, str) else list(node_id_column)
+    if cache is not None:
+        edges, missing = cache.lookup(direction, frontier_ids)
+        if missing:
+            fetched = _fetch_edges_with_weights(
+                conn, edges_table, missing, edge_from_col, edge_to_col, weight_col,
+                direction, nodes_table, node_id_column, soft_delete_column, sql_filter,
+            )
+            cache.store(direction, missing, fetched)
+            edges += fetched
+        return edges
+    # Normalize columns to tuples
+    from_cols = (edge_from_col,) if isinstance(edge_from_col, str) else tuple(edge_from_col)
+    to_cols = (edge_to_col,) if isinstance(edge_to_col, str) else tuple(edge_to_col)
+    id_cols = (node_id_column,) if isinstance(node_id_column, str) else tuple(node_id_column)
 
     is_composite = len(from_cols) > 1 or len(to_cols) > 1
+    frontier_cols = from_cols if direction == "outbound" else to_cols
+    tuple_frontier = len(frontier_cols) > 1 and isinstance(frontier_ids[0], tuple)
+
+    query = _weighted_edges_query(
+        edges_table, from_cols, to_cols, weight_col, direction,
+        nodes_table, id_cols, soft_delete_column, sql_filter, tuple_frontier,
+    )
+    if tuple_frontier:
+        params = [list(col) for col in zip(*frontier_ids)]
+    else:
+        params = [_id_array_param(frontier_ids)]
+
+    with conn.cursor() as cur:
+        _ensure_statement_timeout(conn, cur)
+        # NUMERIC weights come back as float
+        _register_numeric_as_float(cur)
+        # Each BFS level re-runs the same shape: reuse a prepared plan
+        _execute_if_preparable(conn, cur, query, params)
+        rows = cur.fetchall()
+
+    # Convert results to proper format
+    results: list[tuple[NodeId, NodeId, float | None]] = []
+    n_from = len(from_cols)
+    n_to = len(to_cols)
+
+    for row in rows:
+        if is_composite:
+            from_id = tuple(row[:n_from]) if n_from > 1 else row[0]
+            to_id = tuple(row[n_from:n_from + n_to]) if n_to > 1 else row[n_from]
+        else:
+            from_id = row[0]
+            to_id = row[1]
+
+        if weight_col:
+            weight = row[-1]
+        else:
+            weight = None
+
+        results.append((from_id, to_id, weight))
+
+    return results
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_MAXSIZE)
+def _weighted_edges_query(
+    edges_table: str,
+    from_cols: tuple[str, ...],
+    to_cols: tuple[str, ...],
+    weight_col: str | None,
+    direction: str,
+    nodes_table: str | None,
+    id_cols: tuple[str, ...],
+    soft_delete_column: str | None,
+    sql_filter: str | None,
+    tuple_frontier: bool,
+) -> str:
+    """
+    SELECT text for _fetch_edges_with_weights(); cached per shape.
+
+    The frontier binds as one array parameter, or one per key column when
+    tuple_frontier, so the text does not depend on the frontier.
+    """
+    _check_identifiers(
+        edges_table, from_cols, to_cols, weight_col, nodes_table, id_cols, soft_delete_column,
+    )
 
     # Build column select expressions
     from_cols_select = ", ".join(f"e.{c}" for c in from_cols)
@@ -464,56 +624,18 @@ def _fetch_edges_with_weights(
     if sql_filter:
         sql_filter_clause = f" AND ({sql_filter})"
 
-    # Build frontier matching clause
-    def build_frontier_match(cols: list[str]) -> tuple[str, list]:
-        if len(cols) == 1:
-            return f"e.{cols[0]} = ANY(%s)", [frontier_ids]
-        else:
-            col_tuple = f"({', '.join(f'e.{c}' for c in cols)})"
-            if frontier_ids and isinstance(frontier_ids[0], tuple):
-                values_list = ", ".join(
-                    f"({', '.join('%s' for _ in cols)})" for _ in frontier_ids
-                )
-                flat_ids = [v for tup in frontier_ids for v in tup]
-                return f"{col_tuple} IN (VALUES {values_list})", flat_ids
-            return f"e.{cols[0]} = ANY(%s)", [frontier_ids]
-
-    with conn.cursor() as cur:
-        cur.execute(f"SET statement_timeout = '{QUERY_TIMEOUT_SEC * 1000}'")
-
-        if direction == "outbound":
-            frontier_clause, frontier_params = build_frontier_match(from_cols)
-        else:
-            frontier_clause, frontier_params = build_frontier_match(to_cols)
-
-        query = f"""
-            SELECT {from_cols_select}, {to_cols_select}{weight_select}
-            FROM {edges_table} e
-            {soft_delete_join}
-            WHERE {frontier_clause}
-            {sql_filter_clause}
-        """
-        cur.execute(query, frontier_params)
-        rows = cur.fetchall()
-
-    # Convert results to proper format
-    results: list[tuple[NodeId, NodeId, float | None]] = []
-    n_from = len(from_cols)
-    n_to = len(to_cols)
-
-    for row in rows:
-        if is_composite:
-            from_id = tuple(row[:n_from]) if n_from > 1 else row[0]
-            to_id = tuple(row[n_from:n_from + n_to]) if n_to > 1 else row[n_from]
-        else:
-            from_id = row[0]
-            to_id = row[1]
-
-        if weight_col:
-            weight = float(row[-1]) if isinstance(row[-1], Decimal) else row[-1]
-        else:
-            weight = None
-
-        results.append((from_id, to_id, weight))
-
-    return results
+    # Build frontier matching clause; plain IDs match a composite key's
+    # first column
+    cols = from_cols if direction == "outbound" else to_cols
+    if tuple_frontier:
+        frontier_clause, _ = _key_columns_match([f"e.{c}" for c in cols], [])
+    else:
+        frontier_clause = f"e.{cols[0]} = ANY(%s)"
+
+    return f"""
+        SELECT {from_cols_select}, {to_cols_select}{weight_select}
+        FROM {edges_table} e
+        {soft_delete_join}
+        WHERE {frontier_clause}
+        {sql_filter_clause}
+    """
@@ -20,12 +20,17 @@ from ..estimator import (
 from .base import (
     MAX_DEPTH,
     MAX_NODES,
+    BFSArena,
     NodeId,
     SubgraphTooLarge,
+    _check_identifiers,
+    _fetch_start_edges_with_stop,
     check_limits,
     fetch_edges_for_frontier,
+    fetch_edges_with_stop,
     fetch_nodes,
     should_stop,
+    should_stop_many,
 )
 
 
@@ -57,6 +62,8 @@ def traverse(
     sql_filter: str | None = None,
     # Result ordering
     order_by: str | None = None,
+    # Index strategy for direction="both"
+    endpoint_index: str | None = None,
 ) -> dict[str, Any]:
     """
     Generic graph traversal using iterative frontier-batched BFS.
@@ -98,6 +105,8 @@ def traverse(
                    Applied during edge fetching. Combines with temporal filtering.
         order_by: Column to order result nodes by (e.g., "step_sequence" for work order steps).
                   Useful for sequential data like routing steps. Use "col DESC" for descending.
+        endpoint_index: Edge-fetch strategy for direction="both"; see
+                        fetch_edges_for_frontier() ("union_all" or "gin_array").
 
     Returns:
         dict with:
@@ -139,6 +148,53 @@ def traverse(
         >>> # With sql_filter for active edges only
         >>> result = traverse(..., sql_filter="is_active = true")
     """
+    result, arena = _traverse(
+        conn, nodes_table, edges_table, edge_from_col, edge_to_col, start_id,
+        direction, max_depth, stop_condition, collect_columns, prefilter_sql,
+        include_start, id_column, max_nodes, skip_estimation, estimation_config,
+        soft_delete_column, valid_at, temporal_start_col, temporal_end_col,
+        sql_filter, order_by, endpoint_index,
+    )
+    result["paths"] = arena.paths(include_root=include_start)
+    return result
+
+
+def _traverse(
+    conn: PgConnection,
+    nodes_table: str,
+    edges_table: str,
+    edge_from_col: str | list[str],
+    edge_to_col: str | list[str],
+    start_id: NodeId,
+    direction: str,
+    max_depth: int,
+    stop_condition: str | None,
+    collect_columns: list[str] | None,
+    prefilter_sql: str | None,
+    include_start: bool,
+    id_column: str | list[str],
+    max_nodes: int | None,
+    skip_estimation: bool,
+    estimation_config: EstimationConfig | None,
+    soft_delete_column: str | None,
+    valid_at: datetime | None,
+    temporal_start_col: str | None,
+    temporal_end_col: str | None,
+    sql_filter: str | None,
+    order_by: str | None,
+    endpoint_index: str | None,
+) -> tuple[dict[str, Any], BFSArena]:
+    """
+    traverse() without building paths.
+
+    Returns the result dict ("paths" left empty) and the BFSArena the
+    paths can be built from, so callers only materialize the ones they need.
+    """
+    # Before the sampler, which builds its own SQL from these names
+    _check_identifiers(
+        nodes_table, edges_table, edge_from_col, edge_to_col, id_column,
+        soft_delete_column, temporal_start_col, temporal_end_col,
+    )
     # Clamp to safety limit
     max_depth = min(max_depth, MAX_DEPTH)
     effective_max_nodes = max_nodes if max_nodes is not None else MAX_NODES
@@ -158,10 +214,15 @@ def traverse(
         sampler = GraphSampler(
             conn, edges_table, first_from_col, first_to_col, direction
         )
-        sample = sampler.sample(first_start_id)
-        table_bound = get_table_bound(conn, edges_table, first_from_col, first_to_col)
+        sample = sampler.sample(first_start_id, max_nodes=effective_max_nodes)
 
-        estimated = estimate(sample, max_depth, table_bound, estimation_config)
+        # The table bound only ever lowers an estimate, so it is looked up
+        # (a catalog query on a connection's first call) only when it could
+        # rescue one that is over the limit
+        estimated = estimate(sample, max_depth, None, estimation_config)
+        if estimated > effective_max_nodes:
+            table_bound = get_table_bound(conn, edges_table, first_from_col, first_to_col)
+            estimated = estimate(sample, max_depth, table_bound, estimation_config)
 
         if estimated > effective_max_nodes:
             raise SubgraphTooLarge(
@@ -172,16 +233,41 @@ def traverse(
     # Initialize traversal state - supports both simple and composite keys
     # Node IDs are hashable (int or tuple)
     frontier: set[NodeId] = {start_id}
-    visited: set[NodeId] = {start_id}
-    paths: dict[NodeId, list[NodeId]] = {start_id: [start_id]}
+    arena = BFSArena(start_id)
+    visited = arena.index  # membership tests skip a method call
     edges_traversed: list[tuple[NodeId, NodeId]] = []
     terminated_at: set[NodeId] = set()
     depth_reached = 0
 
-    # Track if start node matches stop condition
+    edge_filters = dict(
+        soft_delete_column=soft_delete_column,
+        valid_at=valid_at,
+        temporal_start_col=temporal_start_col,
+        temporal_end_col=temporal_end_col,
+        sql_filter=sql_filter,
+        endpoint_index=endpoint_index,
+    )
+    edge_cols = (
+        from_cols if len(from_cols) > 1 else from_cols[0],
+        to_cols if len(to_cols) > 1 else to_cols[0],
+    )
+    node_id_column = id_cols if len(id_cols) > 1 else id_cols[0]
+
+    # Track if start node matches stop condition. The check rides on the
+    # first level's edge query; should_stop() only answers for a start
+    # node without edges. A terminal start's edges are simply not used.
     start_is_terminal = False
+    first_level: list[tuple[NodeId, NodeId, bool]] | None = None
     if stop_condition:
-        start_is_terminal = should_stop(conn, nodes_table, start_id, stop_condition, id_cols)
+        start_stops = None
+        if max_depth > 0:
+            first_level, start_stops = _fetch_start_edges_with_stop(
+                conn, edges_table, nodes_table, start_id, *edge_cols, stop_condition,
+                node_id_column=node_id_column, direction=direction, **edge_filters,
+            )
+        if start_stops is None:
+            start_stops = should_stop(conn, nodes_table, start_id, stop_condition, id_cols)
+        start_is_terminal = start_stops
         if start_is_terminal:
             terminated_at.add(start_id)
 
@@ -190,6 +276,8 @@ def traverse(
         if not frontier:
             break
 
+        # Once per level (~50 ns), next to a query per level: not worth a
+        # precomputed budget object
         check_limits(depth, len(visited))
 
         # Remove terminal nodes from frontier (they won't be expanded)
@@ -198,68 +286,92 @@ def traverse(
         if not expandable_frontier:
             break
 
-        # Single query for entire frontier
-        edges = fetch_edges_for_frontier(
-            conn,
-            edges_table,
-            list(expandable_frontier),
-            from_cols if len(from_cols) > 1 else from_cols[0],
-            to_cols if len(to_cols) > 1 else to_cols[0],
-            direction,
-            nodes_table=nodes_table,
-            node_id_column=id_cols if len(id_cols) > 1 else id_cols[0],
-            soft_delete_column=soft_delete_column,
-            valid_at=valid_at,
-            temporal_start_col=temporal_start_col,
-            temporal_end_col=temporal_end_col,
-            sql_filter=sql_filter,
-        )
+        # Single query for entire frontier; with a stop condition the same
+        # query also flags which edge targets are terminal
+        stop_hits: set[NodeId] = set()
+        if stop_condition:
+            if depth == 0 and first_level is not None:
+                flagged = first_level
+            else:
+                flagged = fetch_edges_with_stop(
+                    conn,
+                    edges_table,
+                    nodes_table,
+                    list(expandable_frontier),
+                    *edge_cols,
+                    stop_condition,
+                    node_id_column=node_id_column,
+                    direction=direction,
+                    **edge_filters,
+                )
+            edges = [(from_id, to_id) for from_id, to_id, _ in flagged]
+            if direction == "outbound":
+                stop_hits = {to_id for _, to_id, stops in flagged if stops}
+            elif direction == "inbound":
+                stop_hits = {from_id for from_id, _, stops in flagged if stops}
+            else:  # both: flag refers to the end away from the frontier
+                stop_hits = {
+                    to_id if from_id in expandable_frontier else from_id
+                    for from_id, to_id, stops in flagged
+                    if stops
+                }
+        else:
+            edges = fetch_edges_for_frontier(
+                conn,
+                edges_table,
+                list(expandable_frontier),
+                *edge_cols,
+                direction,
+                nodes_table=nodes_table,
+                node_id_column=node_id_column,
+                **edge_filters,
+            )
 
         # Apply prefilter if specified
         if prefilter_sql:
             edges = _filter_edges(conn, edges_table, edges, prefilter_sql)
 
-        next_frontier: set[int] = set()
-        for from_id, to_id in edges:
-            # Determine target based on direction
-            if direction == "outbound":
-                source = from_id
-                target = to_id
-            elif direction == "inbound":
-                source = to_id
-                target = from_id
-            else:  # both
-                # In bidirectional mode, the target is whichever end is new
+        # First-seen (source, target, edge) steps, in edge order. The
+        # direction branch is taken once per level, not once per edge.
+        # Adding to the arena records the target's parent for its path.
+        steps: list[tuple[NodeId, NodeId, tuple[NodeId, NodeId]]] = []
+        add = arena.add
+        if direction == "outbound":
+            for edge in edges:
+                source, target = edge
+                if target not in visited:
+                    add(target, source)
+                    steps.append((source, target, edge))
+        elif direction == "inbound":
+            for edge in edges:
+                target, source = edge
+                if target not in visited:
+                    add(target, source)
+                    steps.append((source, target, edge))
+        else:  # both
+            # In bidirectional mode, the target is whichever end is new
+            for edge in edges:
+                from_id, to_id = edge
                 if from_id in frontier and to_id not in visited:
-                    source = from_id
-                    target = to_id
+                    add(to_id, from_id)
+                    steps.append((from_id, to_id, edge))
                 elif to_id in frontier and from_id not in visited:
-                    source = to_id
-                    target = from_id
-                else:
-                    continue
-
-            if target not in visited:
-                next_frontier.add(target)
-                visited.add(target)
-                edges_traversed.append((from_id, to_id))
-
-                # Track path
-                paths[target] = paths[source] + [target]
-
-                # Check stop condition
-                if stop_condition and should_stop(
-                    conn, nodes_table, target, stop_condition, id_cols
-                ):
-                    terminated_at.add(target)
-
-        frontier = next_frontier
+                    add(from_id, to_id)
+                    steps.append((to_id, from_id, edge))
+
+        for source, target, edge in steps:
+            edges_traversed.append(edge)
+
+            # Check stop condition (flagged by the edge query)
+            if target in stop_hits:
+                terminated_at.add(target)
+
+        frontier = {target for _, target, _ in steps}
         depth_reached = depth + 1
 
     # Fetch node data for all visited nodes
-    nodes_to_fetch = list(visited)
-    if not include_start:
-        nodes_to_fetch = [n for n in nodes_to_fetch if n != start_id]
+    # The start node is always the arena's first entry
+    nodes_to_fetch = arena.nodes if include_start else arena.nodes[1:]
 
     nodes = fetch_nodes(
         conn, nodes_table, nodes_to_fetch, collect_columns,
@@ -270,12 +382,12 @@ def traverse(
 
     return {
         "nodes": nodes,
-        "paths": paths if include_start else {k: v for k, v in paths.items() if k != start_id},
+        "paths": {},
         "edges": edges_traversed,
         "depth_reached": depth_reached,
         "nodes_visited": len(visited),
         "terminated_at": list(terminated_at),
-    }
+    }, arena
 
 
 def _filter_edges(
@@ -375,8 +487,8 @@ def traverse_collecting(
         ...     direction="inbound",
         ... )
     """
-    # Traverse without stopping
-    result = traverse(
+    # Traverse without stopping; only matching nodes' paths get built
+    result, arena = _traverse(
         conn,
         nodes_table,
         edges_table,
@@ -387,10 +499,19 @@ def traverse_collecting(
         max_depth,
         stop_condition=None,
         collect_columns=collect_columns,
+        prefilter_sql=None,
         include_start=False,
         id_column=id_column,
+        max_nodes=None,
+        skip_estimation=False,
+        estimation_config=None,
+        soft_delete_column=None,
+        valid_at=None,
+        temporal_start_col=None,
+        temporal_end_col=None,
         sql_filter=sql_filter,
         order_by=order_by,
+        endpoint_index=None,
     )
 
     # Normalize id_column to list
@@ -411,40 +532,18 @@ def traverse_collecting(
             "depth_reached": result["depth_reached"],
         }
 
-    # Query for matching nodes
-    if is_composite:
-        col_tuple = f"({', '.join(id_cols)})"
-        values_list = ", ".join(
-            f"({', '.join('%s' for _ in id_cols)})" for _ in node_ids
-        )
-        flat_ids = [v for tup in node_ids for v in tup]
-        query = f"""
-            SELECT {', '.join(id_cols)}
-            FROM {nodes_table}
-            WHERE {col_tuple} IN (VALUES {values_list}) AND ({target_condition})
-        """
-        params = flat_ids
-    else:
-        query = f"""
-            SELECT {id_cols[0]}
-            FROM {nodes_table}
-            WHERE {id_cols[0]} = ANY(%s) AND ({target_condition})
-        """
-        params = (node_ids,)
-
-    with conn.cursor() as cur:
-        cur.execute(query, params)
-        if is_composite:
-            matching_ids = {tuple(row) for row in cur.fetchall()}
-        else:
-            matching_ids = {row[0] for row in cur.fetchall()}
+    # One batched query for all traversed nodes
+    matching_ids = should_stop_many(
+        conn, nodes_table, node_ids, target_condition,
+        id_cols if is_composite else id_cols[0],
+    )
 
     matching_nodes = [n for n in result["nodes"] if get_node_id(n) in matching_ids]
 
     return {
         "matching_nodes": matching_nodes,
         "matching_paths": {
-            node_id: path for node_id, path in result["paths"].items() if node_id in matching_ids
+            node_id: arena.path_to(node_id) for node_id in arena.nodes[1:] if node_id in matching_ids
         },
         "total_traversed": result["nodes_visited"],
         "depth_reached": result["depth_reached"],
@@ -569,7 +668,8 @@ def path_aggregate(
         order_by=order_by,
     )
 
-    # Build the recursive CTE for path aggregation
+    # Build the recursive CTE for path aggregation. Paths are enumerated
+    # and grouped server-side; only one row per reached node comes back
     aggregated_values = _aggregate_paths_cte(
         conn=conn,
         edges_table=edges_table,
@@ -639,6 +739,10 @@ def _aggregate_paths_cte(
     Returns:
         Dict mapping node_id -> aggregated value
     """
+    _check_identifiers(
+        edges_table, edge_from_col, edge_to_col, value_col, temporal_start_col, temporal_end_col
+    )
+
     # Build temporal filter if needed
     temporal_filter = ""
     temporal_params: list = []
@@ -702,8 +806,9 @@ def _aggregate_paths_cte(
           AND NOT e.{edge_to_col} = ANY(p.path)  -- cycle prevention
           {temporal_filter.replace('%s', '%s') if temporal_filter else ''}
     )
-    -- Final aggregation across all paths to each node
-    SELECT node_id, {final_agg} as aggregated_value
+    -- Final aggregation across all paths to each node; exact numeric along
+    -- paths, decoded as float rather than via Decimal
+    SELECT node_id, ({final_agg})::double precision as aggregated_value
     FROM paths
     GROUP BY node_id
     """
@@ -719,6 +824,6 @@ def _aggregate_paths_cte(
         cur.execute(query, base_params)
         for row in cur.fetchall():
             node_id, agg_value = row
-            result[int(node_id)] = float(agg_value) if agg_value is not None else 0.0
+            result[int(node_id)] = agg_value if agg_value is not None else 0.0
 
     return result
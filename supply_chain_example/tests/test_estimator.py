@@ -4,6 +4,9 @@ Tests for the estimator module.
 Tests graph sampling, estimation models, bounds, and guards.
 """
 
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 
 from virt_graph.estimator import (
@@ -13,10 +16,12 @@ from virt_graph.estimator import (
     SampleResult,
     TableStats,
     check_guards,
+    clear_estimator_cache,
     estimate,
     get_table_bound,
     get_table_stats,
 )
+from virt_graph.handlers import SubgraphTooLarge, traverse
 from virt_graph.handlers.base import get_connection
 
 
@@ -123,6 +128,84 @@ class TestGraphSampler:
             # May or may not trigger depending on expansion pattern
             assert sample.max_expansion_factor >= 0
 
+    def test_sample_stops_at_hub_level(self, conn):
+        """Sampling stops expanding once a level exceeds hub_threshold."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                HAVING COUNT(DISTINCT child_part_id) > 2
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No suitable parent part found")
+            start_id = row[0]
+
+        sampler = GraphSampler(
+            conn,
+            edges_table="bill_of_materials",
+            from_col="parent_part_id",
+            to_col="child_part_id",
+            direction="outbound",
+            hub_threshold=2.0,
+        )
+        sample = sampler.sample(start_id, depth=5)
+
+        assert sample.hub_detected
+        assert not sample.terminated
+        assert len(sample.level_sizes) == 2
+
+    def test_cte_sampling_matches_python_bfs(self, conn):
+        """Recursive-CTE sampling agrees with the per-level client BFS."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data found")
+            start_id = row[0]
+
+        for direction in ("outbound", "inbound"):
+            for hub_threshold in (50.0, 2.0):
+                samples = [
+                    GraphSampler(
+                        conn,
+                        edges_table="bill_of_materials",
+                        from_col="parent_part_id",
+                        to_col="child_part_id",
+                        direction=direction,
+                        hub_threshold=hub_threshold,
+                        use_cte=use_cte,
+                    ).sample(start_id, depth=4)
+                    for use_cte in (True, False)
+                ]
+                assert samples[0] == samples[1]
+
+    def test_cte_sampling_bigint_keys(self, conn):
+        """The CTE seed takes the edge columns' bigint type."""
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE vg_bigint_edges (src bigint, dst bigint)")
+            cur.execute(
+                "INSERT INTO vg_bigint_edges VALUES (1, 2), (1, 3), (3, 5000000000)"
+            )
+
+        for direction, start_id in (("outbound", 1), ("inbound", 5000000000)):
+            samples = [
+                GraphSampler(
+                    conn, "vg_bigint_edges", "src", "dst", direction, use_cte=use_cte
+                ).sample(start_id, depth=4)
+                for use_cte in (True, False)
+            ]
+            assert samples[0] == samples[1]
+            assert samples[0].terminated
+
     def test_supplier_network_sampling(self, conn):
         """Test sampling on supplier relationships."""
         with conn.cursor() as cur:
@@ -148,6 +231,132 @@ class TestGraphSampler:
         assert sample.visited_count >= 1
         assert isinstance(sample.growth_trend, str)
 
+    def test_sample_stops_past_max_nodes(self, conn):
+        """Client-side sampling stops once max_nodes is exceeded."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                HAVING COUNT(*) > 3
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No suitable parent part found")
+            start_id = row[0]
+
+        sampler = GraphSampler(
+            conn,
+            edges_table="bill_of_materials",
+            from_col="parent_part_id",
+            to_col="child_part_id",
+            direction="both",
+        )
+        full = sampler.sample(start_id, depth=5)
+        if full.visited_count <= 20:
+            pytest.skip("Neighbourhood too small to cut short")
+
+        capped = sampler.sample(start_id, depth=5, max_nodes=20)
+
+        assert capped.visited_count > 20
+        assert capped.edges_seen <= full.edges_seen
+        assert len(capped.level_sizes) <= len(full.level_sizes)
+
+    def test_cte_sample_stops_past_max_nodes(self, conn):
+        """The CTE path also honours max_nodes, falling back when unsettled."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data found")
+            start_id = row[0]
+
+        sampler = GraphSampler(
+            conn,
+            edges_table="bill_of_materials",
+            from_col="parent_part_id",
+            to_col="child_part_id",
+            direction="outbound",
+            use_cte=True,
+        )
+        full = sampler.sample(start_id, depth=4)
+        if full.visited_count <= 5:
+            pytest.skip("Subtree too small to cut short")
+
+        capped = sampler.sample(start_id, depth=4, max_nodes=5)
+        assert capped.visited_count > 5
+        assert not capped.terminated
+        assert capped.edges_seen <= full.edges_seen
+
+        # A limit the whole subtree fits in leaves the sample unchanged
+        assert sampler.sample(start_id, depth=4, max_nodes=full.visited_count) == full
+
+    def test_large_frontiers_skip_temp_table_by_default(self, conn):
+        """Samples run on read-only connections; the temp table is opt-in."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data found")
+            start_id = row[0]
+        conn.rollback()
+
+        def sampler(**kwargs):
+            return GraphSampler(
+                conn,
+                edges_table="bill_of_materials",
+                from_col="parent_part_id",
+                to_col="child_part_id",
+                direction="both",
+                **kwargs,
+            )
+
+        default = sampler().sample(start_id, depth=5)
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('pg_temp.vg_sample_frontier')")
+            assert cur.fetchone()[0] is None
+        conn.rollback()
+
+        assert sampler(frontier_temp_table=True).sample(start_id, depth=5) == default
+
+        conn.rollback()
+        conn.set_session(readonly=True)
+        assert sampler().sample(start_id, depth=5) == default
+        assert sampler(frontier_temp_table=True).sample(start_id, depth=5) == default
+
+    def test_visited_ids_sparse_ids_leave_bitmap(self):
+        """Widely spread IDs fall back to the sorted array, same answers."""
+        import numpy as np
+
+        from virt_graph.estimator.sampler import _VisitedIds
+
+        visited = _VisitedIds(1)
+        new = visited.add_unseen(np.array([1, 2, 3], dtype=np.int64))
+        assert new.tolist() == [2, 3]
+        assert visited._mask is not None
+
+        new = visited.add_unseen(np.array([3, 5_000_000], dtype=np.int64))
+        assert new.tolist() == [5_000_000]
+        assert visited._mask is None
+        assert visited._sorted.tolist() == [1, 2, 3, 5_000_000]
+
+        new = visited.add_unseen(np.array([2, 4, 5_000_000], dtype=np.int64))
+        assert new.tolist() == [4]
+        assert len(visited) == 5
+
 
 class TestEstimationConfig:
     """Tests for EstimationConfig and estimate()."""
@@ -207,6 +416,45 @@ class TestEstimationConfig:
         assert est >= sample.visited_count
         assert est <= sample.visited_count * 1.1  # Small margin
 
+    def test_extrapolation_truncates_each_level(self):
+        """Each extrapolated level is truncated before the next is grown."""
+        from virt_graph.estimator.models import _damped_extrapolation
+
+        level_sizes = np.array([1, 3, 7])
+        growth_rates = level_sizes[1:] / level_sizes[:-1]
+
+        for max_depth in range(6, 12):
+            expected = 11
+            level, rate = 7, 7 / 3 * 0.9
+            for _ in range(max_depth - 2):
+                level = int(level * rate)
+                if level == 0:
+                    break
+                expected += level
+                rate *= 0.9
+            assert _damped_extrapolation(
+                level_sizes, growth_rates, max_depth, 0.9, 11
+            ) == expected
+
+    def test_undamped_deep_extrapolation_saturates(self):
+        """Unbounded growth saturates at ESTIMATE_CEILING instead of overflowing."""
+        from virt_graph.estimator.models import ESTIMATE_CEILING
+
+        sample = SampleResult(
+            visited_count=111,
+            level_sizes=[1, 10, 100],
+            terminated=False,
+            growth_trend="stable",
+            convergence_ratio=1.0,
+            has_cycles=False,
+            max_expansion_factor=10.0,
+            hub_detected=False,
+            edges_seen=110,
+        )
+        config = EstimationConfig(base_damping=1.0, safety_margin=1.0)
+
+        assert estimate(sample, max_depth=400, config=config) == ESTIMATE_CEILING
+
     def test_table_bound_caps_estimate(self):
         """Table bound caps high estimates."""
         sample = SampleResult(
@@ -266,6 +514,38 @@ class TestBounds:
         assert stats.unique_from_nodes is not None
         assert stats.unique_to_nodes is not None
 
+    def test_get_table_stats_optional_probes(self, conn):
+        """CHECK/index probes only run when requested."""
+        default = get_table_stats(conn, "bill_of_materials")
+        assert default.has_no_self_ref_constraint is False
+        assert default.indexed_columns == frozenset()
+        # unique_nodes needs both edge columns, so it did not run
+        assert default.probes_run == frozenset({"is_junction", "self_ref"})
+
+        full = get_table_stats(
+            conn,
+            "bill_of_materials",
+            probes=frozenset({"is_junction", "self_ref", "check", "indexes"}),
+        )
+        assert {"check", "indexes"} <= full.probes_run
+        assert "parent_part_id" in full.indexed_columns
+        assert full.row_count == default.row_count
+
+        with pytest.raises(ValueError):
+            get_table_stats(conn, "bill_of_materials", probes=frozenset({"bogus"}))
+
+    def test_table_stats_cached_per_connection(self, conn):
+        """Repeated introspection on one connection reuses the cached result."""
+        clear_estimator_cache(conn)
+        first = get_table_stats(conn, "bill_of_materials", "parent_part_id", "child_part_id")
+        second = get_table_stats(conn, "bill_of_materials", "parent_part_id", "child_part_id")
+        assert second is first
+
+        clear_estimator_cache(conn)
+        third = get_table_stats(conn, "bill_of_materials", "parent_part_id", "child_part_id")
+        assert third is not first
+        assert third == first
+
 
 class TestGuards:
     """Tests for runtime guards."""
@@ -467,6 +747,56 @@ class TestIntegration:
         assert "nodes" in result
 
 
+    def test_traverse_sample_stops_at_max_nodes(self, conn):
+        """traverse() passes its node limit to the sampler, cutting it short."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id
+                FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data found")
+            start_id = row[0]
+
+        full = GraphSampler(
+            conn, "bill_of_materials", "parent_part_id", "child_part_id", "both"
+        ).sample(start_id)
+        if full.visited_count <= 20:
+            pytest.skip("Neighbourhood too small to cut short")
+
+        samples = []
+        original_sample = GraphSampler.sample
+
+        def recording_sample(self, *args, **kwargs):
+            result = original_sample(self, *args, **kwargs)
+            samples.append((kwargs.get("max_nodes"), result))
+            return result
+
+        with patch.object(GraphSampler, "sample", recording_sample):
+            with pytest.raises(SubgraphTooLarge):
+                traverse(
+                    conn,
+                    nodes_table="parts",
+                    edges_table="bill_of_materials",
+                    edge_from_col="parent_part_id",
+                    edge_to_col="child_part_id",
+                    start_id=start_id,
+                    direction="both",
+                    max_depth=10,
+                    max_nodes=20,
+                )
+
+        [(max_nodes, sample)] = samples
+        assert max_nodes == 20
+        assert sample.visited_count > 20
+        assert sample.edges_seen < full.edges_seen
+        assert len(sample.level_sizes) < len(full.level_sizes)
+
+
 class TestDeprecationWarning:
     """Tests for deprecated function warning."""
 
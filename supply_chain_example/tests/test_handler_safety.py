@@ -15,7 +15,9 @@ import os
 import time
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
+from psycopg2.extensions import Column
 
 from virt_graph.handlers import (
     MAX_DEPTH,
@@ -25,7 +27,31 @@ from virt_graph.handlers import (
     check_limits,
     traverse,
 )
-from virt_graph.handlers.base import estimate_reachable_nodes, fetch_edges_for_frontier
+from virt_graph.handlers.base import (
+    BFSArena,
+    _register_numeric_as_float,
+    clear_stop_cache,
+    close_connection_pools,
+    configure_connection,
+    estimate_reachable_nodes,
+    fetch_edges_array,
+    fetch_edges_for_frontier,
+    fetch_edges_with_stop,
+    fetch_nodes,
+    fetch_nodes_columnar,
+    fetch_nodes_iter,
+    fetch_nodes_ordered,
+    fetch_nodes_sample,
+    init_connection_pool,
+    iter_edges_for_frontier,
+    make_edge_fetcher,
+    pooled_connection,
+    reachable_nodes,
+    should_stop,
+    should_stop_many,
+    subgraph_exceeds,
+    traverse_edges_cte,
+)
 
 
 # === Unit Tests (No DB Required) ===
@@ -56,6 +82,57 @@ class TestSafetyLimits:
         """Verify MAX_NODES is set to 10,000 as per spec."""
         assert MAX_NODES == 10_000
 
+    def test_fetch_nodes_limits_server_side_and_warns(self):
+        """fetch_nodes() caps rows with LIMIT and warns when it truncates."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.description = [Column(name="id")]
+        mock_cursor.fetchall.return_value = [(1,), (2,), (3,)]
+
+        with patch("virt_graph.handlers.base.MAX_RESULTS", 2), \
+                patch("psycopg2.extensions.register_type"):
+            with pytest.warns(UserWarning, match="MAX_RESULTS=2"):
+                nodes = fetch_nodes(mock_conn, "nodes", [1, 2, 3])
+
+        assert nodes == [{"id": 1}, {"id": 2}]
+        assert "LIMIT 3" in mock_cursor.execute.call_args[0][0]
+
+    def test_fetch_nodes_iter_stops_at_cap_and_warns(self):
+        """fetch_nodes_iter() streams at most MAX_RESULTS rows and warns past them."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.description = [Column(name="id")]
+        mock_cursor.__iter__.return_value = iter([(1,), (2,), (3,)])
+
+        with patch("virt_graph.handlers.base.MAX_RESULTS", 2), \
+                patch("psycopg2.extensions.register_type"):
+            with pytest.warns(UserWarning, match="MAX_RESULTS=2"):
+                nodes = list(fetch_nodes_iter(mock_conn, "nodes", [1, 2, 3]))
+
+        assert nodes == [{"id": 1}, {"id": 2}]
+        assert "LIMIT 3" in mock_cursor.execute.call_args[0][0]
+
+    def test_fetch_nodes_columnar_transposes_rows(self):
+        """fetch_nodes_columnar() returns one list per column, in row order."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.description = [Column(name="id"), Column(name="cost")]
+        mock_cursor.fetchall.return_value = [(1, 2.5), (2, None)]
+
+        with patch("psycopg2.extensions.register_type"):
+            columns = fetch_nodes_columnar(mock_conn, "nodes", [1, 2])
+            mock_cursor.fetchall.return_value = []
+            empty = fetch_nodes_columnar(mock_conn, "nodes", [3])
+
+        assert columns == {"id": [1, 2], "cost": [2.5, None]}
+        assert empty == {"id": [], "cost": []}
+
 
 class TestFrontierBatching:
     """Test frontier batching utilities."""
@@ -92,10 +169,16 @@ class TestFrontierBatching:
 
         # Verify query was constructed correctly
         call_args = mock_cursor.execute.call_args_list
-        assert len(call_args) == 2  # SET timeout + SELECT
-        assert "from_col = ANY" in call_args[1][0][0]
+        assert len(call_args) == 2  # SET timeout + PREPARE/EXECUTE in one round-trip
+        assert "from_col = ANY($1)" in call_args[1][0][0]
+        assert "; EXECUTE vg_" in call_args[1][0][0]
         assert result == [(1, 2), (1, 3)]
 
+        # Timeout already set; the prepared statement is reused
+        fetch_edges_for_frontier(mock_conn, "test_edges", [2], "from_col", "to_col")
+        assert len(call_args) == 3  # EXECUTE only
+        assert call_args[2][0][0].startswith("EXECUTE vg_")
+
     def test_fetch_edges_inbound_query(self):
         """Inbound query uses to_col in WHERE clause."""
         mock_conn = MagicMock()
@@ -116,6 +199,312 @@ class TestFrontierBatching:
         call_args = mock_cursor.execute.call_args_list
         assert "to_col = ANY" in call_args[1][0][0]
 
+    def test_fetch_edges_with_stop_flags_targets(self):
+        """Stop flags come back from the edge query itself."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(1, 2, True), (1, 3, False)]
+
+        result = fetch_edges_with_stop(
+            mock_conn, "test_edges", "nodes", [1], "from_col", "to_col", "tier = 3"
+        )
+
+        call_args = mock_cursor.execute.call_args_list
+        assert len(call_args) == 2  # SET timeout + PREPARE/EXECUTE
+        assert "tier = 3" in call_args[1][0][0]
+        assert result == [(1, 2, True), (1, 3, False)]
+
+    def test_fetch_edges_dedupes_frontier(self):
+        """Repeated frontier IDs are bound once."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = []
+
+        fetch_edges_for_frontier(mock_conn, "test_edges", [3, 1, 3, 1], "from_col", "to_col")
+
+        assert mock_cursor.execute.call_args_list[-1][0][1] == ["{3,1}"]
+
+    def test_fetch_edges_rejects_sql_in_identifiers(self):
+        """Table/column names must be identifiers; nothing is executed otherwise."""
+        mock_conn = MagicMock()
+
+        for table, col in (("edges; DROP TABLE parts", "from_col"), ("edges", "id) OR (1=1")):
+            with pytest.raises(ValueError, match="Invalid SQL identifier"):
+                fetch_edges_for_frontier(mock_conn, table, [1], col, "to_col")
+        mock_conn.cursor.assert_not_called()
+
+        # Schema-qualified and quoted names are identifiers too
+        fetch_edges_for_frontier(mock_conn, 'public."Edges"', [1], "from_col", "to_col")
+
+    def test_fetch_nodes_simple_shape_matches_generic_query(self):
+        """The SELECT * fast path builds the generic query and still checks identifiers."""
+        from virt_graph.handlers.base import _build_nodes_query, _nodes_query
+
+        query, params = _build_nodes_query("parts", [2, 1, 2], None, "id", "deleted_at", None, 11)
+        assert query == _nodes_query("parts", "*", "id = ANY(%s)", "deleted_at", None, 11)
+        assert params == ["{2,1}"]
+
+        with pytest.raises(ValueError, match="Invalid SQL identifier"):
+            fetch_nodes(MagicMock(), "parts", [1], id_column="id) OR (1=1")
+
+    def test_fetch_edges_gin_array_single_lookup(self):
+        """endpoint_index="gin_array" matches both endpoints in one SELECT."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(1, 2)]
+
+        fetch_edges_for_frontier(
+            mock_conn, "test_edges", [1], "from_col", "to_col", "both",
+            endpoint_index="gin_array",
+        )
+
+        query = mock_cursor.execute.call_args_list[1][0][0]
+        assert "ARRAY[e.from_col, e.to_col] && $1" in query
+        assert "UNION ALL" not in query
+
+        with pytest.raises(ValueError):
+            fetch_edges_for_frontier(
+                mock_conn, "test_edges", [1], "from_col", "to_col", "both",
+                endpoint_index="hash",
+            )
+
+    def test_make_edge_fetcher_reuses_query(self):
+        """Specialized fetchers are cached and issue the generic query."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(1, 2)]
+
+        fetch = make_edge_fetcher("test_edges", "from_col", "to_col", "both")
+        assert make_edge_fetcher("test_edges", "from_col", "to_col", "both") is fetch
+        assert fetch(mock_conn, []) == []
+
+        assert fetch(mock_conn, [1, 2]) == [(1, 2)]
+        fetch_edges_for_frontier(
+            mock_conn, "test_edges", [1, 2], "from_col", "to_col", "both"
+        )
+        call_args = mock_cursor.execute.call_args_list
+        assert len(call_args) == 3  # SET timeout once + query per fetch
+        # Int frontiers declare the unnest() array type, so "both" is prepared
+        prepare = call_args[1][0][0]
+        assert prepare.startswith("PREPARE vg_") and "bigint[]" in prepare
+        assert prepare.endswith(call_args[2][0][0])
+
+        # Other ID types leave unnest(%s) untyped: sent unprepared
+        fetch(mock_conn, ["a"])
+        assert "unnest(%s)" in call_args[3][0][0]
+
+    def test_fetch_edges_large_frontier_is_sharded(self):
+        """With shard=True, huge single-direction frontiers fan out over pooled connections."""
+        from contextlib import contextmanager
+
+        import psycopg2.extensions
+
+        from virt_graph.handlers import base
+
+        mock_conn = MagicMock()
+        mock_conn.isolation_level = None
+        mock_conn.status = psycopg2.extensions.STATUS_READY
+        mock_conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        frontier = list(range(base.PARALLEL_FETCH_MIN_FRONTIER + 1))
+        shard_conns = []
+
+        @contextmanager
+        def fake_pool(**kwargs):
+            shard_conn = MagicMock()
+            cursor = shard_conn.cursor.return_value.__enter__.return_value
+            cursor.fetchmany.side_effect = [[(len(shard_conns), -1)], []]
+            shard_conns.append(shard_conn)
+            yield shard_conn
+
+        with patch.object(base, "pooled_connection", fake_pool):
+            result = fetch_edges_for_frontier(
+                mock_conn, "test_edges", frontier, "from_col", "to_col", shard=True
+            )
+
+        assert len(shard_conns) == base.PARALLEL_FETCH_SHARDS
+        assert len(result) == base.PARALLEL_FETCH_SHARDS
+        mock_conn.cursor.assert_not_called()
+
+    def test_fetch_edges_shards_only_when_opted_in_and_idle(self):
+        """Without shard=True, or inside a transaction, the frontier stays on conn."""
+        import psycopg2.extensions
+
+        from virt_graph.handlers import base
+
+        frontier = list(range(base.PARALLEL_FETCH_MIN_FRONTIER + 1))
+        for shard, status in (
+            (False, psycopg2.extensions.TRANSACTION_STATUS_IDLE),
+            (True, psycopg2.extensions.TRANSACTION_STATUS_INTRANS),
+        ):
+            mock_conn = MagicMock()
+            mock_conn.isolation_level = None
+            mock_conn.status = psycopg2.extensions.STATUS_READY
+            mock_conn.info.transaction_status = status
+            mock_cursor = MagicMock()
+            mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+            mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+            mock_cursor.fetchmany.side_effect = [[(1, 2)], []]
+
+            with patch.object(base, "pooled_connection") as pool:
+                result = fetch_edges_for_frontier(
+                    mock_conn, "test_edges", frontier, "from_col", "to_col", shard=shard
+                )
+
+            pool.assert_not_called()
+            assert result == [(1, 2)]
+
+
+    def test_subgraph_exceeds_binds_one_frontier_per_endpoint(self):
+        """subgraph_exceeds() binds params from the builder's layout, not the SQL text."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = []
+
+        for direction, expected in (
+            ("outbound", ["{7}", 6]),
+            ("both", ["{7}", "{7}", 6]),
+        ):
+            assert not subgraph_exceeds(
+                mock_conn, "edges", 7, "src", "dst", cap=5, direction=direction,
+                sql_filter="note <> 'ANY(%%s)'",
+            )
+            assert mock_cursor.execute.call_args[0][1] == expected
+
+
+class TestBFSArena:
+    """Test parent-index path reconstruction."""
+
+    def test_paths_follow_parent_chain(self):
+        """path_to() and paths() rebuild the same root-to-node paths."""
+        arena = BFSArena(1)
+        arena.add(2, 1)
+        arena.add(3, 1)
+        arena.add(4, 3)
+
+        assert 4 in arena and 5 not in arena
+        assert len(arena) == 4
+        assert arena.path_to(4) == [1, 3, 4]
+        assert arena.paths() == {1: [1], 2: [1, 2], 3: [1, 3], 4: [1, 3, 4]}
+        assert 1 not in arena.paths(include_root=False)
+
+
+class TestStopCondition:
+    """Test stop-condition checks with mocked database."""
+
+    def test_should_stop_cache_skips_repeat_queries(self):
+        """Cached stop checks query once per node and condition."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchone.return_value = (1,)
+
+        for _ in range(3):
+            assert should_stop(mock_conn, "nodes", 7, "tier = 3", use_cache=True)
+        assert mock_cursor.execute.call_count == 1
+
+        # Different condition is a different entry; clearing forces a re-query
+        should_stop(mock_conn, "nodes", 7, "tier = 2", use_cache=True)
+        clear_stop_cache(mock_conn)
+        should_stop(mock_conn, "nodes", 7, "tier = 3", use_cache=True)
+        assert mock_cursor.execute.call_count == 3
+
+
+    def test_should_stop_many_single_query(self):
+        """Batched stop check issues one ANY() query and returns a set."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(2,), (5,)]
+
+        result = should_stop_many(mock_conn, "nodes", [1, 2, 3, 5], "tier = 3")
+
+        assert result == {2, 5}
+        assert mock_cursor.execute.call_count == 1
+        assert "id = ANY" in mock_cursor.execute.call_args[0][0]
+
+    def test_stop_checks_reuse_prepared_statements(self):
+        """Repeat stop checks EXECUTE a statement prepared on first use."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchone.return_value = None
+
+        should_stop(mock_conn, "nodes", 1, "tier = 3")
+        should_stop(mock_conn, "nodes", 2, "tier = 3")
+
+        first, second = (c[0] for c in mock_cursor.execute.call_args_list[-2:])
+        assert first[0].startswith("PREPARE vg_")
+        assert second[0].startswith("EXECUTE vg_") and second[1] == [2]
+
+    def test_should_stop_many_cache_queries_only_unseen_ids(self):
+        """Cached batched checks query only IDs without a stored answer."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(2,)]
+
+        assert should_stop_many(mock_conn, "nodes", [1, 2], "tier = 3", use_cache=True) == {2}
+        mock_cursor.fetchall.return_value = [(5,)]
+        assert should_stop_many(
+            mock_conn, "nodes", [1, 2, 5], "tier = 3", use_cache=True
+        ) == {2, 5}
+
+        assert mock_cursor.execute.call_count == 2
+        assert mock_cursor.execute.call_args[0][1] == ["{5}"]
+        # Answers are shared with should_stop()
+        assert should_stop(mock_conn, "nodes", 1, "tier = 3", use_cache=True) is False
+        assert mock_cursor.execute.call_count == 2
+        clear_stop_cache(mock_conn)
+
+    def test_stop_cache_evicts_least_recently_used(self):
+        """A cache hit refreshes the entry, so eviction drops a colder one."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchone.return_value = None
+
+        with patch("virt_graph.handlers.base.STOP_CACHE_MAXSIZE", 2):
+            for node_id in (1, 2, 1, 3):
+                should_stop(mock_conn, "nodes", node_id, "tier = 3", use_cache=True)
+            queries = mock_cursor.execute.call_count
+            should_stop(mock_conn, "nodes", 1, "tier = 3", use_cache=True)
+            assert mock_cursor.execute.call_count == queries
+            should_stop(mock_conn, "nodes", 2, "tier = 3", use_cache=True)
+            assert mock_cursor.execute.call_count == queries + 1
+        clear_stop_cache(mock_conn)
+
+    def test_composite_stop_check_binds_column_arrays(self):
+        """Composite keys bind one array per key column, not a VALUES list."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        mock_cursor.fetchall.return_value = [(1, "a")]
+
+        result = should_stop_many(
+            mock_conn, "nodes", [(1, "a"), (2, "b")], "tier = 3", id_column=["id", "code"]
+        )
+
+        assert result == {(1, "a")}
+        query, params = mock_cursor.execute.call_args[0]
+        assert "unnest(%s, %s)" in query and "VALUES" not in query
+        assert params == [[1, 2], ["a", "b"]]
+
 
 class TestTraverseLogic:
     """Test traverse function logic with mocked database."""
@@ -146,6 +535,29 @@ class TestTraverseLogic:
         # Should complete without error (depth clamped internally)
         assert "nodes" in result
 
+    def test_traverse_checks_start_stop_with_first_edges(self):
+        """The start node's stop check rides on the first level's edge query."""
+        mock_conn = MagicMock()
+        first_level = ([(1, 2, True)], False)
+
+        with patch(
+            "virt_graph.handlers.traversal._fetch_start_edges_with_stop",
+            return_value=first_level,
+        ) as start_fetch, patch(
+            "virt_graph.handlers.traversal.should_stop"
+        ) as stop_check, patch(
+            "virt_graph.handlers.traversal.fetch_nodes", return_value=[]
+        ):
+            result = traverse(
+                mock_conn, "nodes", "edges", "from_col", "to_col",
+                start_id=1, stop_condition="tier = 3", skip_estimation=True,
+            )
+
+        start_fetch.assert_called_once()
+        stop_check.assert_not_called()
+        assert result["terminated_at"] == [2]
+        assert result["edges"] == [(1, 2)]
+
     def test_traverse_raises_subgraph_too_large(self):
         """SubgraphTooLarge raised when estimate exceeds MAX_NODES."""
         mock_conn = MagicMock()
@@ -173,6 +585,19 @@ class TestTraverseLogic:
                             start_id=1,
                         )
 
+    def test_traverse_skips_table_bound_under_limit(self):
+        """The table bound is only looked up when the estimate is over the limit."""
+        mock_conn = MagicMock()
+
+        with patch("virt_graph.handlers.traversal.GraphSampler"), \
+                patch("virt_graph.handlers.traversal.get_table_bound") as bound, \
+                patch("virt_graph.handlers.traversal.estimate", return_value=10), \
+                patch("virt_graph.handlers.traversal.fetch_edges_for_frontier", return_value=[]), \
+                patch("virt_graph.handlers.traversal.fetch_nodes", return_value=[]):
+            traverse(mock_conn, "nodes", "edges", "from_col", "to_col", start_id=1)
+
+        bound.assert_not_called()
+
     def test_traverse_returns_expected_structure(self):
         """Traverse returns dict with expected keys."""
         mock_conn = MagicMock()
@@ -248,6 +673,17 @@ class TestHandlerIntegration:
         yield conn
         conn.close()
 
+    def test_numeric_casters_are_cursor_scoped(self, conn):
+        """NUMERIC and NUMERIC[] decode as float only on registered cursors."""
+        query = "SELECT 1.5::numeric, ARRAY[2.25, NULL]::numeric[]"
+        with conn.cursor() as cur:
+            _register_numeric_as_float(cur)
+            cur.execute(query)
+            assert cur.fetchone() == (1.5, [2.25, None])
+        with conn.cursor() as cur:
+            cur.execute(query)
+            assert type(cur.fetchone()[0]).__name__ == "Decimal"
+
     def test_bom_traversal_performance(self, conn):
         """
         BOM traversal at scale.
@@ -452,6 +888,326 @@ class TestHandlerIntegration:
         # Network should be mostly connected (allow some isolated facilities)
         assert connectivity_ratio >= 0.9, f"Transport network only {connectivity_ratio:.1%} connected"
 
+    def test_subgraph_exceeds_matches_traversal(self, conn):
+        """subgraph_exceeds() agrees with the traversed node count."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data available")
+            start_id = row[0]
+
+        visited = traverse(
+            conn,
+            nodes_table="parts",
+            edges_table="bill_of_materials",
+            edge_from_col="parent_part_id",
+            edge_to_col="child_part_id",
+            start_id=start_id,
+            max_depth=5,
+            skip_estimation=True,
+        )["nodes_visited"]
+
+        for cap, expected in ((visited - 1, True), (visited, False)):
+            assert subgraph_exceeds(
+                conn,
+                "bill_of_materials",
+                start_id,
+                "parent_part_id",
+                "child_part_id",
+                cap=cap,
+                max_depth=5,
+            ) is expected
+
+    def test_iter_edges_matches_fetch(self, conn):
+        """iter_edges_for_frontier() streams the same edges as the list fetch."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT parent_part_id FROM bill_of_materials LIMIT 1000")
+            frontier = [row[0] for row in cur.fetchall()]
+        if not frontier:
+            pytest.skip("No BOM data available")
+
+        args = (conn, "bill_of_materials", frontier, "parent_part_id", "child_part_id")
+        streamed = list(iter_edges_for_frontier(*args, itersize=100))
+        assert sorted(streamed) == sorted(fetch_edges_for_frontier(*args))
+
+    def test_fetch_edges_array_matches_fetch(self, conn):
+        """fetch_edges_array() holds the same edges as an (n, 2) array."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT parent_part_id FROM bill_of_materials LIMIT 1000")
+            frontier = [row[0] for row in cur.fetchall()]
+        if not frontier:
+            pytest.skip("No BOM data available")
+
+        for ids in (frontier[:10], frontier):
+            args = (conn, "bill_of_materials", ids, "parent_part_id", "child_part_id")
+            edges = fetch_edges_array(*args)
+            assert edges.shape[1] == 2
+            assert sorted(map(tuple, edges.tolist())) == sorted(fetch_edges_for_frontier(*args))
+
+        # An array frontier with repeats, as np.concatenate of levels yields
+        ids = np.array(frontier[:10] * 2)
+        edges = fetch_edges_array(conn, "bill_of_materials", ids, "parent_part_id", "child_part_id")
+        assert sorted(map(tuple, edges.tolist())) == sorted(fetch_edges_for_frontier(
+            conn, "bill_of_materials", frontier[:10], "parent_part_id", "child_part_id"
+        ))
+
+    def test_reachable_nodes_matches_traversal(self, conn):
+        """reachable_nodes() finds traverse()'s nodes at its path depths."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT parent_part_id FROM bill_of_materials
+                GROUP BY parent_part_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data available")
+            start_id = row[0]
+
+        for direction in ("outbound", "both"):
+            result = traverse(
+                conn,
+                nodes_table="parts",
+                edges_table="bill_of_materials",
+                edge_from_col="parent_part_id",
+                edge_to_col="child_part_id",
+                start_id=start_id,
+                direction=direction,
+                max_depth=3,
+                skip_estimation=True,
+            )
+            depths = reachable_nodes(
+                conn, "bill_of_materials", start_id, "parent_part_id", "child_part_id",
+                direction=direction, max_depth=3,
+            )
+            assert depths == {node: len(path) - 1 for node, path in result["paths"].items()}
+
+        with pytest.raises(SubgraphTooLarge):
+            reachable_nodes(
+                conn, "bill_of_materials", start_id, "parent_part_id", "child_part_id",
+                max_depth=3, max_nodes=1,
+            )
+
+    @pytest.fixture
+    def bigint_edges(self, conn):
+        """Temp edge table with bigint keys, one of them past the int4 range."""
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE vg_bigint_edges (src bigint, dst bigint)")
+            cur.execute(
+                "INSERT INTO vg_bigint_edges VALUES (1, 2), (2, 3), (3, 5000000000), (5000000000, 4)"
+            )
+        return "vg_bigint_edges"
+
+    def test_reachable_nodes_bigint_keys(self, conn, bigint_edges):
+        """The recursive seed takes the edge columns' bigint type."""
+        assert reachable_nodes(conn, bigint_edges, 1, "src", "dst") == {
+            1: 0, 2: 1, 3: 2, 5000000000: 3, 4: 4,
+        }
+        assert reachable_nodes(
+            conn, bigint_edges, 4, "src", "dst", direction="inbound", max_depth=2
+        ) == {4: 0, 5000000000: 1, 3: 2}
+        assert reachable_nodes(
+            conn, bigint_edges, 3, "src", "dst", direction="both", max_depth=1
+        ) == {3: 0, 2: 1, 5000000000: 1}
+
+    def test_traverse_edges_cte_bigint_keys(self, conn, bigint_edges):
+        """traverse_edges_cte() seeds its recursion with the bigint key type."""
+        assert sorted(traverse_edges_cte(conn, bigint_edges, [1], "src", "dst")) == [
+            (1, 2, 1), (2, 3, 2), (3, 5000000000, 3), (5000000000, 4, 4),
+        ]
+        assert sorted(traverse_edges_cte(
+            conn, bigint_edges, [5000000000], "src", "dst", direction="both", max_depth=1
+        )) == [(3, 5000000000, 1), (5000000000, 4, 1)]
+
+    def test_traverse_edges_cte_matches_level_fetches(self, conn):
+        """traverse_edges_cte() returns each level's frontier edges in one query."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT parent_part_id FROM bill_of_materials LIMIT 1")
+            row = cur.fetchone()
+            if row is None:
+                pytest.skip("No BOM data available")
+            start_id = row[0]
+
+        args = ("bill_of_materials", [start_id], "parent_part_id", "child_part_id")
+        edges = traverse_edges_cte(conn, *args, max_depth=3)
+        depths = reachable_nodes(
+            conn, "bill_of_materials", start_id, "parent_part_id", "child_part_id",
+            max_depth=3,
+        )
+
+        assert sorted((f, t) for f, t, d in edges if d == 1) == sorted(
+            fetch_edges_for_frontier(conn, *args)
+        )
+        assert {t for _, t, _ in edges} | {start_id} == set(depths)
+        assert all(depths[f] == d - 1 for f, _, d in edges)
+
+    def test_fetch_nodes_sample_draws_k_rows(self, conn):
+        """fetch_nodes_sample() returns k distinct rows from the candidates."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM parts ORDER BY id LIMIT 200")
+            ids = [row[0] for row in cur.fetchall()]
+        if len(ids) < 200:
+            pytest.skip("Not enough parts")
+
+        sample = fetch_nodes_sample(conn, "parts", ids, 20, columns=["id"])
+        sampled = [row["id"] for row in sample]
+        assert len(set(sampled)) == 20
+        assert set(sampled) <= set(ids)
+        assert len(fetch_nodes_sample(conn, "parts", ids[:5], 20)) == 5
+
+    def test_fetch_nodes_ordered_keeps_input_order(self, conn):
+        """fetch_nodes_ordered() returns rows in node_ids order, skipping misses."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM parts ORDER BY random() LIMIT 50")
+            ids = [row[0] for row in cur.fetchall()]
+        if not ids:
+            pytest.skip("No parts available")
+
+        nodes = fetch_nodes_ordered(conn, "parts", ids + [-1], columns=["id", "part_number"])
+        assert [n["id"] for n in nodes] == ids
+
+    def test_configure_connection_survives_rollback(self, conn):
+        """The statement timeout is set once and outlives the transaction."""
+        configure_connection(conn)
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SHOW statement_timeout")
+            assert cur.fetchone()[0] == "30s"
+
+    def test_handler_timeout_ends_with_transaction(self, conn):
+        """Handlers scope their timeout to the caller's transaction."""
+        with conn.cursor() as cur:
+            cur.execute("SHOW statement_timeout")
+            before = cur.fetchone()[0]
+            fetch_nodes(conn, "parts", [1])
+            cur.execute("SHOW statement_timeout")
+            assert cur.fetchone()[0] == "30s"
+            conn.rollback()
+            cur.execute("SHOW statement_timeout")
+            assert cur.fetchone()[0] == before
+
+    def test_prepared_stop_condition_keeps_escaped_percent(self, conn):
+        """A %%-escaped literal %s in stop_condition is text, not a placeholder."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM parts LIMIT 1")
+            row = cur.fetchone()
+        if row is None:
+            pytest.skip("No parts available")
+
+        for _ in range(2):  # PREPARE, then EXECUTE
+            assert should_stop(conn, "parts", row[0], "'100%%s' = '100' || '%%s'")
+            assert not should_stop(conn, "parts", row[0], "'%%%%' = '%%s'")
+
+    def test_prepared_statement_survives_deallocate(self, conn):
+        """A statement dropped server-side is re-PREPAREd instead of failing."""
+        import psycopg2
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM parts LIMIT 1")
+            row = cur.fetchone()
+        if row is None:
+            pytest.skip("No parts available")
+        conn.rollback()
+
+        conn.autocommit = True
+        should_stop(conn, "parts", row[0], "id > 0")
+        with conn.cursor() as cur:
+            cur.execute("DEALLOCATE ALL")
+        assert should_stop(conn, "parts", row[0], "id > 0")
+
+        # Inside a transaction the failed EXECUTE has already aborted it
+        conn.autocommit = False
+        with conn.cursor() as cur:
+            cur.execute("DEALLOCATE ALL")
+        with pytest.raises(psycopg2.errors.InvalidSqlStatementName):
+            should_stop(conn, "parts", row[0], "id > 0")
+        conn.rollback()
+        assert should_stop(conn, "parts", row[0], "id > 0")
+
+    def test_prepared_node_fetch_survives_alter_table(self, conn):
+        """A prepared SELECT * is re-PREPAREd once its table gains a column."""
+        import psycopg2
+
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE vg_alter_nodes (id int, name text)")
+            cur.execute("INSERT INTO vg_alter_nodes VALUES (1, 'a'), (2, 'b')")
+        conn.commit()
+        for _ in range(2):  # PREPARE, then EXECUTE
+            assert fetch_nodes(conn, "vg_alter_nodes", [1]) == [{"id": 1, "name": "a"}]
+        conn.commit()
+
+        # Inside a transaction the failed EXECUTE has already aborted it
+        with conn.cursor() as cur:
+            cur.execute("ALTER TABLE vg_alter_nodes ADD COLUMN tier int")
+        conn.commit()
+        with pytest.raises(psycopg2.errors.FeatureNotSupported):
+            fetch_nodes(conn, "vg_alter_nodes", [1])
+        conn.rollback()
+        assert fetch_nodes(conn, "vg_alter_nodes", [1]) == [
+            {"id": 1, "name": "a", "tier": None}
+        ]
+        conn.commit()
+
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("ALTER TABLE vg_alter_nodes DROP COLUMN name")
+        assert fetch_nodes(conn, "vg_alter_nodes", [2]) == [{"id": 2, "tier": None}]
+
+    def test_fetch_nodes_iter_applies_timeout(self, conn):
+        """The streaming node fetch runs under the handler statement timeout."""
+        with conn.cursor() as cur:
+            cur.execute("SHOW statement_timeout")
+            before = cur.fetchone()[0]
+            list(fetch_nodes_iter(conn, "parts", [1]))
+            cur.execute("SHOW statement_timeout")
+            assert cur.fetchone()[0] == "30s"
+            conn.rollback()
+            cur.execute("SHOW statement_timeout")
+            assert cur.fetchone()[0] == before
+
+    def test_pooled_connection_is_reused(self):
+        """Pooled connections are handed back clean and reused."""
+        try:
+            with pooled_connection() as first:
+                with first.cursor() as cur:
+                    cur.execute("SELECT pg_backend_pid()")
+                    first_pid = cur.fetchone()[0]
+            with pooled_connection() as second:
+                with second.cursor() as cur:
+                    cur.execute("SELECT pg_backend_pid()")
+                    second_pid = cur.fetchone()[0]
+                assert second is first
+                assert not second.closed
+        finally:
+            close_connection_pools()
+
+        assert first_pid == second_pid
+
+    def test_init_connection_pool_opens_minconn(self):
+        """init_connection_pool() connects up front and pooled_connection() reuses it."""
+        from virt_graph.handlers import base
+
+        try:
+            init_connection_pool(minconn=2, maxconn=4)
+            pool = base._pools[("localhost", 5432, "supply_chain", "virt_graph", "dev_password")]
+            assert len(pool._pool) == 2
+            assert pool.maxconn == 4
+            with pooled_connection() as conn:
+                assert len(pool._pool) == 1
+                assert not conn.closed
+        finally:
+            close_connection_pools()
+
+        with pytest.raises(ValueError, match="minconn"):
+            init_connection_pool(minconn=3, maxconn=2)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
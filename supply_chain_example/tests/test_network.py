@@ -9,10 +9,20 @@ suppliers, supplier_relationships). The handlers themselves are schema-parameter
 and work with any relational graph structure.
 """
 
+from unittest.mock import MagicMock, patch
+
+import networkx as nx
+import numpy as np
 import pytest
 
 from virt_graph.handlers.base import get_connection
 from virt_graph.handlers.network import (
+    _Adjacency,
+    _adjacency_stats,
+    _closeness_scores,
+    _degree_scores,
+    _fetch_all_edges_array,
+    _top_indices,
     centrality,
     connected_components,
     graph_density,
@@ -291,6 +301,58 @@ class TestGraphDensity:
             assert result["avg_degree"] >= 0
             assert result["max_degree"] >= result["min_degree"]
 
+    def test_adjacency_matches_networkx(self):
+        """CSR adjacency stats equal NetworkX's, parallel edges and self-loops included."""
+        rows = [(5, 3), (3, 9), (5, 3), (9, 9), (9, 5), (7, 3)]
+        G = nx.DiGraph(rows)
+        adjacency = _Adjacency.from_edges(np.array(rows, dtype=np.int64))
+
+        scores = dict(zip(adjacency.node_ids.tolist(), _degree_scores(adjacency).tolist()))
+        assert list(scores.items()) == list(nx.degree_centrality(G).items())
+        assert [int(t) for t in adjacency.node_ids[adjacency.neighbors(0)]] == [3]
+        stats = _adjacency_stats(adjacency)
+        assert stats["edges"] == G.number_of_edges()
+        assert stats["density"] == nx.density(G)
+        assert stats["is_weakly_connected"] and not stats["is_strongly_connected"]
+        assert stats["max_degree"] == max(d for _, d in G.degree())
+
+    def test_edge_array_batches_and_falls_back_to_rows(self):
+        """Integer batches concatenate; a batch with NULL IDs returns every row as a tuple."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        args = ("edges", "from_col", "to_col", None, "id", None, None)
+
+        mock_cursor.fetchmany.side_effect = [[(1, 2), (2, 3)], [(3, 1)], []]
+        with patch("virt_graph.handlers.network.EDGE_FETCH_ITERSIZE", 2):
+            edges = _fetch_all_edges_array(mock_conn, *args)
+        assert edges.tolist() == [[1, 2], [2, 3], [3, 1]]
+
+        mock_cursor.fetchmany.side_effect = [[(1, 2), (2, 3)], [(3, None)]]
+        mock_cursor.fetchall.return_value = [(4, 5)]
+        with patch("virt_graph.handlers.network.EDGE_FETCH_ITERSIZE", 2):
+            rows = _fetch_all_edges_array(mock_conn, *args)
+        assert rows == [(1, 2), (2, 3), (3, None), (4, 5)]
+
+    def test_top_indices_matches_stable_sort(self):
+        """argpartition top-N picks the same nodes, in the same order, as sorted()."""
+        scores = np.array([0.5, 0.2, 0.5, 0.9, 0.2, 0.5, 0.0])
+        expected = sorted(range(scores.size), key=lambda i: scores[i], reverse=True)
+        for k in range(scores.size + 2):
+            assert _top_indices(scores, k).tolist() == expected[:k]
+
+    def test_closeness_matches_networkx(self):
+        """Batched scipy closeness equals nx.closeness_centrality(), unreachable nodes included."""
+        rows = [(5, 3), (3, 9), (5, 3), (9, 9), (9, 5), (7, 3), (8, 7), (4, 6)]
+        adjacency = _Adjacency.from_edges(np.array(rows, dtype=np.int64))
+
+        with patch("virt_graph.handlers.network.CLOSENESS_BATCH", 3):
+            scores = dict(
+                zip(adjacency.node_ids.tolist(), _closeness_scores(adjacency).tolist())
+            )
+        assert list(scores.items()) == list(nx.closeness_centrality(nx.DiGraph(rows)).items())
+
 
 class TestNeighbors:
     """Tests for neighbors function."""
@@ -12,7 +12,12 @@ structure.
 import pytest
 
 from virt_graph.handlers.base import get_connection
-from virt_graph.handlers.pathfinding import shortest_path, all_shortest_paths
+from virt_graph.handlers.pathfinding import (
+    _EdgeCache,
+    _fetch_edges_with_weights,
+    all_shortest_paths,
+    shortest_path,
+)
 
 
 @pytest.fixture
@@ -365,6 +370,24 @@ class TestAllShortestPaths:
         assert result["error"] is not None
 
 
+    def test_edge_cache_skips_seen_frontier_nodes(self, conn, intermediate_node):
+        """A second fetch of a cached frontier is served without a query."""
+        if intermediate_node is None:
+            pytest.skip("No intermediate node found")
+
+        args = ("transport_routes", [intermediate_node], "origin_facility_id",
+                "destination_facility_id", "distance_km", "outbound")
+        cache = _EdgeCache()
+        first = _fetch_edges_with_weights(conn, *args, cache=cache)
+
+        class NoQueries:
+            def cursor(self):
+                raise AssertionError("cached frontier hit the database")
+
+        assert first
+        assert _fetch_edges_with_weights(NoQueries(), *args, cache=cache) == first
+
+
 class TestPathfindingWithWeights:
     """Tests comparing weighted vs unweighted pathfinding."""
 